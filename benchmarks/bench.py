@@ -0,0 +1,233 @@
+"""
+Headless benchmark suite for maze generation, solving and rendering.
+
+Every case builds mazes with ``window_instance=None`` and records wall time,
+peak traced memory and cells per second. Results are written as JSON so runs
+from different revisions can be compared.
+
+Usage (from the repository root):
+
+    python benchmarks/bench.py                          # full suite, up to 4000x4000
+    python benchmarks/bench.py --sizes 10 100 --output before.json
+    python benchmarks/bench.py --sizes 10 100 --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from maze_logic.generators import GENERATORS  # noqa: E402
+from maze_logic.maze import Maze  # noqa: E402
+from maze_logic.solvers import SOLVERS  # noqa: E402
+from gui.renderer import MazeRenderer  # noqa: E402
+
+DEFAULT_SIZES = (10, 100, 500, 1000, 2000, 4000)
+DEFAULT_SEED = 1234
+
+
+class CountingWindow:
+    """
+    A display-less stand-in for Window that only counts canvas operations,
+    so the renderer's own bookkeeping can be timed without Tk.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.recolored = 0
+
+    def create_line(self, x1, y1, x2, y2, fill_color="black"):
+        self.created += 1
+        return self.created
+
+    def recolor_line(self, item_id, fill_color):
+        self.recolored += 1
+
+
+def _measure(action, trace_memory, repeat=1):
+    """
+    Runs an action and returns (seconds, peak_bytes, result), keeping the
+    best of ``repeat`` timings to damp scheduler noise.
+    Timing and memory tracing are done in separate runs because tracemalloc
+    slows allocation-heavy code down considerably.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = action()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    peak_bytes = None
+    if trace_memory:
+        tracemalloc.start()
+        action()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak_bytes, result
+
+
+def _record(kind, name, size, seconds, peak_bytes, **extra):
+    """Builds one result record."""
+    cells = size * size
+    record = {
+        "kind": kind,
+        "name": name,
+        "rows": size,
+        "cols": size,
+        "cells": cells,
+        "seconds": round(seconds, 6),
+        "cells_per_second": round(cells / seconds) if seconds > 0 else None,
+        "peak_bytes": peak_bytes,
+    }
+    record.update(extra)
+    return record
+
+
+def _build(size, algorithm):
+    return Maze(0, 0, size, size, 10, 10, None, True, random_seed=DEFAULT_SEED, algorithm=algorithm)
+
+
+def run_suite(sizes, generators, solvers, render=True, trace_memory=True, max_cells=None,
+              repeat=1, log=None):
+    """
+    Runs the benchmark cases.
+
+    Args:
+        sizes (iterable): Square maze sizes (rows = cols) to benchmark.
+        generators (iterable): Generation engine names.
+        solvers (iterable): Solve strategy names, run on a "dfs" maze of each size.
+        render (bool): Also benchmark the canvas renderer with a counting window.
+        trace_memory (bool): Record peak memory with tracemalloc.
+        max_cells (dict, optional): Per-name cell limit; larger cases are skipped
+                                    (e.g. slow algorithms on the biggest grids).
+        repeat (int): Timed runs per case; the fastest is reported.
+        log (callable, optional): Called with a progress line per case.
+
+    Returns:
+        list: One record (dict) per case.
+    """
+    max_cells = max_cells or {}
+    records = []
+
+    def emit(record):
+        records.append(record)
+        if log:
+            log(f"{record['kind']:>8} {record['name']:<14} {record['rows']:>5}x{record['cols']:<5} "
+                f"{record['seconds']:>10.4f}s {record['cells_per_second'] or 0:>12,} cells/s")
+
+    for size in sizes:
+        for algorithm in generators:
+            if size * size > max_cells.get(algorithm, float("inf")):
+                continue
+            seconds, peak, _ = _measure(lambda: _build(size, algorithm), trace_memory, repeat)
+            emit(_record("generate", algorithm, size, seconds, peak))
+
+        maze = _build(size, "dfs")
+        for strategy in solvers:
+            if size * size > max_cells.get(strategy, float("inf")):
+                continue
+            seconds, peak, path = _measure(lambda: maze.solve_maze(strategy), trace_memory, repeat)
+            emit(_record("solve", strategy, size, seconds, peak, path_length=len(path)))
+
+        if render:
+            def draw():
+                window = CountingWindow()
+                renderer = MazeRenderer(window, 0, 0, 10, 10, size, size)
+                renderer.draw_grid(maze._cells)
+                return window.created
+
+            seconds, peak, items = _measure(draw, trace_memory, repeat)
+            emit(_record("render", "draw_grid", size, seconds, peak, canvas_items=items))
+
+    return records
+
+
+def _revision():
+    """Returns the current git revision, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Compares two reports case by case.
+
+    Args:
+        baseline (dict): An earlier report.
+        current (dict): The new report.
+        threshold (float): Relative slow-down reported as a regression.
+
+    Returns:
+        list: (kind, name, cells, old_seconds, new_seconds, ratio, regressed) per shared case.
+    """
+    def key(record):
+        return record["kind"], record["name"], record["cells"]
+
+    old = {key(record): record for record in baseline["results"]}
+    rows = []
+    for record in current["results"]:
+        previous = old.get(key(record))
+        if previous is None or not previous["seconds"]:
+            continue
+        ratio = record["seconds"] / previous["seconds"]
+        rows.append((*key(record), previous["seconds"], record["seconds"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--generators", nargs="+", default=sorted(GENERATORS))
+    parser.add_argument("--solvers", nargs="+", default=sorted(SOLVERS))
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case (best is kept)")
+    parser.add_argument("--no-render", action="store_true", help="skip the renderer cases")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc runs")
+    parser.add_argument("--output", default="bench_output.json", help="JSON report path")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slow-down flagged as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    # Wilson's first walks are long on huge grids; keep the default suite bounded
+    max_cells = {"wilson": 1000 * 1000}
+    records = run_suite(
+        args.sizes, args.generators, args.solvers, render=not args.no_render,
+        trace_memory=not args.no_memory, max_cells=max_cells, repeat=args.repeat, log=print,
+    )
+    report = {
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": records,
+    }
+    with open(args.output, "w") as out:
+        json.dump(report, out, indent=2)
+    print(f"Wrote {len(records)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as source:
+            baseline = json.load(source)
+        regressions = 0
+        for kind, name, cells, old_seconds, new_seconds, ratio, regressed in compare(
+                baseline, report, args.threshold):
+            regressions += regressed
+            flag = "REGRESSION" if regressed else ""
+            print(f"{kind:>8} {name:<14} {cells:>10,} cells {old_seconds:>10.4f}s -> "
+                  f"{new_seconds:>10.4f}s ({ratio:5.2f}x) {flag}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Frame-budgeted animation for the Tk window.
+
+Drawing steps are queued instead of being executed inline with a redraw and
+a sleep. A ``root.after()`` timer applies a fixed number of steps per frame at
+the target frame rate, so the Tk event loop keeps running between frames: the
+window stays responsive, the algorithms run at full speed, and nothing spins
+while there is nothing left to draw.
+"""
+from collections import deque
+
+
+class AnimationScheduler:
+    """
+    Plays queued drawing steps over successive frames.
+    """
+
+    def __init__(self, root, steps_per_frame=10, fps=60):
+        """
+        Args:
+            root (tkinter.Tk): The Tk root whose after() timer drives the frames.
+            steps_per_frame (int): How many queued steps are applied per frame.
+            fps (int): Target frames per second.
+        """
+        self._root = root
+        self._steps = deque()
+        self._timer = None # Pending after() callback ID, None when idle
+        self._paused = False
+        self.steps_per_frame = steps_per_frame
+        self.fps = fps
+        self.frames = 0 # Frames played so far
+
+    @property
+    def pending(self):
+        """Returns the number of queued steps not yet applied."""
+        return len(self._steps)
+
+    @property
+    def paused(self):
+        """Returns True if playback is paused."""
+        return self._paused
+
+    def queue(self, step):
+        """
+        Adds a drawing step and makes sure a frame is scheduled.
+
+        Args:
+            step (callable): A function taking no arguments that performs one drawing step.
+        """
+        self._steps.append(step)
+        self._schedule()
+
+    def _schedule(self):
+        """Schedules the next frame unless one is pending, playback is paused or nothing is queued."""
+        if self._timer is None and not self._paused and self._steps:
+            self._timer = self._root.after(max(1, int(1000 / self.fps)), self._frame)
+
+    def _frame(self):
+        """Applies one frame's worth of steps, then schedules the next frame."""
+        self._timer = None
+        self.frames += 1
+        steps = self._steps
+        for _ in range(min(self.steps_per_frame, len(steps))):
+            steps.popleft()()
+        self._schedule()
+
+    def pause(self):
+        """Stops applying steps; queued steps are kept."""
+        self._paused = True
+        self._cancel()
+
+    def resume(self):
+        """Continues playback after pause()."""
+        self._paused = False
+        self._schedule()
+
+    def toggle_pause(self):
+        """Pauses if playing, resumes if paused."""
+        if self._paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def skip_to_end(self):
+        """Applies every queued step immediately."""
+        self._cancel()
+        steps = self._steps
+        while steps:
+            steps.popleft()()
+
+    def set_speed(self, steps_per_frame):
+        """
+        Changes how many steps are applied per frame.
+
+        Args:
+            steps_per_frame (int): New step budget per frame, at least 1.
+        """
+        self.steps_per_frame = max(1, int(steps_per_frame))
+
+    def stop(self):
+        """Cancels the pending frame and drops every queued step."""
+        self._cancel()
+        self._steps.clear()
+
+    def _cancel(self):
+        """Cancels the pending frame, if any."""
+        if self._timer is not None:
+            self._root.after_cancel(self._timer)
+            self._timer = None
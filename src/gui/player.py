@@ -0,0 +1,231 @@
+"""
+Playback of maze event logs.
+
+``EventPlayer`` animates an ``EventLog`` (see ``maze_logic.events``) through a
+``MazeRenderer``. It keeps its own copy of the walls as of the current step,
+so it can jump to any step: skipping ahead applies the skipped records
+without drawing and then redraws only the cells and moves they touched;
+seeking back rebuilds the state from the start of the log the same way.
+A log that starts at a prebuilt maze rather than at generation is replayed
+from that maze's walls.
+Frames are driven by a ``root.after()`` timer, like ``AnimationScheduler``,
+and the controls mirror it so the window's keys drive either one.
+"""
+from maze_logic.events import CARVE, UNDO, BUILD, DIRECTIONS
+from maze_logic.grid import Grid, TOP_WALL, BOTTOM_WALL
+
+
+class EventPlayer:
+    """
+    Animates an event log at any speed, with seeking.
+    """
+
+    def __init__(self, log, renderer, root, steps_per_frame=10, fps=60, position=0, on_draw=None,
+                 walls=None):
+        """
+        Args:
+            log (EventLog): The events to play. It may keep growing while playing.
+            renderer (MazeRenderer): Draws the maze the log belongs to.
+            root (tkinter.Tk): The Tk root whose after() timer drives the frames.
+            steps_per_frame (int): How many events are applied per frame.
+            fps (int): Target frames per second.
+            position (int): Step the canvas currently shows, e.g. len(log) for
+                            a maze drawn in its final state.
+            on_draw (callable, optional): Called as ``on_draw(count)`` with the number
+                                          of cells and moves each redraw sends to the renderer.
+            walls (bytes-like, optional): Cell bytes (row-major) at step 0 when the log does not
+                                          start from generation, e.g. a prebuilt maze. Copied.
+                                          Defaults to every wall closed but the entrance and exit.
+        """
+        self._log = log
+        self._renderer = renderer
+        self._root = root
+        self._on_draw = on_draw
+        self._timer = None # Pending after() callback ID, None when idle
+        self._paused = False
+        self.steps_per_frame = steps_per_frame
+        self.fps = fps
+        self.frames = 0 # Frames played so far
+        self._initial = bytes(walls) if walls is not None else None # Walls at step 0
+
+        self._grid = None
+        self._moves = None
+        self._position = 0
+        self._reset()
+        self._apply(position)
+
+    @property
+    def position(self):
+        """Returns how many events have been played."""
+        return self._position
+
+    @property
+    def pending(self):
+        """Returns the number of events not yet played."""
+        return len(self._log) - self._position
+
+    @property
+    def paused(self):
+        """Returns True if playback is paused."""
+        return self._paused
+
+    def _reset(self):
+        """
+        Returns the player's state to step 0: the initial walls if given, else every
+        wall closed but the entrance and exit.
+        """
+        log = self._log
+        if self._initial is not None:
+            self._grid = Grid(log.num_rows, log.num_cols, self._initial)
+        else:
+            self._grid = Grid(log.num_rows, log.num_cols)
+            self._grid.set_wall(0, 0, TOP_WALL, False)
+            self._grid.set_wall(log.num_rows - 1, log.num_cols - 1, BOTTOM_WALL, False)
+        self._moves = {} # (cell, cell) pair, lower index first -> True if its latest move was undone
+        self._position = 0
+
+    def _apply(self, end):
+        """
+        Applies events up to ``end`` to the player's state without drawing.
+
+        Returns:
+            tuple: (cells, moves) touched, as sets of flat indices and of cell pairs.
+        """
+        log = self._log
+        records, deltas, on_border = log.records, log.deltas, log.on_border
+        grid, moves = self._grid, self._moves
+        cells, touched_moves = set(), set()
+        for position in range(self._position, end):
+            record = records[position]
+            cell, direction = record >> 4, record & 3
+            neighbor = cell + deltas[direction]
+            op = (record >> 2) & 3
+            if op == CARVE or op == BUILD:
+                if on_border(cell, direction):
+                    # Outer wall: only this cell changes
+                    grid.set_wall(*grid.coords(cell), DIRECTIONS[direction], op == BUILD)
+                    cells.add(cell)
+                    continue
+                if op == CARVE:
+                    grid.connect(cell, neighbor)
+                else:
+                    grid.disconnect(cell, neighbor)
+            else:
+                key = (cell, neighbor) if cell < neighbor else (neighbor, cell)
+                moves[key] = op == UNDO
+                touched_moves.add(key)
+                continue
+            cells.add(cell)
+            cells.add(neighbor)
+        self._position = end
+        return cells, touched_moves
+
+    def _draw(self, cells, moves):
+        """Brings the drawn cells and moves in line with the player's state."""
+        grid, renderer = self._grid, self._renderer
+        if self._on_draw is not None and (cells or moves):
+            self._on_draw(len(cells) + len(moves))
+        for index in cells:
+            renderer.update_cell(*grid.coords(index), grid.walls_at(index))
+        for key in moves:
+            cell_a, cell_b = grid.coords(key[0]), grid.coords(key[1])
+            undo = self._moves.get(key)
+            if undo is None:
+                renderer.erase_move(cell_a, cell_b)
+            else:
+                renderer.draw_move(cell_a, cell_b, undo)
+
+    def seek(self, step):
+        """
+        Shows the maze as it was after a given number of events.
+
+        Args:
+            step (int): The step to show, clamped to the log.
+        """
+        step = max(0, min(step, len(self._log)))
+        if step >= self._position:
+            self._draw(*self._apply(step))
+        else:
+            # Replay from the start; only what changed after ``step`` is redrawn
+            cells, moves = self._touched(step, self._position)
+            self._reset()
+            self._apply(step)
+            self._draw(cells, moves)
+        self._schedule()
+
+    def _touched(self, start, end):
+        """Returns the cells and moves touched by the events in [start, end)."""
+        log = self._log
+        records, deltas, on_border = log.records, log.deltas, log.on_border
+        cells, moves = set(), set()
+        for position in range(start, end):
+            record = records[position]
+            cell, direction = record >> 4, record & 3
+            neighbor = cell + deltas[direction]
+            if (record >> 2) & 3 in (CARVE, BUILD):
+                cells.add(cell)
+                if not on_border(cell, direction):
+                    cells.add(neighbor)
+            else:
+                moves.add((cell, neighbor) if cell < neighbor else (neighbor, cell))
+        return cells, moves
+
+    def skip(self, count):
+        """Moves playback ``count`` events forward (or back, if negative)."""
+        self.seek(self._position + count)
+
+    def play(self):
+        """Starts or continues playback, e.g. after more events were logged."""
+        self._paused = False
+        self._schedule()
+
+    def _schedule(self):
+        """Schedules the next frame unless one is pending, playback is paused or the log is done."""
+        if self._timer is None and not self._paused and self.pending:
+            self._timer = self._root.after(max(1, int(1000 / self.fps)), self._frame)
+
+    def _frame(self):
+        """Plays one frame's worth of events, then schedules the next frame."""
+        self._timer = None
+        self.frames += 1
+        self.seek(self._position + self.steps_per_frame)
+
+    def pause(self):
+        """Stops playback at the current step."""
+        self._paused = True
+        self._cancel()
+
+    def resume(self):
+        """Continues playback after pause()."""
+        self.play()
+
+    def toggle_pause(self):
+        """Pauses if playing, resumes if paused."""
+        if self._paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def skip_to_end(self):
+        """Shows the final state at once."""
+        self._cancel()
+        self.seek(len(self._log))
+
+    def set_speed(self, steps_per_frame):
+        """
+        Changes how many events are played per frame.
+
+        Args:
+            steps_per_frame (int): New step budget per frame, at least 1.
+        """
+        self.steps_per_frame = max(1, int(steps_per_frame))
+
+    def stop(self):
+        """Cancels the pending frame and pauses; the position is kept for seeking."""
+        self.pause()
+
+    def _cancel(self):
+        """Cancels the pending frame, if any."""
+        if self._timer is not None:
+            self._root.after_cancel(self._timer)
+            self._timer = None
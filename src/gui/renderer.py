@@ -0,0 +1,195 @@
+"""
+Incremental maze renderer that reuses canvas items.
+
+Every wall segment and every solver move owns at most one canvas item for
+the lifetime of the maze. The first draw merges runs of collinear walls into
+single lines; later changes either recolor an existing item with
+``itemconfig`` or create the segment's one item. A whole generation and solve
+therefore costs O(cells) canvas items instead of growing with every
+animation step.
+"""
+from maze_logic.grid import LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+
+WALL_COLOR = "black"
+BACKGROUND_COLOR = "white"
+MOVE_COLOR = "red"
+UNDO_COLOR = "grey"
+
+
+class MazeRenderer:
+    """
+    Draws a maze grid onto a Window and keeps the canvas in sync with wall changes.
+
+    Horizontal segment ``(r, c)`` is the top wall of cell ``(r, c)``
+    (``r == num_rows`` is the bottom edge); vertical segment ``(r, c)`` is the
+    left wall of cell ``(r, c)`` (``c == num_cols`` is the right edge).
+    """
+
+    def __init__(self, window, x_start, y_start, cell_width, cell_height, num_rows, num_cols):
+        """
+        Args:
+            window (Window): The window to draw on.
+            x_start (int): X-coordinate of the maze's top-left corner.
+            y_start (int): Y-coordinate of the maze's top-left corner.
+            cell_width (int): The width of each cell.
+            cell_height (int): The height of each cell.
+            num_rows (int): The number of rows in the maze.
+            num_cols (int): The number of columns in the maze.
+        """
+        self._window = window
+        self._x_start = x_start
+        self._y_start = y_start
+        self._cell_width = cell_width
+        self._cell_height = cell_height
+        self._num_rows = num_rows
+        self._num_cols = num_cols
+
+        # Whether each segment is currently shown as a wall
+        self._horizontal_shown = bytearray((num_rows + 1) * num_cols)
+        self._vertical_shown = bytearray(num_rows * (num_cols + 1))
+        # Canvas item owned by each individual segment, created on its first change
+        self._horizontal_items = {}
+        self._vertical_items = {}
+        # Canvas item owned by each solver move, keyed by the pair of cells
+        self._move_items = {}
+
+        self.items_created = 0 # Total canvas items this renderer has created
+
+    def _create_line(self, x1, y1, x2, y2, fill_color):
+        self.items_created += 1
+        return self._window.create_line(x1, y1, x2, y2, fill_color)
+
+    def _horizontal_coords(self, row_idx, col_idx, length=1):
+        x1 = self._x_start + col_idx * self._cell_width
+        y = self._y_start + row_idx * self._cell_height
+        return x1, y, x1 + length * self._cell_width, y
+
+    def _vertical_coords(self, row_idx, col_idx, length=1):
+        x = self._x_start + col_idx * self._cell_width
+        y1 = self._y_start + row_idx * self._cell_height
+        return x, y1, x, y1 + length * self._cell_height
+
+    def draw_grid(self, grid):
+        """
+        Draws every wall of a grid, merging collinear runs into single lines.
+        Meant to be called once, before any incremental updates.
+
+        Args:
+            grid (Grid): The maze walls.
+        """
+        num_rows, num_cols = self._num_rows, self._num_cols
+        walls_at = grid.walls_at
+
+        # Horizontal lines: top walls of every row, then the bottom edge
+        for row_idx in range(num_rows + 1):
+            run_start = None
+            for col_idx in range(num_cols + 1):
+                present = col_idx < num_cols and (
+                    walls_at(row_idx * num_cols + col_idx) & TOP_WALL if row_idx < num_rows
+                    else walls_at((num_rows - 1) * num_cols + col_idx) & BOTTOM_WALL
+                )
+                if present:
+                    self._horizontal_shown[row_idx * num_cols + col_idx] = 1
+                    if run_start is None:
+                        run_start = col_idx
+                elif run_start is not None:
+                    self._create_line(
+                        *self._horizontal_coords(row_idx, run_start, col_idx - run_start), WALL_COLOR
+                    )
+                    run_start = None
+
+        # Vertical lines: left walls of every column, then the right edge
+        for col_idx in range(num_cols + 1):
+            run_start = None
+            for row_idx in range(num_rows + 1):
+                present = row_idx < num_rows and (
+                    walls_at(row_idx * num_cols + col_idx) & LEFT_WALL if col_idx < num_cols
+                    else walls_at(row_idx * num_cols + num_cols - 1) & RIGHT_WALL
+                )
+                if present:
+                    self._vertical_shown[row_idx * (num_cols + 1) + col_idx] = 1
+                    if run_start is None:
+                        run_start = row_idx
+                elif run_start is not None:
+                    self._create_line(
+                        *self._vertical_coords(run_start, col_idx, row_idx - run_start), WALL_COLOR
+                    )
+                    run_start = None
+
+    def _update_segment(self, shown, items, key, coords, present):
+        """Brings one segment's canvas state in line with its wall, if it changed."""
+        if shown[key] == present:
+            return
+        shown[key] = present
+        fill_color = WALL_COLOR if present else BACKGROUND_COLOR
+        item = items.get(key)
+        if item is None:
+            items[key] = self._create_line(*coords, fill_color)
+        else:
+            self._window.recolor_line(item, fill_color)
+
+    def update_cell(self, row_idx, col_idx, walls):
+        """
+        Updates the four wall segments around a cell.
+
+        Args:
+            row_idx (int): Row index of the cell.
+            col_idx (int): Column index of the cell.
+            walls (int): The cell's 4-bit wall mask.
+        """
+        num_cols = self._num_cols
+        h_shown, h_items = self._horizontal_shown, self._horizontal_items
+        v_shown, v_items = self._vertical_shown, self._vertical_items
+
+        top = row_idx * num_cols + col_idx
+        self._update_segment(h_shown, h_items, top, self._horizontal_coords(row_idx, col_idx),
+                             1 if walls & TOP_WALL else 0)
+        self._update_segment(h_shown, h_items, top + num_cols,
+                             self._horizontal_coords(row_idx + 1, col_idx),
+                             1 if walls & BOTTOM_WALL else 0)
+
+        left = row_idx * (num_cols + 1) + col_idx
+        self._update_segment(v_shown, v_items, left, self._vertical_coords(row_idx, col_idx),
+                             1 if walls & LEFT_WALL else 0)
+        self._update_segment(v_shown, v_items, left + 1, self._vertical_coords(row_idx, col_idx + 1),
+                             1 if walls & RIGHT_WALL else 0)
+
+    def draw_move(self, from_cell, to_cell, undo=False):
+        """
+        Draws a solver move between the centers of two cells, reusing the
+        move's canvas item if it was drawn before.
+
+        Args:
+            from_cell (tuple): (row, col) the move starts from.
+            to_cell (tuple): (row, col) the move goes to.
+            undo (bool): If True, draws the move as backtracked.
+        """
+        fill_color = UNDO_COLOR if undo else MOVE_COLOR
+        key = (from_cell, to_cell) if from_cell <= to_cell else (to_cell, from_cell)
+        item = self._move_items.get(key)
+        if item is not None:
+            self._window.recolor_line(item, fill_color)
+            return
+
+        (row_a, col_a), (row_b, col_b) = key
+        half_width, half_height = self._cell_width / 2, self._cell_height / 2
+        self._move_items[key] = self._create_line(
+            self._x_start + col_a * self._cell_width + half_width,
+            self._y_start + row_a * self._cell_height + half_height,
+            self._x_start + col_b * self._cell_width + half_width,
+            self._y_start + row_b * self._cell_height + half_height,
+            fill_color,
+        )
+
+    def erase_move(self, from_cell, to_cell):
+        """
+        Hides a drawn solver move, e.g. when an animation is rewound past it.
+
+        Args:
+            from_cell (tuple): (row, col) of one end of the move.
+            to_cell (tuple): (row, col) of the other end.
+        """
+        key = (from_cell, to_cell) if from_cell <= to_cell else (to_cell, from_cell)
+        item = self._move_items.get(key)
+        if item is not None:
+            self._window.recolor_line(item, BACKGROUND_COLOR)
@@ -0,0 +1,314 @@
+"""
+Viewport-culled rendering with zoom, pan and level of detail.
+
+``MazeRenderer`` draws the whole maze once at a fixed position, which is
+right for small animated mazes. ``ViewportRenderer`` is for large ones: it
+only draws the cells that intersect the visible part of the canvas, so a
+frame costs time proportional to the screen, not to the maze.
+
+* Zoomed in, every visible wall is a canvas line, with collinear walls merged.
+* Zoomed out past ``LINE_MIN_CELL_PIXELS``, the visible region is sampled into
+  one grayscale raster (one byte per screen pixel) shown as a ``PhotoImage``.
+
+A solution path set with ``show_path`` is drawn on top: as lines between cell
+centers when zoomed in, as darkened pixels in the raster otherwise.
+
+The mouse wheel zooms around the cursor and dragging with the left button pans.
+Bursts of input events are coalesced into a single redraw.
+"""
+from maze_logic.grid import ALL_WALLS, LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+
+WALL_COLOR = "black"
+PATH_COLOR = "red"
+LINE_MIN_CELL_PIXELS = 8 # Below this many pixels per cell the raster is drawn instead
+ZOOM_STEP = 1.25 # Scale factor of one wheel notch
+BACKGROUND_SHADE = 255
+PATH_SHADE = 0
+
+# Marks a sampled cell as on the path; above every wall and state bit of a cell byte
+_PATH_MARK = 0x80
+# Raster shade of a cell: the more walls it has, the darker it is; path cells are darkest
+_SHADES = bytes(
+    PATH_SHADE if value & _PATH_MARK else BACKGROUND_SHADE - 48 * bin(value & ALL_WALLS).count("1")
+    for value in range(256)
+)
+# Path mask byte -> _PATH_MARK if the cell is on the path
+_TO_PATH_MARK = bytes([0]) + bytes([_PATH_MARK]) * 255
+
+
+class Viewport:
+    """
+    Maps cells to screen pixels: cell ``(r, c)`` has its top-left corner at
+    ``(offset_x + c * scale, offset_y + r * scale)``.
+    """
+
+    def __init__(self, num_rows, num_cols, width, height, scale=None, min_scale=None,
+                 max_scale=64.0):
+        """
+        Args:
+            num_rows (int): The number of rows in the maze.
+            num_cols (int): The number of columns in the maze.
+            width (int): Width of the visible area in pixels.
+            height (int): Height of the visible area in pixels.
+            scale (float, optional): Pixels per cell. Defaults to fitting the whole maze.
+            min_scale (float, optional): Smallest zoom. Defaults to the fitting scale.
+            max_scale (float): Largest zoom.
+        """
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.width = width
+        self.height = height
+        fit = min(width / num_cols, height / num_rows)
+        self.min_scale = min_scale if min_scale is not None else min(fit, 1.0)
+        self.max_scale = max_scale
+        self.scale = scale if scale is not None else fit
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+    def visible_cells(self):
+        """
+        Returns the cells intersecting the visible area.
+
+        Returns:
+            tuple: (first_row, end_row, first_col, end_col), end exclusive; empty
+                   ranges if nothing is visible.
+        """
+        scale = self.scale
+        first_row = max(0, int(-self.offset_y // scale))
+        end_row = min(self.num_rows, int((self.height - self.offset_y) // scale) + 1)
+        first_col = max(0, int(-self.offset_x // scale))
+        end_col = min(self.num_cols, int((self.width - self.offset_x) // scale) + 1)
+        return first_row, max(first_row, end_row), first_col, max(first_col, end_col)
+
+    def zoom_at(self, x, y, factor):
+        """
+        Zooms by a factor, keeping the maze point under ``(x, y)`` in place.
+
+        Returns:
+            bool: True if the scale changed.
+        """
+        scale = min(self.max_scale, max(self.min_scale, self.scale * factor))
+        if scale == self.scale:
+            return False
+        self.offset_x = x - (x - self.offset_x) * scale / self.scale
+        self.offset_y = y - (y - self.offset_y) * scale / self.scale
+        self.scale = scale
+        return True
+
+    def pan(self, dx, dy):
+        """Moves the maze by ``(dx, dy)`` pixels."""
+        self.offset_x += dx
+        self.offset_y += dy
+
+
+def raster(grid, viewport, path_mask=None):
+    """
+    Samples the visible part of a grid into a grayscale image, one byte per pixel.
+    Each pixel takes the shade of the cell under its center, so the cost is
+    bounded by the viewport size whatever the maze size.
+
+    Args:
+        grid (Grid): The maze walls (any object with ``walls_at``).
+        viewport (Viewport): The visible area.
+        path_mask (bytes-like, optional): One byte per cell, nonzero for cells on
+                                          a path, which are shaded PATH_SHADE.
+
+    Returns:
+        bytes: ``viewport.width * viewport.height`` shade bytes, row-major.
+    """
+    width, height = viewport.width, viewport.height
+    scale, offset_x, offset_y = viewport.scale, viewport.offset_x, viewport.offset_y
+    first_row, end_row, first_col, end_col = viewport.visible_cells()
+    blank_row = bytes([BACKGROUND_SHADE]) * width
+    if first_row == end_row or first_col == end_col:
+        return blank_row * height
+
+    # Screen columns inside the maze and the cell column each of them samples
+    left = max(0, int(offset_x))
+    right = min(width, int(offset_x + grid.num_cols * scale))
+    columns = [min(end_col - 1, int((x + 0.5 - offset_x) / scale)) - first_col
+               for x in range(left, right)]
+    pad_left = bytes([BACKGROUND_SHADE]) * left
+    pad_right = bytes([BACKGROUND_SHADE]) * (width - right)
+
+    walls_at, num_cols = grid.walls_at, grid.num_cols
+    data = grid.data if isinstance(getattr(grid, "data", None), (bytes, bytearray)) else None
+    rows = []
+    last_row, last_pixels = None, blank_row
+    for y in range(height):
+        row_idx = int((y + 0.5 - offset_y) // scale)
+        if not first_row <= row_idx < end_row:
+            rows.append(blank_row)
+            continue
+        if row_idx != last_row:
+            # Consecutive screen rows inside one cell row reuse its pixels
+            base = row_idx * num_cols + first_col
+            if data is not None:
+                cells = bytes(map(data[base:base + end_col - first_col].__getitem__, columns))
+            else:
+                cells = bytes(walls_at(base + col_idx) for col_idx in columns)
+            if path_mask is not None:
+                marks = bytes(map(path_mask[base:base + end_col - first_col].__getitem__, columns))
+                if any(marks):
+                    cells = (int.from_bytes(cells, "little") | int.from_bytes(
+                        marks.translate(_TO_PATH_MARK), "little")).to_bytes(len(cells), "little")
+            last_row = row_idx
+            last_pixels = pad_left + cells.translate(_SHADES) + pad_right
+        rows.append(last_pixels)
+    return b"".join(rows)
+
+
+class ViewportRenderer:
+    """
+    Draws the visible part of a maze onto a Window and redraws it on zoom and pan.
+    """
+
+    def __init__(self, window, grid, viewport=None, tag="viewport"):
+        """
+        Args:
+            window (Window): The window to draw on.
+            grid (Grid): The maze walls (any object implementing the grid protocol).
+            viewport (Viewport, optional): Initial view. Defaults to fitting the maze
+                                           into the window.
+            tag (str): Canvas tag shared by everything this renderer draws.
+        """
+        self._window = window
+        self._grid = grid
+        self.viewport = viewport or Viewport(grid.num_rows, grid.num_cols, window.width, window.height)
+        self._tag = tag
+        self._redraw_pending = False
+        self._drag_from = None
+        self._path_mask = None # One byte per cell, 1 on the shown path
+        self._path_positions = None # Flat index -> position along the shown path
+        self._path = None
+        self.items_drawn = 0 # Canvas items created by the last redraw
+
+    def show_path(self, path):
+        """
+        Draws a path over the maze from the next redraw on.
+
+        Args:
+            path (sequence): Flat cell indices from start to goal; empty or None clears it.
+        """
+        if not path:
+            self._path = self._path_mask = self._path_positions = None
+        else:
+            self._path = path
+            self._path_mask = bytearray(self._grid.num_rows * self._grid.num_cols)
+            for index in path:
+                self._path_mask[index] = 1
+            self._path_positions = {index: position for position, index in enumerate(path)}
+        self.schedule_redraw()
+
+    def attach(self):
+        """Binds mouse-wheel zoom and drag-to-pan, then draws the first frame."""
+        window = self._window
+        window.bind("<MouseWheel>", lambda event: self._zoom(event, event.delta > 0))
+        window.bind("<Button-4>", lambda event: self._zoom(event, True)) # X11 wheel up
+        window.bind("<Button-5>", lambda event: self._zoom(event, False)) # X11 wheel down
+        window.bind("<ButtonPress-1>", self._start_drag)
+        window.bind("<B1-Motion>", self._drag)
+        self.redraw()
+
+    def _zoom(self, event, zoom_in):
+        if self.viewport.zoom_at(event.x, event.y, ZOOM_STEP if zoom_in else 1 / ZOOM_STEP):
+            self.schedule_redraw()
+
+    def _start_drag(self, event):
+        self._drag_from = (event.x, event.y)
+
+    def _drag(self, event):
+        if self._drag_from is None:
+            return
+        self.viewport.pan(event.x - self._drag_from[0], event.y - self._drag_from[1])
+        self._drag_from = (event.x, event.y)
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        """Requests a redraw once pending input events are handled, coalescing bursts."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self._window.after_idle(self.redraw)
+
+    def redraw(self):
+        """Clears this renderer's items and draws the visible part of the maze."""
+        self._redraw_pending = False
+        self._window.delete_tagged(self._tag)
+        self.items_drawn = 0
+        if self.viewport.scale >= LINE_MIN_CELL_PIXELS:
+            self._draw_lines()
+            if self._path is not None:
+                self._draw_path_lines()
+        else:
+            self._draw_raster()
+
+    def _draw_raster(self):
+        viewport = self.viewport
+        header = f"P5 {viewport.width} {viewport.height} 255\n".encode()
+        self._window.create_image(
+            0, 0, header + raster(self._grid, viewport, self._path_mask), self._tag
+        )
+        self.items_drawn += 1
+
+    def _line(self, x1, y1, x2, y2, fill_color=WALL_COLOR):
+        self._window.create_line(x1, y1, x2, y2, fill_color, tag=self._tag)
+        self.items_drawn += 1
+
+    def _draw_path_lines(self):
+        """Draws the steps of the shown path that start in or next to the visible cells."""
+        viewport = self.viewport
+        scale, offset_x, offset_y = viewport.scale, viewport.offset_x, viewport.offset_y
+        first_row, end_row, first_col, end_col = viewport.visible_cells()
+        num_rows, num_cols = self._grid.num_rows, self._grid.num_cols
+        path, mask, positions = self._path, self._path_mask, self._path_positions
+
+        def center(index):
+            row_idx, col_idx = divmod(index, num_cols)
+            return offset_x + (col_idx + 0.5) * scale, offset_y + (row_idx + 0.5) * scale
+
+        # One cell of margin catches steps entering the screen from just outside it
+        for row_idx in range(max(0, first_row - 1), min(num_rows, end_row + 1)):
+            base = row_idx * num_cols
+            for index in range(base + max(0, first_col - 1), base + min(num_cols, end_col + 1)):
+                if not mask[index]:
+                    continue
+                position = positions[index] + 1
+                if position < len(path):
+                    self._line(*center(index), *center(path[position]), PATH_COLOR)
+
+    def _draw_lines(self):
+        """Draws the visible walls, merging collinear runs into single lines."""
+        viewport = self.viewport
+        scale, offset_x, offset_y = viewport.scale, viewport.offset_x, viewport.offset_y
+        first_row, end_row, first_col, end_col = viewport.visible_cells()
+        walls_at, num_rows, num_cols = self._grid.walls_at, self._grid.num_rows, self._grid.num_cols
+
+        # Horizontal lines: top walls of every visible row, plus the bottom edge if visible
+        for row_idx in range(first_row, end_row + 1 if end_row == num_rows else end_row):
+            y = offset_y + row_idx * scale
+            run_start = None
+            for col_idx in range(first_col, end_col + 1):
+                present = col_idx < end_col and (
+                    walls_at(row_idx * num_cols + col_idx) & TOP_WALL if row_idx < num_rows
+                    else walls_at((num_rows - 1) * num_cols + col_idx) & BOTTOM_WALL
+                )
+                if present and run_start is None:
+                    run_start = col_idx
+                elif not present and run_start is not None:
+                    self._line(offset_x + run_start * scale, y, offset_x + col_idx * scale, y)
+                    run_start = None
+
+        # Vertical lines: left walls of every visible column, plus the right edge if visible
+        for col_idx in range(first_col, end_col + 1 if end_col == num_cols else end_col):
+            x = offset_x + col_idx * scale
+            run_start = None
+            for row_idx in range(first_row, end_row + 1):
+                present = row_idx < end_row and (
+                    walls_at(row_idx * num_cols + col_idx) & LEFT_WALL if col_idx < num_cols
+                    else walls_at(row_idx * num_cols + num_cols - 1) & RIGHT_WALL
+                )
+                if present and run_start is None:
+                    run_start = row_idx
+                elif not present and run_start is not None:
+                    self._line(x, offset_y + run_start * scale, x, offset_y + row_idx * scale)
+                    run_start = None
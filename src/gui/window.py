@@ -1,17 +1,22 @@
-from tkinter import Tk, BOTH, Canvas
+from tkinter import Tk, BOTH, Canvas, NW, PhotoImage
+
+from gui.animation import AnimationScheduler
+from maze_logic.geometry import Point, Line # noqa: F401 - re-exported for existing callers
 
 class Window:
     """
     Manages the main application window for drawing the maze.
     Handles window creation, drawing, updates, and closing.
     """
-    def __init__(self, width, height):
+    def __init__(self, width, height, steps_per_frame=10, fps=60):
         """
         Initializes the application window.
 
         Args:
             width (int): The width of the window in pixels.
             height (int): The height of the window in pixels.
+            steps_per_frame (int): Animation steps drawn per frame. Defaults to 10.
+            fps (int): Target animation frame rate. Defaults to 60.
         """
         self._width = width  # Internal window width
         self._height = height # Internal window height
@@ -26,7 +31,30 @@ class Window:
         self._canvas = Canvas(self.root, bg="white", height=self._height, width=self._width)
         self._canvas.pack(fill=BOTH, expand=1) # Pack canvas to fill the window
         
-        self.__running = False # Internal flag to control the main loop
+        self._images = {} # Tag -> PhotoImage; Tk drops images Python no longer references
+
+        # Frame-budgeted animation driven by the Tk event loop
+        self.animator = AnimationScheduler(self.root, steps_per_frame, fps)
+        self.player = None # EventPlayer of the maze's event log, set by an animated Maze
+
+        # Playback controls: space pauses, Return skips to the end, +/- change speed,
+        # Left/Right seek one second of the event log back or ahead
+        self.root.bind("<space>", lambda event: self.playback.toggle_pause())
+        self.root.bind("<Return>", lambda event: self.playback.skip_to_end())
+        self.root.bind("<plus>", lambda event: self.playback.set_speed(self.playback.steps_per_frame * 2))
+        self.root.bind("<minus>", lambda event: self.playback.set_speed(self.playback.steps_per_frame // 2))
+        self.root.bind("<Left>", lambda event: self._seek_seconds(-1))
+        self.root.bind("<Right>", lambda event: self._seek_seconds(1))
+
+    @property
+    def playback(self):
+        """Returns what the playback keys control: the event player if any, else the animator."""
+        return self.player if self.player is not None else self.animator
+
+    def _seek_seconds(self, seconds):
+        """Seeks the event player by the number of steps it plays in the given time."""
+        if self.player is not None:
+            self.player.skip(seconds * self.player.steps_per_frame * self.player.fps)
 
     @property
     def width(self):
@@ -48,19 +76,20 @@ class Window:
 
     def wait_for_close(self):
         """
-        Starts the main loop and keeps the window open until explicitly closed.
+        Runs the Tk main loop until the window is closed.
+        The loop sleeps while idle; animation frames are driven by the scheduler.
         """
-        self.__running = True # Set running flag to True
-        while self.__running:
-            self.redraw() # Continuously redraw the window
+        self.root.mainloop()
         print("Window closed....") # Confirmation message
 
     def close(self):
         """
-        Sets the internal flag to False, allowing the main loop to terminate
-        and close the window.
+        Stops any pending animation and closes the window, ending the main loop.
         """
-        self.__running = False
+        self.animator.stop()
+        if self.player is not None:
+            self.player.stop()
+        self.root.destroy()
 
     def draw_line(self, line_object, fill_color="black"):
         """
@@ -69,54 +98,60 @@ class Window:
         Args:
             line_object (Line): The Line object containing the coordinates.
             fill_color (str): The color to draw the line. Defaults to "black".
+
+        Returns:
+            int: The canvas item ID of the new line.
         """
-        line_object.draw(self._canvas, fill_color) # Delegate drawing to the Line object
-            
+        return line_object.draw(self._canvas, fill_color) # Delegate drawing to the Line object
 
-class Point:
-    """
-    Represents a 2D coordinate point.
-    """
-    def __init__(self, x, y):
+    def create_line(self, x1, y1, x2, y2, fill_color="black", tag=None):
         """
-        Initializes a Point object.
+        Draws a line on the canvas straight from coordinates.
 
         Args:
-            x (int): The X-coordinate.
-            y (int): The Y-coordinate.
-        """
-        self.x = x # X-coordinate of the point
-        self.y = y # Y-coordinate of the point
+            tag (str, optional): Canvas tag for deleting the line later with delete_tagged().
 
+        Returns:
+            int: The canvas item ID of the new line, for later recolor_line() calls.
+        """
+        return self._canvas.create_line(x1, y1, x2, y2, fill=fill_color, width=2, tags=tag)
 
-class Line:
-    """
-    Represents a line segment defined by two Point objects.
-    """
-    def __init__(self, point_1, point_2):
+    def create_image(self, x, y, data, tag):
         """
-        Initializes a Line object.
+        Shows an image with its top-left corner at ``(x, y)``.
 
         Args:
-            point_1 (Point): The starting point of the line.
-            point_2 (Point): The ending point of the line.
+            x (int): X-coordinate of the image's top-left corner.
+            y (int): Y-coordinate of the image's top-left corner.
+            data (bytes): Image data in a format Tk reads natively, such as binary PGM/PPM.
+            tag (str): Canvas tag of the image; a later image with the same tag replaces it.
+
+        Returns:
+            int: The canvas item ID of the image.
         """
-        self._x1 = point_1.x # X-coordinate of the first point
-        self._y1 = point_1.y # Y-coordinate of the first point
-        self._x2 = point_2.x # X-coordinate of the second point
-        self._y2 = point_2.y # Y-coordinate of the second point
+        image = PhotoImage(master=self.root, data=data)
+        self._images[tag] = image
+        return self._canvas.create_image(x, y, image=image, anchor=NW, tags=tag)
+
+    def delete_tagged(self, tag):
+        """Deletes every canvas item with the given tag."""
+        self._canvas.delete(tag)
+        self._images.pop(tag, None)
 
+    def bind(self, sequence, callback):
+        """Binds a canvas event, such as "<MouseWheel>", to a callback."""
+        self._canvas.bind(sequence, callback)
 
-    def draw(self, canvas_instance, fill_color):
+    def after_idle(self, callback):
+        """Runs a callback once Tk has handled the pending events."""
+        self.root.after_idle(callback)
+
+    def recolor_line(self, item_id, fill_color):
         """
-        Draws the line on a given Tkinter Canvas.
+        Changes the color of an existing line without creating a new canvas item.
 
         Args:
-            canvas_instance (tkinter.Canvas): The Canvas object to draw on.
-            fill_color (str): The color to draw the line.
-        """
-        canvas_instance.create_line(
-            self._x1, self._y1, self._x2, self._y2, # Coordinates for the line
-            fill=fill_color, # Line color
-            width=2          # Line thickness
-        )
\ No newline at end of file
+            item_id (int): The canvas item ID returned when the line was drawn.
+            fill_color (str): The new color.
+        """
+        self._canvas.itemconfig(item_id, fill=fill_color)
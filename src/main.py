@@ -1,39 +1,83 @@
+import argparse
+from tkinter import Button
+
 from gui.window import Window
+from gui.viewport import LINE_MIN_CELL_PIXELS, Viewport, ViewportRenderer
+from maze_logic.generators import GENERATORS
 from maze_logic.maze import Maze
 
 
-def main():
+def main(argv=None):
     """
     Initializes and runs the maze generation and solving application.
     Sets up window dimensions, maze parameters, and starts the event loop.
+
+    Mazes whose cells would be smaller than LINE_MIN_CELL_PIXELS are generated
+    without animation and shown in a zoomable, pannable viewport instead; their
+    "Solve Maze" button finds the shortest path and draws it in the viewport.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
     """
+    parser = argparse.ArgumentParser(description="Maze generator and solver")
+    parser.add_argument("--rows", type=int, default=10, help="number of rows (default 10)")
+    parser.add_argument("--cols", type=int, default=20, help="number of columns (default 20)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--algorithm", choices=sorted(GENERATORS), default="dfs")
+    args = parser.parse_args(argv)
+
     # Define window dimensions
     window_width = 800
     window_height = 600
-    
-    # Initialize the main drawing window
-    # Added 100 to height to accommodate the "Solve Maze" button at the bottom
-    window = Window(window_width, window_height + 100) 
 
     # Define margins for the maze within the window
     maze_margin_x = 50
     maze_margin_y = 50
-    
+
     # Define the number of rows and columns for the maze grid
-    num_rows = 10
-    num_cols = 20
-    
+    num_rows = args.rows
+    num_cols = args.cols
+
     # Calculate individual cell dimensions based on total maze area and cell count
     cell_width = (window_width - (2 * maze_margin_x)) / num_cols
     cell_height = (window_height - (2 * maze_margin_y)) / num_rows
-    
+
+    if min(cell_width, cell_height) < LINE_MIN_CELL_PIXELS:
+        # Too large to animate cell by cell: generate headless, then browse it
+        # Added 100 to height to accommodate the "Solve Maze" button at the bottom
+        window = Window(window_width, window_height + 100)
+        maze = Maze(0, 0, num_rows, num_cols, 1, 1, None,
+                    random_seed=args.seed, algorithm=args.algorithm)
+        renderer = ViewportRenderer(
+            window, maze.grid, Viewport(num_rows, num_cols, window_width, window_height)
+        )
+        renderer.attach()
+
+        # Solving is not animated at this size; the shortest path is drawn at once
+        solve_button = Button(
+            window.root,
+            text="Solve Maze",
+            width=7, height=2,
+            command=lambda: renderer.show_path(maze.solve_maze("bfs")),
+            background="blue",
+            foreground="white"
+        )
+        solve_button.place(x=window_width / 2 - 35, y=window_height + 25)
+        window.wait_for_close()
+        return
+
+    # Initialize the main drawing window
+    # Added 100 to height to accommodate the "Solve Maze" button at the bottom
+    window = Window(window_width, window_height + 100)
+
     # Create the Maze instance, passing all necessary parameters
     # The maze generation and drawing happens within the Maze.__init__
     maze = Maze(
         maze_margin_x, maze_margin_y,
         num_rows, num_cols,
         cell_width, cell_height,
-        window # Pass the window instance for drawing
+        window, # Pass the window instance for drawing
+        random_seed=args.seed, algorithm=args.algorithm,
     )
 
     # Start the window's event loop; waits until the window is closed by the user
@@ -41,4 +85,4 @@ def main():
 
 # Entry point for the script execution
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,118 @@
+"""
+Headless command-line entry point: ``python -m maze_logic`` (run from ``src/``).
+
+Generates one maze, optionally solves it, and writes it as text, PNG, PPM or
+the compact binary maze format. Nothing here imports tkinter, and modules only
+needed by one output format are imported when that format is chosen, so
+short-lived batch invocations start quickly. Startup and per-phase timings
+are reported on stderr.
+
+Examples:
+
+    python -m maze_logic 20 40 --seed 7 --solver bfs
+    python -m maze_logic 2000 2000 --algorithm kruskal --format png --output maze.png
+"""
+import time
+
+_STARTED = time.perf_counter() # Taken before any other import, to time startup
+
+import argparse  # noqa: E402
+import sys  # noqa: E402
+
+from maze_logic.generators import GENERATORS  # noqa: E402
+from maze_logic.maze import Maze  # noqa: E402
+from maze_logic.solvers import SOLVERS  # noqa: E402
+
+FORMATS = ("text", "png", "ppm", "maze", "none")
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m maze_logic", description="Generate and solve a maze without a GUI."
+    )
+    parser.add_argument("rows", type=int, help="number of rows")
+    parser.add_argument("cols", type=int, help="number of columns")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--algorithm", choices=sorted(GENERATORS), default="dfs",
+                        help="generation engine (default dfs)")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default=None,
+                        help="solve the maze and include the path in the output")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="output format (default: from --output's extension, else text)")
+    parser.add_argument("--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--cell-size", type=int, default=4, help="pixels per cell for images")
+    parser.add_argument("--quiet", action="store_true", help="do not report timings")
+    return parser.parse_args(argv)
+
+
+def _format_for(args):
+    """Picks the output format from --format or the output file's extension."""
+    if args.format is not None:
+        return args.format
+    extension = args.output.rsplit(".", 1)[-1].lower() if "." in args.output else ""
+    return {"png": "png", "ppm": "ppm", "maze": "maze", "bin": "maze"}.get(extension, "text")
+
+
+def _write(maze, path, args, fmt):
+    """Writes the maze in the chosen format."""
+    if fmt == "none":
+        return
+    if fmt == "maze":
+        if args.output == "-":
+            raise SystemExit("the maze format needs --output FILE")
+        maze.save(args.output)
+        return
+
+    from maze_logic import export # Only image and text output need the rasterizer
+
+    if fmt == "text":
+        lines = "\n".join(export.iter_text_rows(maze.grid, path)) + "\n"
+        if args.output == "-":
+            sys.stdout.write(lines)
+        else:
+            with open(args.output, "w") as out:
+                out.write(lines)
+        return
+    out = sys.stdout.buffer if args.output == "-" else args.output
+    export.export_image(maze.grid, out, fmt, args.cell_size, path)
+
+
+def main(argv=None):
+    """
+    Runs the CLI.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The process exit code.
+    """
+    args = _parse_args(argv)
+    fmt = _format_for(args)
+    timings = [("startup", time.perf_counter() - _STARTED)]
+
+    start = time.perf_counter()
+    maze = Maze(0, 0, args.rows, args.cols, 1, 1, None, True,
+                random_seed=args.seed, algorithm=args.algorithm)
+    timings.append(("generate", time.perf_counter() - start))
+
+    path = None
+    if args.solver is not None:
+        start = time.perf_counter()
+        path = maze.solve_maze(args.solver)
+        timings.append(("solve", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    _write(maze, path, args, fmt)
+    timings.append(("write", time.perf_counter() - start))
+
+    if not args.quiet:
+        report = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings)
+        if path is not None:
+            report += f" path_length={len(path)}"
+        print(report, file=sys.stderr)
+    return 0 if path is None or len(path) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
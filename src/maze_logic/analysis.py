@@ -0,0 +1,382 @@
+"""
+Perfect-maze validation and quality metrics for batch production.
+
+``analyze`` checks a maze's wall bytes directly, without building ``Cell``
+objects, and returns a ``MazeReport``:
+
+* the walls are consistent: every shared wall is recorded on both of its
+  cells and the outer border is closed, except for the entrance at the top
+  of (0, 0) and the exit at the bottom of the bottom-right cell, which must
+  both be open;
+* the passages connect every cell (``components == 1``) and form no loops
+  (``cycles == 0``), found with a union-find over the passages;
+* quality metrics: dead ends, junctions, the branching factor, a histogram
+  of corridor lengths and the length of the entrance-to-exit solution.
+
+A corridor is a maximal chain of passages joined at cells that have exactly
+two passages; its length is the number of passages in it. Corridors come
+from the same union-find, run over passages instead of cells.
+
+With NumPy installed, the union-finds run as vectorized pointer jumping over
+whole arrays of passages, and ``analyze_many`` stacks many mazes into one
+array so a single pass covers them all; without NumPy a plain Python
+union-find gives the same results. Reports convert to plain ``dict``
+records with ``to_dict()``, and ``analyze_batch`` checks the output of
+``generate_batch`` as it streams.
+"""
+from collections import Counter
+
+from maze_logic.grid import Grid, LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+from maze_logic.solvers import solve_bfs
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover - exercised only without NumPy
+    np = None
+
+# Cell byte -> 1 if the given wall is up, else 0
+_WALL_BITS = {wall: bytes(1 if b & wall else 0 for b in range(256))
+              for wall in (LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL)}
+
+
+class MazeReport:
+    """
+    Validation results and quality metrics for one maze.
+    """
+
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.walls_consistent = False # Shared walls mirrored and the border closed
+        self.entrance_open = False # Top wall of (0, 0) is open
+        self.exit_open = False # Bottom wall of the bottom-right cell is open
+        self.components = 0 # Connected regions of cells
+        self.cycles = 0 # Passages beyond a spanning forest; 0 means no loops
+        self.dead_ends = 0 # Cells with exactly one passage
+        self.junctions = 0 # Cells with three or four passages
+        self.branching_factor = 0.0 # Mean ways onward from cells with two or more passages
+        self.corridor_lengths = {} # Corridor length in passages -> number of corridors
+        self.solution_length = 0 # Cells on the shortest entrance-to-exit path, 0 if none
+
+    @property
+    def is_perfect(self):
+        """Returns True if the maze is fully connected, loop-free and properly opened."""
+        return (self.walls_consistent and self.entrance_open and self.exit_open
+                and self.components == 1 and self.cycles == 0)
+
+    def to_dict(self):
+        """Returns the report as plain data, e.g. for JSON lines or CSV."""
+        return {
+            "num_rows": self.num_rows,
+            "num_cols": self.num_cols,
+            "is_perfect": self.is_perfect,
+            "walls_consistent": self.walls_consistent,
+            "entrance_open": self.entrance_open,
+            "exit_open": self.exit_open,
+            "components": self.components,
+            "cycles": self.cycles,
+            "dead_ends": self.dead_ends,
+            "junctions": self.junctions,
+            "branching_factor": self.branching_factor,
+            "corridor_lengths": dict(self.corridor_lengths),
+            "solution_length": self.solution_length,
+        }
+
+    def __repr__(self):
+        return f"MazeReport({self.to_dict()!r})"
+
+
+def _wall_bytes(walls, num_rows, num_cols):
+    """Returns (bytes, num_rows, num_cols) for a Grid, PackedGrid, NumPy array or raw wall bytes."""
+    if np is not None and isinstance(walls, np.ndarray):
+        num_rows, num_cols = walls.shape
+        return walls.astype(np.uint8, copy=False).tobytes(), num_rows, num_cols
+    if hasattr(walls, "walls_at"):
+        num_rows, num_cols = walls.num_rows, walls.num_cols
+        data = getattr(walls, "data", None)
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data), num_rows, num_cols
+        return bytes(walls.walls_at(index) for index in range(walls.size)), num_rows, num_cols
+    if num_rows is None or num_cols is None:
+        raise ValueError("num_rows and num_cols are required for raw wall bytes")
+    data = bytes(walls)
+    if len(data) != num_rows * num_cols:
+        raise ValueError(f"expected {num_rows * num_cols} cell bytes, got {len(data)}")
+    return data, num_rows, num_cols
+
+
+def _check_walls(report, data, num_rows, num_cols):
+    """Fills in the wall consistency and opening checks with whole-bytes comparisons."""
+    size = num_rows * num_cols
+    left, right = data.translate(_WALL_BITS[LEFT_WALL]), data.translate(_WALL_BITS[RIGHT_WALL])
+    top, bottom = data.translate(_WALL_BITS[TOP_WALL]), data.translate(_WALL_BITS[BOTTOM_WALL])
+    border = (
+        left[::num_cols] == b"\x01" * num_rows
+        and right[num_cols - 1::num_cols] == b"\x01" * num_rows
+        and top[1:num_cols] == b"\x01" * (num_cols - 1)
+        and bottom[size - num_cols:size - 1] == b"\x01" * (num_cols - 1)
+    )
+    # With the border closed, comparing across row ends is harmless: both sides are border walls
+    mirrored = right[:-1] == left[1:] and bottom[:size - num_cols] == top[num_cols:]
+    report.walls_consistent = border and mirrored
+    report.entrance_open = top[0] == 0
+    report.exit_open = bottom[size - 1] == 0
+
+
+def _passages_python(data, num_rows, num_cols):
+    """Returns the passages as two lists of flat indices, lower cell first."""
+    size = num_rows * num_cols
+    first, second = [], []
+    for index in range(size):
+        walls = data[index]
+        if not walls & RIGHT_WALL and (index + 1) % num_cols:
+            first.append(index)
+            second.append(index + 1)
+        if not walls & BOTTOM_WALL and index < size - num_cols:
+            first.append(index)
+            second.append(index + num_cols)
+    return first, second
+
+
+def _roots_python(size, first, second):
+    """Union-find with path halving; returns every element's root."""
+    parent = list(range(size))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index_a, index_b in zip(first, second):
+        root_a, root_b = find(index_a), find(index_b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+    return [find(index) for index in range(size)]
+
+
+def _analyze_python(report, data, num_rows, num_cols):
+    """Connectivity and corridors of one maze; returns (passage count, cells per degree)."""
+    size = num_rows * num_cols
+    first, second = _passages_python(data, num_rows, num_cols)
+    degree = [0] * size
+    incident = [[] for _ in range(size)] # Cell -> passages touching it
+    for passage, (index_a, index_b) in enumerate(zip(first, second)):
+        degree[index_a] += 1
+        degree[index_b] += 1
+        incident[index_a].append(passage)
+        incident[index_b].append(passage)
+
+    report.components = len(set(_roots_python(size, first, second)))
+    degrees = Counter(degree)
+
+    # Corridors: passages joined through every cell with exactly two of them
+    links = [incident[index] for index in range(size) if degree[index] == 2]
+    corridor_roots = _roots_python(len(first), [pair[0] for pair in links], [pair[1] for pair in links])
+    report.corridor_lengths = dict(sorted(Counter(Counter(corridor_roots).values()).items()))
+    return len(first), degrees
+
+
+def _roots_numpy(size, first, second):
+    """
+    Union-find by vectorized pointer jumping: every round, each root hooks onto
+    the smallest root it shares a pair with, then all paths are compressed.
+    Pairs whose ends already share a root are dropped for good.
+    """
+    parent = np.arange(size)
+    while first.size:
+        root_a, root_b = parent[first], parent[second]
+        apart = root_a != root_b
+        first, second, root_a, root_b = first[apart], second[apart], root_a[apart], root_b[apart]
+        if not first.size:
+            break
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return parent
+
+
+def _solution_lengths(walls, count, num_rows, num_cols):
+    """
+    Breadth-first searches from every maze's entrance at once, expanding the
+    combined frontier with array operations; a maze drops out once its exit is reached.
+    """
+    size = num_rows * num_cols
+    distance = np.full(count * size, -1, dtype=np.int32)
+    frontier = np.arange(count) * size
+    goals = frontier + size - 1
+    distance[frontier] = 0
+    step = 0
+    while frontier.size:
+        step += 1
+        cell_walls = walls[frontier]
+        cols = frontier % num_cols
+        rows = frontier // num_cols % num_rows
+        candidates = np.concatenate((
+            frontier[((cell_walls & RIGHT_WALL) == 0) & (cols < num_cols - 1)] + 1,
+            frontier[((cell_walls & LEFT_WALL) == 0) & (cols > 0)] - 1,
+            frontier[((cell_walls & BOTTOM_WALL) == 0) & (rows < num_rows - 1)] + num_cols,
+            frontier[((cell_walls & TOP_WALL) == 0) & (rows > 0)] - num_cols,
+        ))
+        frontier = np.unique(candidates[distance[candidates] < 0])
+        distance[frontier] = step
+        frontier = frontier[distance[goals[frontier // size]] < 0]
+    reached = distance[goals]
+    return np.where(reached >= 0, reached + 1, 0)
+
+
+def _analyze_stack(stack, solve):
+    """
+    Analyzes a ``(count, num_rows, num_cols)`` stack of wall arrays in one go.
+    The mazes are treated as one graph of disjoint parts, so every step is a
+    handful of array operations whatever the number of mazes.
+    """
+    count, num_rows, num_cols = stack.shape
+    size = num_rows * num_cols
+    total = count * size
+    left, right = (stack & LEFT_WALL) != 0, (stack & RIGHT_WALL) != 0
+    top, bottom = (stack & TOP_WALL) != 0, (stack & BOTTOM_WALL) != 0
+    border = (left[:, :, 0].all(axis=1) & right[:, :, -1].all(axis=1)
+              & top[:, 0, 1:].all(axis=1) & bottom[:, -1, :-1].all(axis=1))
+    mirrored = ((right[:, :, :-1] == left[:, :, 1:]).all(axis=(1, 2))
+                & (bottom[:, :-1] == top[:, 1:]).all(axis=(1, 2)))
+
+    cells = np.arange(total).reshape(count, num_rows, num_cols)
+    rights = cells[:, :, :-1][~right[:, :, :-1]]
+    downs = cells[:, :-1][~bottom[:, :-1]]
+    first = np.concatenate((rights, downs))
+    second = np.concatenate((rights + 1, downs + num_cols))
+
+    ends = np.concatenate((first, second))
+    degree = np.bincount(ends, minlength=total)
+    roots = _roots_numpy(total, first, second)
+    components = np.bincount(np.flatnonzero(roots == np.arange(total)) // size, minlength=count)
+    passages = np.bincount(first // size, minlength=count)
+    degrees = np.bincount(np.arange(total) // size * 5 + degree, minlength=5 * count).reshape(count, 5)
+
+    # Corridors: pair up the two passages of every cell with exactly two of them
+    passage_ids = np.concatenate((np.arange(first.size), np.arange(first.size)))
+    through = degree[ends] == 2
+    linked = passage_ids[through][np.argsort(ends[through], kind="stable")]
+    corridor_sizes = np.bincount(_roots_numpy(first.size, linked[0::2], linked[1::2]), minlength=first.size)
+    heads = np.flatnonzero(corridor_sizes)
+    width = 2 * size # Longer than any corridor
+    keys, key_counts = np.unique(first[heads] // size * width + corridor_sizes[heads], return_counts=True)
+    histograms = [{} for _ in range(count)]
+    for key, corridors in zip(keys.tolist(), key_counts.tolist()):
+        histograms[key // width][key % width] = corridors
+
+    solutions = _solution_lengths(stack.reshape(-1), count, num_rows, num_cols) if solve else None
+    reports = []
+    for maze in range(count):
+        report = MazeReport(num_rows, num_cols)
+        report.walls_consistent = bool(border[maze] and mirrored[maze])
+        report.entrance_open = not top[maze, 0, 0]
+        report.exit_open = not bottom[maze, -1, -1]
+        report.components = int(components[maze])
+        report.corridor_lengths = histograms[maze]
+        _set_counts(report, int(passages[maze]), degrees[maze].tolist())
+        if solve:
+            report.solution_length = int(solutions[maze])
+        reports.append(report)
+    return reports
+
+
+def _set_counts(report, passages, degrees):
+    """Derives loop and branching metrics from the passage count and cells per degree."""
+    report.cycles = passages - (report.num_rows * report.num_cols - report.components)
+    report.dead_ends = degrees[1]
+    report.junctions = degrees[3] + degrees[4]
+    passing = report.num_rows * report.num_cols - degrees[0] - degrees[1]
+    if passing:
+        report.branching_factor = (degrees[2] + 2 * degrees[3] + 3 * degrees[4]) / passing
+
+
+def analyze(walls, num_rows=None, num_cols=None, solve=True):
+    """
+    Validates a maze and measures its quality in one pass over its walls.
+
+    Args:
+        walls (Grid, PackedGrid, numpy.ndarray or bytes-like): The maze walls, one
+            byte per cell in the layout of maze_logic.grid, e.g. from generate_batch.
+        num_rows (int, optional): Rows of the maze; required for raw wall bytes.
+        num_cols (int, optional): Columns of the maze; required for raw wall bytes.
+        solve (bool): If False, the solution length is not computed (left at 0).
+
+    Returns:
+        MazeReport: The checks and metrics.
+
+    Raises:
+        ValueError: If raw wall bytes are given without matching dimensions.
+    """
+    data, num_rows, num_cols = _wall_bytes(walls, num_rows, num_cols)
+    if np is not None:
+        stack = np.frombuffer(data, dtype=np.uint8).reshape(1, num_rows, num_cols)
+        return _analyze_stack(stack, solve)[0]
+
+    report = MazeReport(num_rows, num_cols)
+    _check_walls(report, data, num_rows, num_cols)
+    passages, degrees = _analyze_python(report, data, num_rows, num_cols)
+    _set_counts(report, passages, degrees)
+    if solve:
+        report.solution_length = len(solve_bfs(Grid(num_rows, num_cols, data), 0, num_rows * num_cols - 1))
+    return report
+
+
+def analyze_many(mazes, num_rows, num_cols, solve=True):
+    """
+    Validates many mazes of the same size. With NumPy they are analyzed
+    together, which is far faster than one analyze() call each for small mazes.
+
+    Args:
+        mazes (sequence): Wall bytes (or anything analyze() accepts) of each maze.
+        num_rows (int): The number of rows of every maze.
+        num_cols (int): The number of columns of every maze.
+        solve (bool): If False, solution lengths are not computed.
+
+    Returns:
+        list: One MazeReport per maze, in order.
+    """
+    if np is None:
+        return [analyze(walls, num_rows, num_cols, solve) for walls in mazes]
+    if not mazes:
+        return []
+    data = b"".join(_wall_bytes(walls, num_rows, num_cols)[0] for walls in mazes)
+    stack = np.frombuffer(data, dtype=np.uint8).reshape(-1, num_rows, num_cols)
+    return _analyze_stack(stack, solve)
+
+
+def analyze_batch(batch, num_rows, num_cols, solve=True, chunk_size=1024):
+    """
+    Validates a stream of generated mazes, a chunk at a time.
+
+    Args:
+        batch (iterable): (index, seed, walls) tuples, as yielded by generate_batch.
+        num_rows (int): The number of rows of every maze.
+        num_cols (int): The number of columns of every maze.
+        solve (bool): If False, solution lengths are not computed.
+        chunk_size (int): How many mazes are analyzed together.
+
+    Yields:
+        dict: The maze's report as a record, with its "index" and "seed" added.
+    """
+    chunk = []
+    for item in batch:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield from _records(chunk, num_rows, num_cols, solve)
+            chunk = []
+    yield from _records(chunk, num_rows, num_cols, solve)
+
+
+def _records(chunk, num_rows, num_cols, solve):
+    """Analyzes one chunk of (index, seed, walls) tuples into records."""
+    reports = analyze_many([walls for _, _, walls in chunk], num_rows, num_cols, solve)
+    for (index, seed, _), report in zip(chunk, reports):
+        record = report.to_dict()
+        record["index"] = index
+        record["seed"] = seed
+        yield record
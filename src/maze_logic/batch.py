@@ -0,0 +1,73 @@
+"""
+Batch maze generation across a process pool.
+
+Each maze in a batch gets its own seed derived from the batch seed and its
+index, and every ``Maze`` owns its random number generator, so the walls
+produced for a given index are identical whatever the number of workers or
+the order in which results come back.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+
+from maze_logic.maze import Maze
+from maze_logic.seeding import derive_seed
+
+
+def build_walls(num_rows, num_cols, random_seed, algorithm="dfs"):
+    """
+    Generates one headless maze and returns its packed wall bytes.
+    Module-level so it can be pickled to worker processes.
+
+    Returns:
+        bytes: One wall byte per cell, row-major (see maze_logic.grid).
+    """
+    maze = Maze(0, 0, num_rows, num_cols, 1, 1, None, True,
+                random_seed=random_seed, algorithm=algorithm)
+    return bytes(maze._cells.data)
+
+
+def _build_indexed(index, num_rows, num_cols, random_seed, algorithm):
+    """Worker task: builds one maze and tags it with its batch index and seed."""
+    return index, random_seed, build_walls(num_rows, num_cols, random_seed, algorithm)
+
+
+def generate_batch(count, num_rows, num_cols, base_seed=0, algorithm="dfs",
+                   max_workers=None, ordered=True):
+    """
+    Generates ``count`` mazes in parallel.
+
+    Args:
+        count (int): Number of mazes to generate.
+        num_rows (int): The number of rows of every maze.
+        num_cols (int): The number of columns of every maze.
+        base_seed (int): Batch seed; maze ``i`` uses ``derive_seed(base_seed, i)``.
+        algorithm (str): Generation engine name (see maze_logic.generators).
+        max_workers (int, optional): Worker processes. Defaults to the CPU count;
+                                     1 generates in the calling process.
+        ordered (bool): If True, results are yielded in index order; otherwise
+                        as soon as each maze completes.
+
+    Yields:
+        tuple: (index, seed, walls) where walls is the maze's packed wall bytes.
+    """
+    tasks = [
+        (index, num_rows, num_cols, derive_seed(base_seed, index), algorithm)
+        for index in range(count)
+    ]
+
+    if not tasks:
+        return
+    if max_workers == 1:
+        for task in tasks:
+            yield _build_indexed(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        if ordered:
+            # Map with chunks to amortize inter-process overhead on small mazes
+            chunksize = max(1, count // ((max_workers or os.cpu_count() or 1) * 4))
+            yield from executor.map(_build_indexed, *zip(*tasks), chunksize=chunksize)
+        else:
+            futures = [executor.submit(_build_indexed, *task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
@@ -1,4 +1,4 @@
-from gui.window import Point, Line
+from maze_logic.geometry import Point, Line
 
 class Cell:
     """
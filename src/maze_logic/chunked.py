@@ -0,0 +1,191 @@
+"""
+Lazily generated, chunked mazes of effectively unbounded size.
+
+A ``ChunkedGrid`` splits the maze into fixed-size square chunks. Each chunk is
+generated on demand with one of the regular generators, seeded from the
+global seed and the chunk's position, so any chunk can be rebuilt at any time
+and always comes out the same. Only recently used chunks are kept in memory.
+
+The chunks are joined into one perfect maze by a binary-tree layout at chunk
+level: every chunk opens exactly one door into the chunk above it or the
+chunk to its left (the top row always goes left, the left column always goes
+up). A chunk's door is decided by the first draws of its own random number
+generator, so a chunk can open the doors its right and lower neighbors punch
+into it without generating them.
+"""
+from collections import OrderedDict
+import random
+import sys
+
+from maze_logic.generators import get_generator
+from maze_logic.grid import Grid, ALL_WALLS, LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+from maze_logic.seeding import derive_seed
+
+
+class ChunkedGrid:
+    """
+    A read-only maze grid generated one chunk at a time.
+
+    Implements the grid protocol the solvers and renderer use (``num_rows``,
+    ``num_cols``, ``size``, ``index``, ``coords``, ``walls_at``, ``walls`` and
+    ``has_wall``), with the entrance and exit open like a regular Maze.
+    """
+    sparse = True # Tells the solvers to keep sparse bookkeeping
+
+    def __init__(self, num_rows, num_cols, chunk_size=64, random_seed=0, algorithm="dfs",
+                 max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            num_rows (int): The number of rows in the maze.
+            num_cols (int): The number of columns in the maze.
+            chunk_size (int): Side length of a chunk in cells.
+            random_seed (int): Global seed; chunk seeds are derived from it.
+            algorithm (str): Generation engine used inside every chunk.
+            max_bytes (int): Approximate memory cap of the chunk cache.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.chunk_size = chunk_size
+        self.random_seed = random_seed
+        self.max_bytes = max_bytes
+        self._generator = get_generator(algorithm)
+        self._chunk_rows = -(-num_rows // chunk_size)
+        self._chunk_cols = -(-num_cols // chunk_size)
+
+        self._chunks = OrderedDict() # (chunk_row, chunk_col) -> Grid, least recently used first
+        self._chunk_bytes = {} # (chunk_row, chunk_col) -> memory charged for it
+        self.cached_bytes = 0
+        self.chunks_generated = 0 # Including chunks regenerated after eviction
+
+    @property
+    def size(self):
+        """Returns the total number of cells."""
+        return self.num_rows * self.num_cols
+
+    def index(self, row_idx, col_idx):
+        """Returns the flat index of the cell at ``(row_idx, col_idx)``."""
+        return row_idx * self.num_cols + col_idx
+
+    def coords(self, index):
+        """Returns the ``(row, col)`` of a flat index."""
+        return divmod(index, self.num_cols)
+
+    def _mask(self, row_idx, col_idx):
+        """Returns the 4-bit wall mask of the cell at ``(row_idx, col_idx)``."""
+        chunk_size = self.chunk_size
+        chunk = self.chunk(row_idx // chunk_size, col_idx // chunk_size)
+        return chunk.data[(row_idx % chunk_size) * chunk.num_cols + col_idx % chunk_size] & ALL_WALLS
+
+    def walls(self, row_idx, col_idx):
+        """
+        Returns the walls of a cell as booleans.
+
+        Returns:
+            tuple: (has_left_wall, has_right_wall, has_top_wall, has_bottom_wall)
+        """
+        mask = self._mask(row_idx, col_idx)
+        return (
+            bool(mask & LEFT_WALL),
+            bool(mask & RIGHT_WALL),
+            bool(mask & TOP_WALL),
+            bool(mask & BOTTOM_WALL),
+        )
+
+    def walls_at(self, index):
+        """Returns the 4-bit wall mask of the cell at a flat index."""
+        return self._mask(*divmod(index, self.num_cols))
+
+    def has_wall(self, row_idx, col_idx, wall):
+        """Returns True if the given wall of a cell is present."""
+        return bool(self._mask(row_idx, col_idx) & wall)
+
+    def _chunk_shape(self, chunk_row, chunk_col):
+        """Returns the (rows, cols) of a chunk; edge chunks may be smaller."""
+        chunk_size = self.chunk_size
+        return (min(chunk_size, self.num_rows - chunk_row * chunk_size),
+                min(chunk_size, self.num_cols - chunk_col * chunk_size))
+
+    def _chunk_rng(self, chunk_row, chunk_col):
+        """
+        Returns the chunk's random number generator and its door.
+
+        Returns:
+            tuple: (rng, door_wall, door_offset); door_wall is TOP_WALL, LEFT_WALL or
+                   None for the first chunk, and the offset is along that side.
+        """
+        rng = random.Random(derive_seed(self.random_seed, chunk_row * self._chunk_cols + chunk_col))
+        # Always draw both values so the generator sees the same sequence for every chunk
+        goes_up = rng.random() < 0.5
+        position = rng.random()
+        rows, cols = self._chunk_shape(chunk_row, chunk_col)
+        if chunk_row == 0 and chunk_col == 0:
+            return rng, None, 0
+        if chunk_row == 0 or (chunk_col > 0 and not goes_up):
+            return rng, LEFT_WALL, int(position * rows)
+        return rng, TOP_WALL, int(position * cols)
+
+    def _generate(self, chunk_row, chunk_col):
+        """Builds one chunk: a perfect maze inside, plus every door on its sides."""
+        rows, cols = self._chunk_shape(chunk_row, chunk_col)
+        grid = Grid(rows, cols)
+        rng, door, offset = self._chunk_rng(chunk_row, chunk_col)
+        self._generator.generate(grid, rng)
+        grid.reset_visited()
+
+        # Own door into the chunk above or to the left
+        if door == TOP_WALL:
+            grid.set_wall(0, offset, TOP_WALL, False)
+        elif door == LEFT_WALL:
+            grid.set_wall(offset, 0, LEFT_WALL, False)
+        # Doors the chunks below and to the right open into this one
+        if chunk_row + 1 < self._chunk_rows:
+            _, door, offset = self._chunk_rng(chunk_row + 1, chunk_col)
+            if door == TOP_WALL:
+                grid.set_wall(rows - 1, offset, BOTTOM_WALL, False)
+        if chunk_col + 1 < self._chunk_cols:
+            _, door, offset = self._chunk_rng(chunk_row, chunk_col + 1)
+            if door == LEFT_WALL:
+                grid.set_wall(offset, cols - 1, RIGHT_WALL, False)
+
+        # Entrance and exit of the whole maze
+        if chunk_row == 0 and chunk_col == 0:
+            grid.set_wall(0, 0, TOP_WALL, False)
+        if chunk_row == self._chunk_rows - 1 and chunk_col == self._chunk_cols - 1:
+            grid.set_wall(rows - 1, cols - 1, BOTTOM_WALL, False)
+
+        self.chunks_generated += 1
+        return grid
+
+    def chunk(self, chunk_row, chunk_col):
+        """
+        Returns the Grid of one chunk, generating it if it is not cached.
+
+        Args:
+            chunk_row (int): Row of the chunk in the chunk layout.
+            chunk_col (int): Column of the chunk in the chunk layout.
+        """
+        key = (chunk_row, chunk_col)
+        chunks = self._chunks
+        grid = chunks.get(key)
+        if grid is not None:
+            chunks.move_to_end(key)
+            return grid
+
+        grid = self._generate(chunk_row, chunk_col)
+        chunks[key] = grid
+        charge = sys.getsizeof(grid.data)
+        self._chunk_bytes[key] = charge
+        self.cached_bytes += charge
+        # Evict least recently used chunks, always keeping the one just built
+        while self.cached_bytes > self.max_bytes and len(chunks) > 1:
+            old_key, _ = chunks.popitem(last=False)
+            self.cached_bytes -= self._chunk_bytes.pop(old_key)
+        return grid
+
+    def clear_cache(self):
+        """Drops every cached chunk."""
+        self._chunks.clear()
+        self._chunk_bytes.clear()
+        self.cached_bytes = 0
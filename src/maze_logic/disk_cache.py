@@ -0,0 +1,220 @@
+"""
+Content-addressed on-disk cache of generated mazes.
+
+Generation is deterministic once seeded, so a maze is identified by its
+parameters: rows, columns, seed, algorithm, the generator's version (see
+``MazeGenerator.version``) and the generator instance's own parameters, such
+as ``DepthFirstGenerator(start=...)``. The hash of those names a file in the compact
+format of ``maze_logic.storage``, stored under a two-level fan-out directory.
+
+The cache is safe to share between concurrent processes:
+
+* Entries are written to a temporary file in the cache directory and moved
+  into place with ``os.replace``, so readers never see a partial file.
+* Two processes writing the same entry write identical bytes; the last
+  rename wins, harmlessly.
+* Files that vanish under a reader (evicted by another process) or fail to
+  decode are treated as misses.
+
+Least recently used entries are evicted by modification time, which hits
+refresh, once the total size exceeds ``max_bytes``. Each cache object keeps
+a running total of the bytes it has written, so a put only scans the
+directory when that total crosses the limit; the scan then trims the cache
+to ``LOW_WATER`` of the limit, corrects the total for other processes'
+writes, and deletes temporary files left behind by crashed writers.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+from maze_logic.generators import get_generator
+from maze_logic.storage import FORMAT_VERSION, load_grid, save_maze
+
+_SUFFIX = ".maze"
+_TEMP_SUFFIX = ".tmp"
+
+LOW_WATER = 0.9 # Eviction trims to this fraction of max_bytes, so puts rarely rescan
+STALE_TEMP_SECONDS = 3600 # Temporary files older than this belong to crashed writers
+
+
+def _generator_parameters(generator):
+    """
+    Returns a generator instance's parameters as sorted (name, value) pairs.
+
+    Raises:
+        ValueError: If a parameter has no stable text form to hash.
+    """
+    parameters = sorted(vars(generator).items())
+    for name, value in parameters:
+        if not isinstance(value, (type(None), bool, int, float, str)):
+            raise ValueError(
+                f"cannot cache mazes of {type(generator).__name__}: parameter {name!r} is a "
+                f"{type(value).__name__}; expected one of ['None', 'bool', 'float', 'int', 'str']"
+            )
+    return parameters
+
+
+class MazeCache:
+    """
+    A directory of generated mazes keyed by a hash of their parameters.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            directory (str or PathLike): Cache directory, created if missing.
+            max_bytes (int): Total size above which least recently used entries are evicted.
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None # Size of the entries, from the last scan plus our puts since
+
+    @staticmethod
+    def key(num_rows, num_cols, random_seed, algorithm):
+        """
+        Returns the content address of a maze's parameters.
+
+        Args:
+            num_rows (int): The number of rows in the maze.
+            num_cols (int): The number of columns in the maze.
+            random_seed (int): Seed the maze is generated with.
+            algorithm (str or MazeGenerator): The generation engine.
+
+        Raises:
+            ValueError: If the algorithm is unknown, or an engine instance has
+                        parameters that cannot be hashed.
+        """
+        generator = get_generator(algorithm)
+        parameters = _generator_parameters(generator)
+        text = (f"{num_rows}:{num_cols}:{random_seed!r}:{generator.name}:{generator.version}:"
+                f"{parameters!r}:{FORMAT_VERSION}")
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + _SUFFIX)
+
+    def get(self, num_rows, num_cols, random_seed, algorithm):
+        """
+        Loads a cached maze.
+
+        Args:
+            num_rows (int): The number of rows in the maze.
+            num_cols (int): The number of columns in the maze.
+            random_seed (int): Seed the maze was generated with.
+            algorithm (str or MazeGenerator): The generation engine.
+
+        Returns:
+            Grid: The stored walls, or None on a miss.
+        """
+        path = self._path(self.key(num_rows, num_cols, random_seed, algorithm))
+        try:
+            grid, header = load_grid(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            # Unreadable or corrupt entry: drop it and regenerate
+            self._remove(path)
+            self.misses += 1
+            return None
+        if (header.num_rows, header.num_cols) != (num_rows, num_cols):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path) # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return grid
+
+    def put(self, grid, random_seed, algorithm):
+        """
+        Stores a maze atomically, then evicts old entries if the cache is over its size limit.
+
+        Args:
+            grid (Grid): The generated walls.
+            random_seed (int): Seed the maze was generated with.
+            algorithm (str or MazeGenerator): The generation engine.
+
+        Raises:
+            ValueError: If the algorithm cannot be keyed (see key()).
+        """
+        name = get_generator(algorithm).name
+        path = self._path(self.key(grid.num_rows, grid.num_cols, random_seed, algorithm))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=_TEMP_SUFFIX)
+        os.close(handle)
+        try:
+            save_maze(temp_path, grid, random_seed, name)
+            size = os.path.getsize(temp_path)
+            try:
+                size -= os.path.getsize(path) # Overwriting an entry, e.g. a corrupt one
+            except OSError:
+                pass
+            os.replace(temp_path, path)
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        if self._total_bytes is None or self._total_bytes + size > self.max_bytes:
+            self.evict()
+        else:
+            self._total_bytes += size
+
+    def evict(self):
+        """
+        Scans the cache and deletes least recently used entries until it fits in
+        ``LOW_WATER * max_bytes``, or is left untouched if it already fits in
+        ``max_bytes``. Temporary files older than ``STALE_TEMP_SECONDS`` are deleted too.
+
+        Returns:
+            int: How many entries were deleted.
+        """
+        entries = []
+        total = 0
+        stale_before = time.time() - STALE_TEMP_SECONDS
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                is_temp = name.endswith(_TEMP_SUFFIX)
+                if not (is_temp or name.endswith(_SUFFIX)):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue # Evicted or renamed by another process meanwhile
+                if is_temp:
+                    if stat.st_mtime < stale_before:
+                        self._remove(path) # Left behind by a writer that crashed
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * LOW_WATER:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+        self._total_bytes = total
+        return removed
+
+    def clear(self):
+        """Deletes every entry."""
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(_SUFFIX):
+                    self._remove(os.path.join(root, name))
+        self._total_bytes = None
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,210 @@
+"""
+Compact event logs of maze generation and solving.
+
+Generation and solving run at full speed and append one record per wall
+break, solver move and undone move to an ``EventLog``; later wall edits are
+logged too. Drawing happens afterwards: a player (see ``gui.player``)
+animates the log at any speed, seeks to any step and replays it as often as
+needed without recomputing.
+
+Each record packs ``(op, cell, direction)`` into one unsigned integer,
+``cell << 4 | op << 2 | direction``, where ``direction`` indexes
+``DIRECTIONS`` and names the wall of ``cell`` that the event crosses. A CARVE
+or BUILD whose wall lies on the outer border (see ``on_border``) edits that
+wall of ``cell`` alone, as no neighbor shares it. Records are 4 bytes each
+(8 for grids of 2**28 cells or more).
+
+Logs are saved next to their maze file (see ``events_path``):
+
+    magic      4 bytes   b"MZEV"
+    version    uint16
+    itemsize   uint16    bytes per record, 4 or 8
+    num_rows   uint32
+    num_cols   uint32
+    count      uint64    number of records
+    records    count little-endian unsigned integers
+"""
+from array import array
+import os
+import struct
+import sys
+
+from maze_logic.grid import LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+
+MAGIC = b"MZEV"
+FORMAT_VERSION = 1
+
+CARVE = 0 # A wall was broken between two cells
+MOVE = 1 # The solver stepped between two cells
+UNDO = 2 # The solver backtracked over a move
+BUILD = 3 # A wall was put back between two cells
+
+# Walls a record can cross, indexed by its direction field
+DIRECTIONS = (LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL)
+
+_HEADER = struct.Struct("<4sHHIIQ")
+# Grids with this many cells or more need 64-bit records
+_MAX_32BIT_CELLS = 2 ** 28
+
+
+def events_path(maze_path):
+    """
+    Returns the path of the event log stored next to a maze file.
+
+    Args:
+        maze_path (str or PathLike): The maze file.
+    """
+    return os.fspath(maze_path) + ".events"
+
+
+class EventLog:
+    """
+    An append-only log of wall changes and solver moves over a grid's flat cell indices.
+    """
+
+    def __init__(self, num_rows, num_cols, records=None):
+        """
+        Args:
+            num_rows (int): The number of rows in the maze.
+            num_cols (int): The number of columns in the maze.
+            records (array, optional): Packed records to adopt, e.g. read from a file.
+        """
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        typecode = "I" if num_rows * num_cols < _MAX_32BIT_CELLS else "Q"
+        self.records = records if records is not None else array(typecode)
+        # Flat index step across each direction's wall, and the reverse lookup.
+        # Vertical steps come last so they win when num_cols == 1.
+        self.deltas = (-1, 1, -num_cols, num_cols)
+        self._direction_of = {delta: direction for direction, delta in enumerate(self.deltas)}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, position):
+        """
+        Decodes one record.
+
+        Returns:
+            tuple: (op, cell, wall), where wall is the wall bit of cell that the event crosses.
+        """
+        record = self.records[position]
+        return (record >> 2) & 3, record >> 4, DIRECTIONS[record & 3]
+
+    def on_border(self, cell, direction):
+        """Returns True if the wall of ``cell`` named by ``direction`` lies on the outer border."""
+        num_cols = self.num_cols
+        if direction == 0:
+            return cell % num_cols == 0
+        if direction == 1:
+            return cell % num_cols == num_cols - 1
+        if direction == 2:
+            return cell < num_cols
+        return cell >= (self.num_rows - 1) * num_cols
+
+    def record(self, op, from_index, to_index):
+        """
+        Appends an event between two adjacent cells.
+
+        Args:
+            op (int): CARVE, MOVE, UNDO or BUILD.
+            from_index (int): Flat index of the cell the event starts from.
+            to_index (int): Flat index of the neighboring cell.
+
+        Raises:
+            ValueError: If the cells are not adjacent.
+        """
+        direction = self._direction_of.get(to_index - from_index)
+        if direction is None:
+            raise ValueError(f"Cells {from_index} and {to_index} are not adjacent")
+        self.records.append(from_index << 4 | op << 2 | direction)
+
+    def record_border(self, op, index, wall):
+        """
+        Appends a change to a wall on the outer border, which has no neighboring cell.
+
+        Args:
+            op (int): CARVE or BUILD.
+            index (int): Flat index of the cell.
+            wall (int): The wall bit, e.g. TOP_WALL for the entrance.
+
+        Raises:
+            ValueError: If the op is not a wall change or the wall is not on the border.
+        """
+        if op not in (CARVE, BUILD):
+            raise ValueError(f"unknown border op {op!r}; expected one of [{CARVE}, {BUILD}]")
+        direction = DIRECTIONS.index(wall) if wall in DIRECTIONS else None
+        if direction is None or not self.on_border(index, direction):
+            raise ValueError(f"Wall {wall} of cell {index} is not on the outer border")
+        self.records.append(index << 4 | op << 2 | direction)
+
+    def check_shape(self, num_rows, num_cols):
+        """
+        Checks that the log belongs to a maze of the given size.
+
+        Raises:
+            ValueError: If the dimensions differ.
+        """
+        if (self.num_rows, self.num_cols) != (num_rows, num_cols):
+            raise ValueError(
+                f"event log is for a {self.num_rows}x{self.num_cols} maze, "
+                f"not {num_rows}x{num_cols}"
+            )
+
+    def carve(self, index_a, index_b):
+        """Records a broken wall; usable directly as a generator's ``on_carve`` callback."""
+        self.record(CARVE, index_a, index_b)
+
+    def move(self, from_index, to_index, undo=False):
+        """Records a solver move; usable directly as ``solve_dfs``'s ``on_move`` callback."""
+        self.record(UNDO if undo else MOVE, from_index, to_index)
+
+    def save(self, path):
+        """
+        Writes the log to a file.
+
+        Args:
+            path (str or PathLike): Destination file, usually ``events_path(maze_path)``.
+        """
+        records = self.records
+        if sys.byteorder != "little":
+            records = array(records.typecode, records)
+            records.byteswap()
+        with open(path, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, records.itemsize,
+                                   self.num_rows, self.num_cols, len(records)))
+            records.tofile(out)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a log written by save().
+
+        Args:
+            path (str or PathLike): The log file.
+
+        Returns:
+            EventLog: The loaded log.
+
+        Raises:
+            ValueError: If the file is not a valid event log.
+        """
+        with open(path, "rb") as source:
+            header = source.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("Truncated event log header")
+            magic, version, itemsize, num_rows, num_cols, count = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("Not an event log file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported event log version {version}")
+            if itemsize not in (4, 8):
+                raise ValueError(f"Unsupported record size {itemsize}")
+            records = array("I" if itemsize == 4 else "Q")
+            try:
+                records.fromfile(source, count)
+            except EOFError:
+                raise ValueError("Truncated event log") from None
+        if sys.byteorder != "little":
+            records.byteswap()
+        return cls(num_rows, num_cols, records)
@@ -0,0 +1,264 @@
+"""
+Headless raster export to PNG and PPM, without Tk.
+
+Each cell becomes a ``cell_size`` x ``cell_size`` block of pixels whose first
+row and first column are its top and left walls; one extra pixel row and
+column close the bottom and right edges. Pixels are palette indices (see
+``PALETTE``): walls, background, the solution path, and a heatmap gradient for
+distance fields.
+
+Images are produced one pixel row at a time and streamed into the output
+file, so memory stays bounded by a single row whatever the maze size. Rows
+are assembled with whole-row byte operations (``bytes.translate``, slice
+assignment and big-integer masks) rather than per-pixel Python loops.
+"""
+import struct
+import zlib
+
+from maze_logic.grid import LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+from maze_logic.vectorized import np, require_numpy
+
+WALL = 0 # Palette index of walls
+BACKGROUND = 1 # Palette index of open cells
+PATH = 2 # Palette index of solution path cells
+HEAT_FIRST = 3 # First palette index of the heatmap gradient
+HEAT_LEVELS = 256 - HEAT_FIRST
+
+
+def _heat_color(level):
+    """Returns the RGB color of a heatmap level, blue (near) to red (far)."""
+    t = level / (HEAT_LEVELS - 1)
+    return int(255 * t), int(200 * (1 - abs(2 * t - 1))), int(255 * (1 - t))
+
+
+# 256 RGB entries: wall, background, path, then the heatmap gradient
+PALETTE = [(0, 0, 0), (255, 255, 255), (220, 30, 30)] + [
+    _heat_color(level) for level in range(HEAT_LEVELS)
+]
+
+# Wall byte -> 0x00 where the wall is present, 0xFF where it is open
+_OPEN_MASKS = {
+    wall: bytes(0x00 if value & wall else 0xFF for value in range(256))
+    for wall in (LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL)
+}
+
+
+def image_size(grid, cell_size=4):
+    """Returns the (width, height) in pixels of a grid exported at a cell size."""
+    return grid.num_cols * cell_size + 1, grid.num_rows * cell_size + 1
+
+
+def _row_walls(grid, row_idx):
+    """Returns the wall bytes of one cell row."""
+    base = row_idx * grid.num_cols
+    data = getattr(grid, "data", None)
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data[base:base + grid.num_cols])
+    walls_at = grid.walls_at
+    return bytes(walls_at(base + col_idx) for col_idx in range(grid.num_cols))
+
+
+def _masked(fill, walls, wall):
+    """Returns ``fill`` with every cell that has ``wall`` set to the WALL index."""
+    mask = walls.translate(_OPEN_MASKS[wall])
+    return (int.from_bytes(fill, "big") & int.from_bytes(mask, "big")).to_bytes(len(fill), "big")
+
+
+def iter_pixel_rows(grid, cell_size=4, path=None, distances=None):
+    """
+    Yields the image one pixel row at a time, as palette indices.
+
+    Args:
+        grid (Grid): The maze walls (any object implementing the grid protocol).
+        cell_size (int): Pixels per cell side, at least 2.
+        path (iterable, optional): Flat indices of the cells to paint as the solution path.
+        distances (sequence, optional): Per-cell distances (-1 for unreachable), painted
+                                        as a heatmap, e.g. from vectorized.distance_field().
+
+    Yields:
+        bytes: One row of palette indices, ``image_size(grid, cell_size)[0]`` long.
+    """
+    if cell_size < 2:
+        raise ValueError("cell_size must be at least 2")
+    num_rows, num_cols = grid.num_rows, grid.num_cols
+    width = num_cols * cell_size + 1
+
+    path_rows = {} # Row -> columns of the path cells in it
+    for index in path if path is not None else ():
+        row_idx, col_idx = divmod(index, num_cols)
+        path_rows.setdefault(row_idx, []).append(col_idx)
+
+    heat_scale = None
+    if distances is not None:
+        if np is not None:
+            distances = np.asarray(distances).reshape(-1)
+            farthest = int(distances.max())
+        else:
+            farthest = max(distances)
+        heat_scale = (HEAT_LEVELS - 1) / farthest if farthest > 0 else 0
+
+    def fill_row(row_idx):
+        """Palette index of every cell of a row before walls are applied."""
+        if heat_scale is None:
+            fill = bytearray([BACKGROUND]) * num_cols
+        else:
+            row = distances[row_idx * num_cols:(row_idx + 1) * num_cols]
+            if np is not None:
+                levels = np.where(row >= 0, HEAT_FIRST + (row * heat_scale).astype(np.int64), BACKGROUND)
+                fill = bytearray(levels.astype(np.uint8).tobytes())
+            else:
+                fill = bytearray(
+                    HEAT_FIRST + int(distance * heat_scale) if distance >= 0 else BACKGROUND
+                    for distance in row
+                )
+        for col_idx in path_rows.get(row_idx, ()):
+            fill[col_idx] = PATH
+        return bytes(fill)
+
+    def line_row(fill, walls, wall):
+        """A horizontal wall line: corner pixels, then the cells' wall or passage."""
+        row = bytearray(width) # Zero-filled, i.e. WALL
+        edge = _masked(fill, walls, wall)
+        for offset in range(1, cell_size):
+            row[offset:width - 1:cell_size] = edge
+        return bytes(row)
+
+    for row_idx in range(num_rows):
+        walls = _row_walls(grid, row_idx)
+        fill = fill_row(row_idx)
+        yield line_row(fill, walls, TOP_WALL)
+
+        inner = bytearray(width)
+        inner[0:width - 1:cell_size] = _masked(fill, walls, LEFT_WALL)
+        for offset in range(1, cell_size):
+            inner[offset:width - 1:cell_size] = fill
+        inner[-1] = fill[-1] if not walls[-1] & RIGHT_WALL else WALL
+        inner = bytes(inner)
+        for _ in range(cell_size - 1):
+            yield inner
+
+    yield line_row(fill, walls, BOTTOM_WALL)
+
+
+# Palette index -> character for text output
+_TEXT = bytes(
+    ord("#") if index == WALL else ord(".") if index == PATH else ord(" ") for index in range(256)
+)
+
+
+def iter_text_rows(grid, path=None):
+    """
+    Yields the maze as ASCII art, one line per pixel row at two characters per cell:
+    "#" for walls, "." for the solution path and spaces for open cells.
+
+    Args:
+        grid (Grid): The maze walls (any object implementing the grid protocol).
+        path (iterable, optional): Solution path cells to mark.
+
+    Yields:
+        str: One line of text, without a newline.
+    """
+    for row in iter_pixel_rows(grid, 2, path):
+        yield row.translate(_TEXT).decode("ascii")
+
+
+def _png_chunk(kind, payload):
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(
+        ">I", zlib.crc32(kind + payload) & 0xFFFFFFFF
+    )
+
+
+def write_png(out, width, height, rows, level=1):
+    """
+    Streams palette-index rows into an 8-bit indexed PNG.
+
+    Args:
+        out (file): Binary file to write to.
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+        rows (iterable): ``height`` rows of ``width`` palette indices.
+        level (int): zlib compression level. Compression dominates export time,
+                     and maze images already shrink well at level 1.
+    """
+    out.write(b"\x89PNG\r\n\x1a\n")
+    out.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)))
+    out.write(_png_chunk(b"PLTE", bytes(channel for color in PALETTE for channel in color)))
+    compressor = zlib.compressobj(level)
+    pending = []
+    pending_size = 0
+    for row in rows:
+        data = compressor.compress(b"\x00" + row) # Filter type 0 (none) per row
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+            if pending_size >= 1 << 16:
+                out.write(_png_chunk(b"IDAT", b"".join(pending)))
+                pending, pending_size = [], 0
+    pending.append(compressor.flush())
+    out.write(_png_chunk(b"IDAT", b"".join(pending)))
+    out.write(_png_chunk(b"IEND", b""))
+
+
+def write_ppm(out, width, height, rows):
+    """
+    Streams palette-index rows into a binary (P6) PPM.
+
+    Args:
+        out (file): Binary file to write to.
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+        rows (iterable): ``height`` rows of ``width`` palette indices.
+    """
+    channels = [bytes(color[channel] for color in PALETTE) for channel in range(3)]
+    out.write(f"P6 {width} {height} 255\n".encode())
+    rgb = bytearray(3 * width)
+    for row in rows:
+        for channel, table in enumerate(channels):
+            rgb[channel::3] = row.translate(table)
+        out.write(rgb)
+
+
+def export_image(grid, out, fmt=None, cell_size=4, path=None, distances=None, level=1):
+    """
+    Rasterizes a maze and writes it as PNG or PPM.
+
+    Args:
+        grid (Grid): The maze walls (any object implementing the grid protocol).
+        out (str, PathLike or file): Destination path or binary file.
+        fmt (str, optional): "png" or "ppm". Defaults to the path's extension, else "png".
+        cell_size (int): Pixels per cell side, at least 2.
+        path (iterable, optional): Solution path cells to highlight.
+        distances (sequence, optional): Per-cell distances to paint as a heatmap.
+        level (int): zlib compression level for PNG output.
+
+    Returns:
+        tuple: The (width, height) of the image.
+    """
+    if fmt is None:
+        name = str(out) if not hasattr(out, "write") else ""
+        fmt = "ppm" if name.lower().endswith(".ppm") else "png"
+    if fmt not in ("png", "ppm"):
+        raise ValueError(f"Unknown image format '{fmt}'. Available: png, ppm")
+
+    if not hasattr(out, "write"):
+        with open(out, "wb") as target:
+            return export_image(grid, target, fmt, cell_size, path, distances, level)
+
+    width, height = image_size(grid, cell_size)
+    rows = iter_pixel_rows(grid, cell_size, path, distances)
+    if fmt == "png":
+        write_png(out, width, height, rows, level)
+    else:
+        write_ppm(out, width, height, rows)
+    return width, height
+
+
+def render_array(grid, cell_size=4, path=None, distances=None):
+    """
+    Rasterizes a maze into a ``(height, width, 3)`` ``uint8`` RGB NumPy array.
+    Unlike export_image() this holds the whole image in memory.
+    """
+    require_numpy("render_array")
+    width, height = image_size(grid, cell_size)
+    indices = np.frombuffer(b"".join(iter_pixel_rows(grid, cell_size, path, distances)), dtype=np.uint8)
+    return np.array(PALETTE, dtype=np.uint8)[indices].reshape(height, width, 3)
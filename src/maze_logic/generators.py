@@ -0,0 +1,407 @@
+"""
+Maze generation engines.
+
+Every engine carves passages into a ``Grid`` (see ``maze_logic.grid``) using
+explicit stacks, queues and flat arrays instead of recursion, so generation
+time and memory grow linearly with the number of cells and never touch
+Python's recursion limit.
+"""
+from array import array
+
+from maze_logic.grid import VISITED, index_array, index_typecode
+
+
+class MazeGenerator:
+    """
+    Base class for maze generation algorithms.
+    Subclasses implement ``generate`` and register themselves in ``GENERATORS``.
+    """
+    name = None # Registry key used by Maze(algorithm=...)
+    version = 1 # Bump when the walls produced for a given seed change; invalidates disk caches
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        """
+        Carves a perfect maze into a grid whose cells start with all walls up.
+
+        Args:
+            grid (Grid): The grid to carve. Its visited flags are used as scratch space.
+            rng (random.Random): Source of randomness.
+            on_carve (callable, optional): Called as ``on_carve(index_a, index_b)``
+                                           after the wall between two cells is removed.
+            on_backtrack (callable, optional): Called as ``on_backtrack(index)`` when a
+                                               backtracking engine leaves a dead end.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _neighbors(grid, index):
+        """
+        Returns the flat indices of a cell's neighbors in right, left, down, up order.
+        """
+        num_cols = grid.num_cols
+        row_idx, col_idx = divmod(index, num_cols)
+        neighbors = []
+        if col_idx < num_cols - 1:
+            neighbors.append(index + 1)
+        if col_idx > 0:
+            neighbors.append(index - 1)
+        if row_idx < grid.num_rows - 1:
+            neighbors.append(index + num_cols)
+        if row_idx > 0:
+            neighbors.append(index - num_cols)
+        return neighbors
+
+
+class DepthFirstGenerator(MazeGenerator):
+    """
+    Randomized depth-first backtracker driven by an explicit stack.
+    Makes the same random choices as the original recursive version,
+    so a given seed still produces the same maze.
+    """
+    name = "dfs"
+
+    def __init__(self, start=0):
+        """
+        Args:
+            start (int): Flat index of the cell the backtracker starts from.
+        """
+        self.start = start
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        data = grid.data
+        neighbors_of = self._neighbors
+        stack = array(index_typecode(grid.size), [self.start])
+        grid.mark_visited(self.start)
+
+        while stack:
+            current = stack[-1]
+            unvisited_neighbors = [
+                neighbor for neighbor in neighbors_of(grid, current)
+                if not data[neighbor] & VISITED
+            ]
+            if not unvisited_neighbors:
+                stack.pop() # Dead end: backtrack
+                if on_backtrack:
+                    on_backtrack(current)
+                continue
+
+            next_cell = rng.choice(unvisited_neighbors)
+            grid.connect(current, next_cell)
+            if on_carve:
+                on_carve(current, next_cell)
+            grid.mark_visited(next_cell)
+            stack.append(next_cell)
+
+
+class KruskalGenerator(MazeGenerator):
+    """
+    Randomized Kruskal: removes walls in random order whenever the two cells
+    belong to different trees, tracked with a union-find forest.
+    """
+    name = "kruskal"
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        num_rows, num_cols = grid.num_rows, grid.num_cols
+        typecode = index_typecode(grid.size * 2)
+
+        # Edge id = cell * 2 for the wall to the right, cell * 2 + 1 for the wall below
+        edges = array(typecode)
+        for index in range(grid.size):
+            row_idx, col_idx = divmod(index, num_cols)
+            if col_idx < num_cols - 1:
+                edges.append(index * 2)
+            if row_idx < num_rows - 1:
+                edges.append(index * 2 + 1)
+        rng.shuffle(edges)
+
+        parent = array(typecode, range(grid.size))
+        rank = bytearray(grid.size)
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]] # Path halving
+                index = parent[index]
+            return index
+
+        for edge in edges:
+            cell = edge >> 1
+            neighbor = cell + num_cols if edge & 1 else cell + 1
+            root_a, root_b = find(cell), find(neighbor)
+            if root_a == root_b:
+                continue # Already connected; removing this wall would form a loop
+            if rank[root_a] < rank[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            if rank[root_a] == rank[root_b]:
+                rank[root_a] += 1
+            grid.connect(cell, neighbor)
+            if on_carve:
+                on_carve(cell, neighbor)
+
+
+class PrimGenerator(MazeGenerator):
+    """
+    Randomized Prim: grows the maze from a random cell by repeatedly attaching
+    a random frontier cell to a random neighbor already in the maze.
+    """
+    name = "prim"
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        data = grid.data
+        neighbors_of = self._neighbors
+        in_frontier = bytearray(grid.size)
+        frontier = array(index_typecode(grid.size))
+
+        def add_to_maze(index):
+            grid.mark_visited(index)
+            for neighbor in neighbors_of(grid, index):
+                if not data[neighbor] & VISITED and not in_frontier[neighbor]:
+                    in_frontier[neighbor] = 1
+                    frontier.append(neighbor)
+
+        add_to_maze(rng.randrange(grid.size))
+        while frontier:
+            # Swap a random frontier cell to the end and pop it in O(1)
+            pick = rng.randrange(len(frontier))
+            frontier[pick], frontier[-1] = frontier[-1], frontier[pick]
+            cell = frontier.pop()
+
+            in_maze = [n for n in neighbors_of(grid, cell) if data[n] & VISITED]
+            neighbor = rng.choice(in_maze)
+            grid.connect(neighbor, cell)
+            if on_carve:
+                on_carve(neighbor, cell)
+            add_to_maze(cell)
+
+
+class WilsonGenerator(MazeGenerator):
+    """
+    Wilson's algorithm: loop-erased random walks from every cell not yet in the
+    maze, producing a uniformly random spanning tree.
+    The last exit taken from each cell is kept in a flat index array, which erases loops implicitly.
+    """
+    name = "wilson"
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        data = grid.data
+        neighbors_of = self._neighbors
+        next_step = index_array(grid.size)
+
+        grid.mark_visited(rng.randrange(grid.size))
+        for start in range(grid.size):
+            if data[start] & VISITED:
+                continue # Already part of the maze
+
+            # Random walk until the maze is hit, remembering the last exit of each cell
+            current = start
+            while not data[current] & VISITED:
+                neighbor = rng.choice(neighbors_of(grid, current))
+                next_step[current] = neighbor
+                current = neighbor
+
+            # Retrace the loop-erased walk and carve it into the maze
+            current = start
+            while not data[current] & VISITED:
+                neighbor = next_step[current]
+                grid.connect(current, neighbor)
+                if on_carve:
+                    on_carve(current, neighbor)
+                grid.mark_visited(current)
+                current = neighbor
+
+
+class BinaryTreeGenerator(MazeGenerator):
+    """
+    Binary tree: every cell independently opens its wall to the cell above or
+    to its left. Cells in the top row can only go left, cells in the left
+    column can only go up. See ``maze_logic.vectorized`` for a NumPy version.
+    """
+    name = "binary_tree"
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        num_cols = grid.num_cols
+        for index in range(1, grid.size):
+            row_idx, col_idx = divmod(index, num_cols)
+            if row_idx == 0 or (col_idx > 0 and rng.random() < 0.5):
+                neighbor = index - 1 # Open to the left
+            else:
+                neighbor = index - num_cols # Open upward
+            grid.connect(index, neighbor)
+            if on_carve:
+                on_carve(index, neighbor)
+
+
+class SidewinderGenerator(MazeGenerator):
+    """
+    Sidewinder: the top row is one open corridor; every other row is split into
+    random horizontal runs, each opened upward from one random cell of the run.
+    See ``maze_logic.vectorized`` for a NumPy version.
+    """
+    name = "sidewinder"
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        num_rows, num_cols = grid.num_rows, grid.num_cols
+        carves = []
+        for col_idx in range(num_cols - 1):
+            carves.append((col_idx, col_idx + 1))
+
+        for row_idx in range(1, num_rows):
+            row_start = row_idx * num_cols
+            run_start = 0
+            for col_idx in range(num_cols):
+                index = row_start + col_idx
+                if col_idx < num_cols - 1 and rng.random() < 0.5:
+                    carves.append((index, index + 1)) # Extend the run eastward
+                    continue
+                # Close the run by opening one of its cells upward
+                chosen = row_start + run_start + rng.randrange(col_idx - run_start + 1)
+                carves.append((chosen, chosen - num_cols))
+                run_start = col_idx + 1
+
+        for index_a, index_b in carves:
+            grid.connect(index_a, index_b)
+            if on_carve:
+                on_carve(index_a, index_b)
+
+
+class EllerRows:
+    """
+    Row-at-a-time state for Eller's algorithm.
+    Only the set membership of the current row is kept, so memory is O(num_cols)
+    regardless of how many rows are produced.
+    """
+
+    def __init__(self, num_cols, rng, join_chance=0.5, carry_chance=0.5):
+        """
+        Args:
+            num_cols (int): Width of every row.
+            rng (random.Random): Source of randomness.
+            join_chance (float): Probability of joining two adjacent cells of different sets.
+            carry_chance (float): Probability of carrying a cell's set to the row below.
+        """
+        self.num_cols = num_cols
+        self._rng = rng
+        self._join_chance = join_chance
+        self._carry_chance = carry_chance
+        self._labels = [-1] * num_cols # Set id per column, -1 for "not yet in a set"
+
+    def next_row(self, is_last=False):
+        """
+        Decides the passages of the next row.
+
+        Args:
+            is_last (bool): True for the final row, which joins every remaining set.
+
+        Returns:
+            tuple: (joined_right, carried_down), lists of the column indices whose
+                   right wall, respectively bottom wall, is removed.
+        """
+        rng = self._rng
+        num_cols = self.num_cols
+        labels = self._labels
+
+        # Give every column that was not carried down from above a fresh set
+        next_label = max(labels) + 1
+        for col_idx in range(num_cols):
+            if labels[col_idx] < 0:
+                labels[col_idx] = next_label
+                next_label += 1
+
+        parent = list(range(next_label))
+
+        def find(label):
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        # Join adjacent cells of different sets
+        joined_right = []
+        for col_idx in range(num_cols - 1):
+            root_a, root_b = find(labels[col_idx]), find(labels[col_idx + 1])
+            if root_a != root_b and (is_last or rng.random() < self._join_chance):
+                parent[root_b] = root_a
+                joined_right.append(col_idx)
+
+        if is_last:
+            return joined_right, []
+
+        # Carry every set down at least once, in order of first appearance
+        members = {}
+        for col_idx in range(num_cols):
+            members.setdefault(find(labels[col_idx]), []).append(col_idx)
+
+        carried_down = []
+        new_labels = [-1] * num_cols
+        for compact_label, columns in enumerate(members.values()):
+            carried = [col_idx for col_idx in columns if rng.random() < self._carry_chance]
+            if not carried:
+                carried = [rng.choice(columns)]
+            for col_idx in carried:
+                new_labels[col_idx] = compact_label
+            carried_down.extend(carried)
+        carried_down.sort()
+
+        self._labels = new_labels
+        return joined_right, carried_down
+
+
+class EllerGenerator(MazeGenerator):
+    """
+    Eller's algorithm: builds the maze one row at a time, keeping only the
+    current row's set state.
+    """
+    name = "eller"
+
+    def generate(self, grid, rng, on_carve=None, on_backtrack=None):
+        num_rows, num_cols = grid.num_rows, grid.num_cols
+        rows = EllerRows(num_cols, rng)
+        for row_idx in range(num_rows):
+            row_start = row_idx * num_cols
+            joined_right, carried_down = rows.next_row(is_last=row_idx == num_rows - 1)
+            for col_idx in joined_right:
+                grid.connect(row_start + col_idx, row_start + col_idx + 1)
+                if on_carve:
+                    on_carve(row_start + col_idx, row_start + col_idx + 1)
+            for col_idx in carried_down:
+                grid.connect(row_start + col_idx, row_start + col_idx + num_cols)
+                if on_carve:
+                    on_carve(row_start + col_idx, row_start + col_idx + num_cols)
+
+
+# Registry of generation engines by name
+GENERATORS = {
+    generator.name: generator
+    for generator in (
+        DepthFirstGenerator,
+        KruskalGenerator,
+        PrimGenerator,
+        WilsonGenerator,
+        EllerGenerator,
+        BinaryTreeGenerator,
+        SidewinderGenerator,
+    )
+}
+
+
+def get_generator(algorithm):
+    """
+    Looks up a generation engine by name.
+
+    Args:
+        algorithm (str or MazeGenerator): A registered name such as "dfs", or an engine instance.
+
+    Returns:
+        MazeGenerator: The generation engine.
+
+    Raises:
+        ValueError: If the algorithm name is not registered.
+    """
+    if isinstance(algorithm, MazeGenerator):
+        return algorithm
+    try:
+        return GENERATORS[algorithm]()
+    except KeyError:
+        raise ValueError(
+            f"unknown maze algorithm {algorithm!r}; expected one of {sorted(GENERATORS)}"
+        ) from None
@@ -0,0 +1,58 @@
+"""
+Plain drawing primitives shared by the logic and GUI layers.
+
+They live here rather than in ``gui.window`` so that ``maze_logic`` never has to
+import tkinter; ``gui.window`` re-exports them for existing callers.
+"""
+
+
+class Point:
+    """
+    Represents a 2D coordinate point.
+    """
+    def __init__(self, x, y):
+        """
+        Initializes a Point object.
+
+        Args:
+            x (int): The X-coordinate.
+            y (int): The Y-coordinate.
+        """
+        self.x = x # X-coordinate of the point
+        self.y = y # Y-coordinate of the point
+
+
+class Line:
+    """
+    Represents a line segment defined by two Point objects.
+    """
+    def __init__(self, point_1, point_2):
+        """
+        Initializes a Line object.
+
+        Args:
+            point_1 (Point): The starting point of the line.
+            point_2 (Point): The ending point of the line.
+        """
+        self._x1 = point_1.x # X-coordinate of the first point
+        self._y1 = point_1.y # Y-coordinate of the first point
+        self._x2 = point_2.x # X-coordinate of the second point
+        self._y2 = point_2.y # Y-coordinate of the second point
+
+
+    def draw(self, canvas_instance, fill_color):
+        """
+        Draws the line on a given Tkinter Canvas.
+
+        Args:
+            canvas_instance (tkinter.Canvas): The Canvas object to draw on.
+            fill_color (str): The color to draw the line.
+
+        Returns:
+            int: The canvas item ID of the new line.
+        """
+        return canvas_instance.create_line(
+            self._x1, self._y1, self._x2, self._y2, # Coordinates for the line
+            fill=fill_color, # Line color
+            width=2          # Line thickness
+        )
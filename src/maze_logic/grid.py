@@ -0,0 +1,275 @@
+"""
+Compact storage for maze walls and visited state.
+
+Every cell is packed into a single byte of a flat ``bytearray``: the low
+four bits hold the left, right, top and bottom walls and bit 4 holds the
+``visited`` flag. A 10,000 x 10,000 maze therefore needs ~100 MB instead of
+one Python object (and its ``__dict__``) per cell.
+"""
+from array import array
+
+# Wall bits, one per side of a cell
+LEFT_WALL = 0x01
+RIGHT_WALL = 0x02
+TOP_WALL = 0x04
+BOTTOM_WALL = 0x08
+ALL_WALLS = LEFT_WALL | RIGHT_WALL | TOP_WALL | BOTTOM_WALL
+
+# Flag bits stored above the walls
+VISITED = 0x10
+
+# The wall on the neighbouring cell that mirrors each wall
+OPPOSITE_WALL = {
+    LEFT_WALL: RIGHT_WALL,
+    RIGHT_WALL: LEFT_WALL,
+    TOP_WALL: BOTTOM_WALL,
+    BOTTOM_WALL: TOP_WALL,
+}
+
+# (row delta, column delta) for stepping through each wall
+WALL_DELTAS = {
+    LEFT_WALL: (0, -1),
+    RIGHT_WALL: (0, 1),
+    TOP_WALL: (-1, 0),
+    BOTTOM_WALL: (1, 0),
+}
+
+# Largest cell count whose flat indices fit a 32-bit signed array slot
+_MAX_INT32_CELLS = 2 ** 31 - 1
+
+# Translation table that clears the visited bit of every byte at once
+_CLEAR_VISITED = bytes(b & ~VISITED for b in range(256))
+
+
+def index_typecode(size):
+    """
+    Returns the smallest ``array`` typecode able to hold flat indices of a grid.
+
+    Args:
+        size (int): Total number of cells in the grid.
+    """
+    return "i" if size <= _MAX_INT32_CELLS else "q"
+
+
+def index_array(size, fill=0):
+    """
+    Returns a flat integer array with one slot per cell, every slot set to ``fill``.
+
+    Args:
+        size (int): Total number of cells in the grid.
+        fill (int): Initial value of every slot.
+    """
+    return array(index_typecode(size), [fill]) * size
+
+
+class Grid:
+    """
+    A ``num_rows`` x ``num_cols`` grid of cells stored in a flat ``bytearray``.
+    Cells are addressed either by ``(row, col)`` or by their flat index
+    ``row * num_cols + col``.
+    """
+    __slots__ = ("num_rows", "num_cols", "data")
+
+    def __init__(self, num_rows, num_cols, data=None):
+        """
+        Initializes a Grid object.
+
+        Args:
+            num_rows (int): The number of rows in the grid.
+            num_cols (int): The number of columns in the grid.
+            data (bytes-like, optional): Packed cell bytes (row-major) to copy into the grid.
+                                         Defaults to every cell having all four walls.
+        """
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        if data is None:
+            self.data = bytearray([ALL_WALLS]) * (num_rows * num_cols)
+        else:
+            self.data = bytearray(data) # Any buffer, e.g. a 2-D uint8 NumPy array
+            if len(self.data) != num_rows * num_cols:
+                raise ValueError(
+                    f"expected {num_rows * num_cols} cell bytes, got {len(self.data)}"
+                )
+
+    @property
+    def size(self):
+        """Returns the total number of cells in the grid."""
+        return self.num_rows * self.num_cols
+
+    def index(self, row_idx, col_idx):
+        """Returns the flat index of the cell at (row_idx, col_idx)."""
+        return row_idx * self.num_cols + col_idx
+
+    def coords(self, index):
+        """Returns the (row, col) coordinates of a flat cell index."""
+        return divmod(index, self.num_cols)
+
+    def walls_at(self, index):
+        """Returns the 4-bit wall mask of the cell at a flat index."""
+        return self.data[index] & ALL_WALLS
+
+    def walls(self, row_idx, col_idx):
+        """
+        Returns the walls of a cell as booleans.
+
+        Returns:
+            tuple: (has_left_wall, has_right_wall, has_top_wall, has_bottom_wall)
+        """
+        mask = self.data[row_idx * self.num_cols + col_idx]
+        return (
+            bool(mask & LEFT_WALL),
+            bool(mask & RIGHT_WALL),
+            bool(mask & TOP_WALL),
+            bool(mask & BOTTOM_WALL),
+        )
+
+    def has_wall(self, row_idx, col_idx, wall):
+        """Returns True if the given wall bit is set on the cell."""
+        return bool(self.data[row_idx * self.num_cols + col_idx] & wall)
+
+    def set_wall(self, row_idx, col_idx, wall, present=True):
+        """
+        Sets or clears a single wall bit on one cell only.
+        The mirroring wall of the neighbouring cell is left untouched.
+        """
+        index = row_idx * self.num_cols + col_idx
+        if present:
+            self.data[index] |= wall
+        else:
+            self.data[index] &= ~wall
+
+    def connect(self, index_a, index_b):
+        """
+        Removes the wall shared by two adjacent cells, on both sides.
+
+        Args:
+            index_a (int): Flat index of the first cell.
+            index_b (int): Flat index of the second cell, adjacent to the first.
+        """
+        data = self.data
+        # Vertical neighbors are checked first so single-column grids work too
+        if index_b == index_a + self.num_cols:
+            data[index_a] &= ~BOTTOM_WALL
+            data[index_b] &= ~TOP_WALL
+        elif index_b == index_a - self.num_cols:
+            data[index_a] &= ~TOP_WALL
+            data[index_b] &= ~BOTTOM_WALL
+        elif index_b == index_a + 1:
+            data[index_a] &= ~RIGHT_WALL
+            data[index_b] &= ~LEFT_WALL
+        else:
+            data[index_a] &= ~LEFT_WALL
+            data[index_b] &= ~RIGHT_WALL
+
+    def disconnect(self, index_a, index_b):
+        """
+        Restores the wall shared by two adjacent cells, on both sides.
+
+        Args:
+            index_a (int): Flat index of the first cell.
+            index_b (int): Flat index of the second cell, adjacent to the first.
+        """
+        data = self.data
+        if index_b == index_a + self.num_cols:
+            data[index_a] |= BOTTOM_WALL
+            data[index_b] |= TOP_WALL
+        elif index_b == index_a - self.num_cols:
+            data[index_a] |= TOP_WALL
+            data[index_b] |= BOTTOM_WALL
+        elif index_b == index_a + 1:
+            data[index_a] |= RIGHT_WALL
+            data[index_b] |= LEFT_WALL
+        else:
+            data[index_a] |= LEFT_WALL
+            data[index_b] |= RIGHT_WALL
+
+    def is_visited(self, index):
+        """Returns True if the cell at a flat index is marked visited."""
+        return bool(self.data[index] & VISITED)
+
+    def mark_visited(self, index, visited=True):
+        """Sets or clears the visited flag of the cell at a flat index."""
+        if visited:
+            self.data[index] |= VISITED
+        else:
+            self.data[index] &= ~VISITED
+
+    def reset_visited(self):
+        """Clears the visited flag of every cell in a single pass."""
+        self.data[:] = self.data.translate(_CLEAR_VISITED)
+
+    def __len__(self):
+        """Returns the number of rows, mirroring a list of rows."""
+        return self.num_rows
+
+    def __getitem__(self, row_idx):
+        """Returns a lightweight view of one row of the grid."""
+        if not 0 <= row_idx < self.num_rows:
+            raise IndexError("grid row index out of range")
+        return GridRow(self, row_idx)
+
+
+class GridRow:
+    """
+    A view of a single grid row, indexable by column like a list of cells.
+    """
+    __slots__ = ("_grid", "_row_idx")
+
+    def __init__(self, grid, row_idx):
+        self._grid = grid
+        self._row_idx = row_idx
+
+    def __len__(self):
+        return self._grid.num_cols
+
+    def __getitem__(self, col_idx):
+        if not 0 <= col_idx < self._grid.num_cols:
+            raise IndexError("grid column index out of range")
+        return GridCell(self._grid, self._row_idx * self._grid.num_cols + col_idx)
+
+    def __iter__(self):
+        for col_idx in range(self._grid.num_cols):
+            yield self[col_idx]
+
+
+class GridCell:
+    """
+    A Cell-like view over one byte of a Grid.
+    Exposes the same ``has_*_wall`` and ``visited`` attributes as ``Cell``
+    without allocating any per-cell state.
+    """
+    __slots__ = ("_grid", "_index")
+
+    def __init__(self, grid, index):
+        self._grid = grid
+        self._index = index
+
+    def _get(self, bit):
+        return bool(self._grid.data[self._index] & bit)
+
+    def _set(self, bit, value):
+        if value:
+            self._grid.data[self._index] |= bit
+        else:
+            self._grid.data[self._index] &= ~bit
+
+    has_left_wall = property(
+        lambda self: self._get(LEFT_WALL),
+        lambda self, value: self._set(LEFT_WALL, value),
+    )
+    has_right_wall = property(
+        lambda self: self._get(RIGHT_WALL),
+        lambda self, value: self._set(RIGHT_WALL, value),
+    )
+    has_top_wall = property(
+        lambda self: self._get(TOP_WALL),
+        lambda self, value: self._set(TOP_WALL, value),
+    )
+    has_bottom_wall = property(
+        lambda self: self._get(BOTTOM_WALL),
+        lambda self, value: self._set(BOTTOM_WALL, value),
+    )
+    visited = property(
+        lambda self: self._get(VISITED),
+        lambda self, value: self._set(VISITED, value),
+    )
@@ -0,0 +1,339 @@
+"""
+Hierarchical tiled pathfinding (HPA*-style) for very large grids.
+
+``TileGraph`` partitions a grid into square tiles. Every open passage that
+crosses a tile border contributes its two cells as *entrances*. Inside each
+tile, dead ends are pruned and the corridors between the remaining entrances
+and junctions are collapsed into weighted edges, which keeps the distances
+between entrances exact. Tiles are independent, so that step runs across a
+process pool, each worker receiving only its tile's wall bytes.
+
+A query connects the start and goal to the entrances of their own tiles,
+runs A* over the small abstract graph, then refines each visit to a tile
+into cells with a search confined to that tile. Because every border
+crossing is its own entrance (none are merged, unlike classic HPA*), the
+abstract distances are exact and the refined path is a shortest path.
+
+Building the graph is the expensive part; keep the ``TileGraph`` and reuse it
+for any number of queries while the walls stay the same.
+"""
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+
+from maze_logic.grid import Grid, RIGHT_WALL, BOTTOM_WALL, index_array, index_typecode
+from maze_logic.solvers import _open_neighbors, solve_bfs
+
+
+def _distances_from(grid, source):
+    """Breadth-first distances from one cell of a grid; -1 marks unreachable cells."""
+    neighbors = _open_neighbors(grid)
+    distance = index_array(grid.size, -1)
+    distance[source] = 0
+    frontier = [source]
+    while frontier:
+        next_frontier = []
+        for current in frontier:
+            step = distance[current] + 1
+            for next_cell in neighbors(current):
+                if distance[next_cell] < 0:
+                    distance[next_cell] = step
+                    next_frontier.append(next_cell)
+        frontier = next_frontier
+    return distance
+
+
+def _tile_edges(num_rows, num_cols, walls, entrances):
+    """
+    Worker task: reduces a tile to a small weighted graph over its entrances.
+    Module-level so it can be pickled to worker processes.
+
+    Dead ends that are not entrances can never lie on a shortest path between
+    entrances, so they are pruned repeatedly; the corridors left between the
+    remaining entrances and junctions become single weighted edges. Distances
+    between entrances are preserved exactly, in time linear in the tile size.
+
+    Args:
+        num_rows (int): Rows in the tile.
+        num_cols (int): Columns in the tile.
+        walls (bytes): The tile's wall bytes, row-major.
+        entrances (list): Local flat indices of the tile's entrance cells.
+
+    Returns:
+        list: (local_a, local_b, length) edges between kept cells, local_a < local_b.
+    """
+    grid = Grid(num_rows, num_cols, walls)
+    neighbors = _open_neighbors(grid)
+    size = grid.size
+    adjacent = [neighbors(index) for index in range(size)]
+    degree = bytearray(len(cells) for cells in adjacent)
+    is_entrance = bytearray(size)
+    for index in entrances:
+        is_entrance[index] = 1
+
+    # Prune dead ends that are not entrances
+    removed = bytearray(size)
+    stack = [index for index in range(size) if degree[index] <= 1 and not is_entrance[index]]
+    while stack:
+        index = stack.pop()
+        if removed[index]:
+            continue
+        removed[index] = 1
+        for next_cell in adjacent[index]:
+            if not removed[next_cell]:
+                degree[next_cell] -= 1
+                if degree[next_cell] <= 1 and not is_entrance[next_cell]:
+                    stack.append(next_cell)
+
+    # Kept cells: entrances and junctions; corridors between them become edges
+    edges = []
+    for index in range(size):
+        if removed[index] or (degree[index] == 2 and not is_entrance[index]):
+            continue
+        for next_cell in adjacent[index]:
+            if removed[next_cell]:
+                continue
+            previous, current, length = index, next_cell, 1
+            while degree[current] == 2 and not is_entrance[current]:
+                previous, current = current, next(
+                    cell for cell in adjacent[current] if cell != previous and not removed[cell]
+                )
+                length += 1
+            if index < current:
+                edges.append((index, current, length))
+    return edges
+
+
+class TileGraph:
+    """
+    A reusable abstract graph of tile entrances and junctions for fast shortest-path queries.
+    """
+
+    def __init__(self, grid, tile_size=64, max_workers=None):
+        """
+        Builds the abstract graph.
+
+        Args:
+            grid (Grid): The maze walls (any object implementing the grid protocol).
+            tile_size (int): Side length of a tile in cells.
+            max_workers (int, optional): Worker processes for the per-tile reductions.
+                                         Defaults to the CPU count; 1 runs in-process.
+        """
+        if tile_size < 1:
+            raise ValueError("tile_size must be at least 1")
+        self.grid = grid
+        self.tile_size = tile_size
+        self._tile_cols = -(-grid.num_cols // tile_size)
+        self._edges = defaultdict(list) # Node -> [(node, distance)]
+
+        entrances = defaultdict(set) # Tile -> global indices of its entrance cells
+        self._find_crossings(entrances)
+        self._entrances = {tile: sorted(cells) for tile, cells in entrances.items()}
+
+        tiles = [tile for tile, cells in self._entrances.items() if len(cells) > 1]
+        tasks = [self._tile_task(tile) for tile in tiles]
+        if max_workers == 1:
+            results = [_tile_edges(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(_tile_edges, *zip(*tasks), chunksize=16) if tasks else []
+        for tile, edges in zip(tiles, results):
+            to_global = self._to_global(tile)
+            for local_a, local_b, steps in edges:
+                index_a, index_b = to_global(local_a), to_global(local_b)
+                self._edges[index_a].append((index_b, steps))
+                self._edges[index_b].append((index_a, steps))
+
+    @property
+    def node_count(self):
+        """Returns the number of nodes (entrances and corridor junctions) in the abstract graph."""
+        return len(self._edges)
+
+    def _find_crossings(self, entrances):
+        """Records every open passage across a tile border as a pair of entrances."""
+        grid, tile_size = self.grid, self.tile_size
+        walls_at, num_rows, num_cols = grid.walls_at, grid.num_rows, grid.num_cols
+        # Vertical borders: right walls of each tile's last column
+        for col_idx in range(tile_size - 1, num_cols - 1, tile_size):
+            for row_idx in range(num_rows):
+                index = row_idx * num_cols + col_idx
+                if not walls_at(index) & RIGHT_WALL:
+                    self._add_crossing(entrances, index, index + 1)
+        # Horizontal borders: bottom walls of each tile's last row
+        for row_idx in range(tile_size - 1, num_rows - 1, tile_size):
+            for col_idx in range(num_cols):
+                index = row_idx * num_cols + col_idx
+                if not walls_at(index) & BOTTOM_WALL:
+                    self._add_crossing(entrances, index, index + num_cols)
+
+    def _add_crossing(self, entrances, index_a, index_b):
+        entrances[self.tile_of(index_a)].add(index_a)
+        entrances[self.tile_of(index_b)].add(index_b)
+        self._edges[index_a].append((index_b, 1))
+        self._edges[index_b].append((index_a, 1))
+
+    def tile_of(self, index):
+        """Returns the id of the tile containing a cell."""
+        row_idx, col_idx = divmod(index, self.grid.num_cols)
+        return (row_idx // self.tile_size) * self._tile_cols + col_idx // self.tile_size
+
+    def _tile_bounds(self, tile):
+        """Returns (first_row, first_col, rows, cols) of a tile."""
+        tile_row, tile_col = divmod(tile, self._tile_cols)
+        first_row, first_col = tile_row * self.tile_size, tile_col * self.tile_size
+        return (first_row, first_col,
+                min(self.tile_size, self.grid.num_rows - first_row),
+                min(self.tile_size, self.grid.num_cols - first_col))
+
+    def _tile_grid(self, tile):
+        """Returns a tile's walls as a standalone Grid, plus its (first_row, first_col)."""
+        first_row, first_col, rows, cols = self._tile_bounds(tile)
+        grid = self.grid
+        data = getattr(grid, "data", None)
+        if isinstance(data, (bytes, bytearray)):
+            starts = [(first_row + row_idx) * grid.num_cols + first_col for row_idx in range(rows)]
+            walls = b"".join(data[offset:offset + cols] for offset in starts)
+        else:
+            walls = bytes(
+                grid.walls_at((first_row + row_idx) * grid.num_cols + first_col + col_idx)
+                for row_idx in range(rows) for col_idx in range(cols)
+            )
+        return Grid(rows, cols, walls), first_row, first_col
+
+    def _to_global(self, tile):
+        """Returns a function mapping a tile's local flat indices to global ones."""
+        first_row, first_col, _, tile_cols = self._tile_bounds(tile)
+        num_cols = self.grid.num_cols
+
+        def to_global(index):
+            row_idx, col_idx = divmod(index, tile_cols)
+            return (first_row + row_idx) * num_cols + first_col + col_idx
+
+        return to_global
+
+    def _tile_task(self, tile):
+        """Arguments of _tile_edges for one tile."""
+        tile_grid, first_row, first_col = self._tile_grid(tile)
+        num_cols, tile_cols = self.grid.num_cols, tile_grid.num_cols
+        local = [
+            (index // num_cols - first_row) * tile_cols + index % num_cols - first_col
+            for index in self._entrances[tile]
+        ]
+        return tile_grid.num_rows, tile_cols, bytes(tile_grid.data), local
+
+    def _local_links(self, tile, index):
+        """Distances from a cell to every reachable cell of its tile, keyed by global index."""
+        tile_grid, first_row, first_col = self._tile_grid(tile)
+        num_cols, tile_cols = self.grid.num_cols, tile_grid.num_cols
+        row_idx, col_idx = divmod(index, num_cols)
+        distance = _distances_from(tile_grid, (row_idx - first_row) * tile_cols + col_idx - first_col)
+
+        def to_local(cell):
+            return (cell // num_cols - first_row) * tile_cols + cell % num_cols - first_col
+
+        return distance, to_local
+
+    def _abstract_path(self, start, goal):
+        """
+        A* over the abstract graph extended with the start and goal.
+
+        Returns:
+            tuple: (nodes, distance), or (None, -1) if the goal is unreachable.
+        """
+        num_cols = self.grid.num_cols
+        start_tile, goal_tile = self.tile_of(start), self.tile_of(goal)
+        extra = defaultdict(list) # Temporary edges for this query only
+
+        distance, to_local = self._local_links(start_tile, start)
+        for cell in self._entrances.get(start_tile, ()):
+            if distance[to_local(cell)] >= 0:
+                extra[start].append((cell, distance[to_local(cell)]))
+        if start_tile == goal_tile and distance[to_local(goal)] >= 0:
+            extra[start].append((goal, distance[to_local(goal)]))
+        distance, to_local = self._local_links(goal_tile, goal)
+        for cell in self._entrances.get(goal_tile, ()):
+            if distance[to_local(cell)] >= 0:
+                extra[cell].append((goal, distance[to_local(cell)]))
+
+        goal_row, goal_col = divmod(goal, num_cols)
+
+        def heuristic(index):
+            row_idx, col_idx = divmod(index, num_cols)
+            return abs(row_idx - goal_row) + abs(col_idx - goal_col)
+
+        edges = self._edges
+        cost = {start: 0}
+        parent = {start: start}
+        open_heap = [(heuristic(start), 0, start)]
+        while open_heap:
+            _, current_cost, current = heapq.heappop(open_heap)
+            if current_cost > cost[current]:
+                continue # Stale heap entry
+            if current == goal:
+                nodes = [goal]
+                while nodes[-1] != start:
+                    nodes.append(parent[nodes[-1]])
+                nodes.reverse()
+                return nodes, current_cost
+            for next_cell, steps in edges.get(current, []) + extra.get(current, []):
+                next_cost = current_cost + steps
+                if next_cost < cost.get(next_cell, next_cost + 1):
+                    cost[next_cell] = next_cost
+                    parent[next_cell] = current
+                    heapq.heappush(open_heap, (next_cost + heuristic(next_cell), next_cost, next_cell))
+        return None, -1
+
+    def path(self, start, goal):
+        """
+        Returns a shortest path between two cells.
+
+        Args:
+            start (int): Flat index of the start cell.
+            goal (int): Flat index of the goal cell.
+
+        Returns:
+            array: The path as flat cell indices, empty if the goal is unreachable.
+        """
+        path = array(index_typecode(self.grid.size))
+        if start == goal:
+            path.append(start)
+            return path
+        nodes, _ = self._abstract_path(start, goal)
+        if nodes is None:
+            return path
+
+        num_cols = self.grid.num_cols
+        path.append(start)
+        first = 0 # First node of the current run of nodes within one tile
+        for position in range(1, len(nodes) + 1):
+            tile = self.tile_of(nodes[first])
+            if position < len(nodes) and self.tile_of(nodes[position]) == tile:
+                continue
+            if position - 1 > first:
+                # Refine the whole visit to the tile with one search confined to it. The
+                # abstract path is a shortest path, so the in-tile search finds one as long.
+                tile_grid, first_row, first_col = self._tile_grid(tile)
+                tile_cols = tile_grid.num_cols
+                from_cell, to_cell = nodes[first], nodes[position - 1]
+                local = solve_bfs(
+                    tile_grid,
+                    (from_cell // num_cols - first_row) * tile_cols + from_cell % num_cols - first_col,
+                    (to_cell // num_cols - first_row) * tile_cols + to_cell % num_cols - first_col,
+                )
+                for index in local[1:]:
+                    row_idx, col_idx = divmod(index, tile_cols)
+                    path.append((first_row + row_idx) * num_cols + first_col + col_idx)
+            if position < len(nodes):
+                path.append(nodes[position]) # Border crossing: the cells are adjacent
+            first = position
+        return path
+
+    def distance(self, start, goal):
+        """
+        Returns the number of steps between two cells, or -1 if unreachable.
+        Only the abstract search runs; the path is not refined into cells.
+        """
+        if start == goal:
+            return 0
+        return self._abstract_path(start, goal)[1]
@@ -0,0 +1,181 @@
+"""
+Incrementally repaired distance fields.
+
+``DistanceField`` keeps the distance from every cell to the nearest of one
+or more target cells and repairs it after wall edits in the style of Lifelong Planning A* (LPA*):
+every cell has its current distance ``g`` and a one-step lookahead ``rhs``
+(one more than its best open neighbor). An edit only makes the two cells
+beside the wall inconsistent, and the repair loop processes inconsistent cells
+in distance order until the field settles again, so only the region whose
+distances actually changed is touched. Because the whole field is kept rather
+than one route, no heuristic is used; the shortest path from any cell is read
+off by walking downhill, so one field answers paths to or from any number
+of cells.
+"""
+from array import array
+import heapq
+import operator
+
+from maze_logic.grid import index_array, index_typecode
+from maze_logic.solvers import _open_neighbors
+
+
+class DistanceField:
+    """
+    Distances from every cell to the nearest target cell, kept up to date across wall edits.
+    """
+
+    def __init__(self, grid, target, on_visit=None):
+        """
+        Builds the field with one breadth-first pass.
+
+        Args:
+            grid (Grid): The maze walls. Edits must be reported through wall_changed().
+            target (int or iterable): Flat index of the cell distances are measured to,
+                                      or indices of several cells to measure to the nearest of.
+            on_visit (callable, optional): Called as ``on_visit(index)`` for every cell
+                                           the first pass expands.
+
+        Raises:
+            ValueError: If no target is given.
+        """
+        size = grid.size
+        try:
+            targets = [operator.index(target)]
+        except TypeError:
+            targets = sorted(set(target))
+        if not targets:
+            raise ValueError("at least one target cell is required")
+        self.grid = grid
+        self.targets = frozenset(targets)
+        self.target = targets[0] # The first target, for single-target fields
+        self._neighbors = _open_neighbors(grid)
+        self._unreachable = size # Larger than any real distance
+        self._distance = index_array(size, size)
+        self._lookahead = index_array(size, size)
+        self._queue = [] # (key, cell) heap; stale entries are skipped when popped
+        # Each cell's next step toward a target as found by the first pass, so paths
+        # are read off without searching neighbors; dropped by the first repair
+        self._downhill = index_array(size, size)
+
+        distance, lookahead, neighbors = self._distance, self._lookahead, self._neighbors
+        downhill = self._downhill
+        for cell in targets:
+            distance[cell] = lookahead[cell] = 0
+        frontier = targets
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                if on_visit:
+                    on_visit(current)
+                step = distance[current] + 1
+                for next_cell in neighbors(current):
+                    if distance[next_cell] == size:
+                        distance[next_cell] = lookahead[next_cell] = step
+                        downhill[next_cell] = current
+                        next_frontier.append(next_cell)
+            frontier = next_frontier
+
+    def distance(self, index):
+        """Returns the number of steps from a cell to the nearest target, or -1 if none is reachable."""
+        distance = self._distance[index]
+        return -1 if distance == self._unreachable else distance
+
+    def _update(self, index):
+        """Recomputes a cell's lookahead and queues it if it became inconsistent."""
+        if index not in self.targets:
+            distance = self._distance
+            best = self._unreachable
+            for next_cell in self._neighbors(index):
+                if distance[next_cell] < best:
+                    best = distance[next_cell]
+            self._lookahead[index] = min(best + 1, self._unreachable)
+        current, lookahead = self._distance[index], self._lookahead[index]
+        if current != lookahead:
+            heapq.heappush(self._queue, (min(current, lookahead), index))
+
+    def wall_changed(self, index_a, index_b):
+        """
+        Repairs the field after the wall between two adjacent cells was opened or closed.
+
+        Args:
+            index_a (int): Flat index of the first cell.
+            index_b (int): Flat index of the second cell.
+
+        Returns:
+            int: How many cells the repair processed.
+        """
+        self._downhill = None # May now cross the changed wall
+        self._update(index_a)
+        self._update(index_b)
+        return self._repair()
+
+    def _repair(self):
+        """Settles every inconsistent cell, nearest first."""
+        distance, lookahead = self._distance, self._lookahead
+        neighbors, update = self._neighbors, self._update
+        unreachable = self._unreachable
+        queue = self._queue
+        processed = 0
+        while queue:
+            key, index = heapq.heappop(queue)
+            current = distance[index]
+            if current == lookahead[index] or key != min(current, lookahead[index]):
+                continue # Stale entry
+            processed += 1
+            if current > lookahead[index]:
+                # Over-consistent: a shorter route appeared, settle it
+                distance[index] = lookahead[index]
+            else:
+                # Under-consistent: the old route is gone, re-derive it from the neighbors
+                distance[index] = unreachable
+                update(index)
+            for next_cell in neighbors(index):
+                update(next_cell)
+        return processed
+
+    def path_from(self, start):
+        """
+        Returns a shortest path from a cell to its nearest target by walking downhill.
+
+        Args:
+            start (int): Flat index of the start cell.
+
+        Returns:
+            array: The path as flat cell indices, empty if no target is reachable.
+        """
+        distance, neighbors = self._distance, self._neighbors
+        path = array(index_typecode(self.grid.size))
+        if distance[start] == self._unreachable:
+            return path
+        path.append(start)
+        current = start
+        downhill = self._downhill
+        if downhill is not None:
+            while distance[current]:
+                current = downhill[current]
+                path.append(current)
+            return path
+        while distance[current]:
+            # Neighbors are tried in the solvers' order so ties break the same way
+            step = distance[current] - 1
+            current = next(cell for cell in neighbors(current) if distance[cell] == step)
+            path.append(current)
+        return path
+
+    def path_to(self, goal):
+        """
+        Returns a shortest path from the nearest target to a cell, e.g. from a
+        start cell used as the only target to each of many goals.
+
+        Returns:
+            array: The path as flat cell indices, empty if no target is reachable.
+        """
+        path = self.path_from(goal)
+        path.reverse()
+        return path
+
+    def nearest_target(self, index):
+        """Returns the target closest to a cell, or -1 if none is reachable."""
+        path = self.path_from(index)
+        return path[-1] if path else -1
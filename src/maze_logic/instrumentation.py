@@ -0,0 +1,146 @@
+"""
+Opt-in instrumentation for Maze.
+
+Pass an ``Instrumentation`` to ``Maze(..., instrumentation=...)`` to collect
+per-phase timings and hot-path counters, notify observers as phases finish,
+and optionally dump a cProfile profile per run. Without one, the maze only
+pays for a few ``is None`` checks outside its inner loops.
+"""
+from contextlib import contextmanager
+import itertools
+import os
+import time
+
+
+class MazeStats:
+    """
+    Timings and counters collected for one maze.
+    """
+
+    def __init__(self):
+        self.phase_seconds = {} # Phase name -> accumulated wall time in seconds
+        self.cells_visited = 0 # Cells reached by generation or expanded by a solver
+        self.backtracks = 0 # Dead ends the DFS generator or DFS solver backed out of
+        self.walls_broken = 0 # Walls removed during generation
+        self.draw_calls = 0 # Drawing steps issued to the renderer
+        self.redraws = 0 # Animation frames played by the window
+
+    def to_dict(self):
+        """Returns the stats as plain data, e.g. for JSON logging."""
+        return {
+            "phase_seconds": dict(self.phase_seconds),
+            "cells_visited": self.cells_visited,
+            "backtracks": self.backtracks,
+            "walls_broken": self.walls_broken,
+            "draw_calls": self.draw_calls,
+            "redraws": self.redraws,
+        }
+
+    def __repr__(self):
+        return f"MazeStats({self.to_dict()!r})"
+
+
+class MazeObserver:
+    """
+    Callback interface for instrumentation events. Override what you need.
+    """
+
+    def on_phase(self, maze, phase, seconds):
+        """Called when a phase such as "break_walls" or "solve" finishes."""
+
+    def on_run_complete(self, maze, run, stats):
+        """Called when a run ("generate" or "solve") finishes, with the maze's stats so far."""
+
+
+class Instrumentation:
+    """
+    Collects MazeStats for a maze and fans events out to observers.
+    """
+    _run_ids = itertools.count(1)
+
+    def __init__(self, observers=(), profile_dir=None):
+        """
+        Args:
+            observers (iterable): MazeObserver instances to notify.
+            profile_dir (str, optional): If set, every run is profiled with cProfile
+                                         and dumped to ``<profile_dir>/maze-<n>-<run>.prof``.
+        """
+        self.stats = MazeStats()
+        self.observers = list(observers)
+        self.profile_dir = profile_dir
+
+    @contextmanager
+    def phase(self, maze, name):
+        """Times a phase, adds it to the stats and notifies observers."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stats.phase_seconds[name] = self.stats.phase_seconds.get(name, 0.0) + seconds
+            for observer in self.observers:
+                observer.on_phase(maze, name, seconds)
+
+    @contextmanager
+    def run(self, maze, name):
+        """
+        Wraps a whole run, profiling it if a profile directory is configured.
+        """
+        profiler = None
+        if self.profile_dir is not None:
+            import cProfile # Only profiled runs pay for the import
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(
+                    self.profile_dir, f"maze-{next(self._run_ids)}-{name}.prof"
+                ))
+            for observer in self.observers:
+                observer.on_run_complete(maze, name, self.stats)
+
+    def count_carve(self, index_a, index_b):
+        """Generation hook: one wall removed, one more cell reached."""
+        self.stats.walls_broken += 1
+        self.stats.cells_visited += 1
+
+    def count_backtrack(self, *cells):
+        """Generation hook: the DFS backed out of a dead end."""
+        self.stats.backtracks += 1
+
+    def count_move(self, from_index, to_index, undo):
+        """DFS solver hook: a forward step visits a cell, an undo is a backtrack."""
+        if undo:
+            self.stats.backtracks += 1
+        else:
+            self.stats.cells_visited += 1
+
+    def count_visit(self, index):
+        """Shortest-path solver hook: one cell expanded."""
+        self.stats.cells_visited += 1
+
+    def count_draws(self, count):
+        """Event player hook: ``count`` cells and moves sent to the renderer."""
+        self.stats.draw_calls += count
+
+
+def chain(*callbacks):
+    """
+    Combines optional callbacks into one, or returns None if all are None,
+    so uninstrumented paths keep passing None and skip the call entirely.
+    """
+    callbacks = [callback for callback in callbacks if callback is not None]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def combined(*args):
+        for callback in callbacks:
+            callback(*args)
+
+    return combined
@@ -1,20 +1,29 @@
-from maze_logic.cell import Cell
-from gui.window import Point
-import time
+from maze_logic.generators import get_generator
+from maze_logic.solvers import get_solver
+from maze_logic.grid import Grid, TOP_WALL, BOTTOM_WALL, WALL_DELTAS
+from maze_logic.instrumentation import chain
+from maze_logic.events import EventLog, events_path, CARVE, BUILD
+from collections import OrderedDict
+from contextlib import nullcontext
+import operator
+import os
 import random
-from tkinter import Button
+
+# How many search fields (one per set of source cells) a maze keeps cached
+_SEARCH_FIELD_CACHE_SIZE = 4
 
 class Maze:
     """
-    Represents a maze grid, handling its creation, wall breaking,
-    and solving using a recursive backtracking algorithm.
+    Represents a maze grid, handling its creation, wall breaking through a
+    pluggable generation engine, and solving it with iterative search strategies.
     """
     def __init__(
             self, x_start, y_start,
             num_rows, num_cols,
             cell_width, cell_height,
             window_instance=None, is_test_mode=False,
-            random_seed=None
+            random_seed=None, algorithm="dfs", walls=None,
+            instrumentation=None, cache=None, record_events=False, events=None
     ):
         """
         Initializes a Maze object.
@@ -29,6 +38,28 @@ class Maze:
             window_instance (Window, optional): The window object to draw the maze on. Defaults to None.
             is_test_mode (bool): If True, disables drawing animations for faster testing. Defaults to False.
             random_seed (int, optional): Seed for the random number generator for reproducible maze generation.
+            algorithm (str or MazeGenerator): Generation engine, one of "dfs", "kruskal",
+                                              "prim", "wilson", "eller", "binary_tree" or
+                                              "sidewinder". Defaults to "dfs".
+            walls (bytes-like or Grid, optional): Packed wall bytes of a prebuilt maze,
+                                                  row-major, e.g. an array from
+                                                  maze_logic.vectorized, or a ready Grid /
+                                                  PackedGrid to adopt as is.
+                                                  When given, generation is skipped.
+            instrumentation (Instrumentation, optional): Collects phase timings and
+                                                         counters (see maze_logic.instrumentation).
+                                                         Disabled by default.
+            cache (MazeCache, optional): Disk cache (see maze_logic.disk_cache) checked
+                                         before generating and filled after; only used
+                                         when random_seed is set and walls is not given.
+            record_events (bool): If True, carves and solver moves are logged to an
+                                  EventLog (see maze_logic.events). Always on when
+                                  animating in a window, as the animation plays the log.
+            events (EventLog, optional): An existing log to continue, e.g. one saved
+                                         next to a prebuilt maze, for replaying it.
+
+        Raises:
+            ValueError: If ``events`` was logged for a maze of another size.
         """
         # Store maze dimensions and drawing parameters
         self._x_start = x_start
@@ -41,28 +72,402 @@ class Maze:
         # Store window instance and test mode flag
         self.__window = window_instance # Private: Direct interaction with the drawing window
         self._is_test_mode = is_test_mode # Protected: Controls animation/drawing for testing
+        self._generator = get_generator(algorithm) # Fails fast on unknown algorithm names
+        self._instrumentation = instrumentation # None keeps every hook switched off
+
+        # Per-maze random number generator; seeding it never touches the global
+        # random module, so concurrent mazes cannot disturb each other's sequence
+        self._rng = random.Random(random_seed)
+        self._random_seed = random_seed # Recorded in saved maze files
+
+        # Maze cell grid, packed one byte per cell (see maze_logic.grid)
+        self._cells = None
+        self._tree_index = None # Built on first use by tree_index()
+        self._tile_graph = None # Built on first use by tile_graph()
+        self._walls_version = 0 # Bumped by every wall edit after generation
+        self._distance_field = None # Distances to the exit, repaired on wall edits
+        self._solution = None # Entrance-to-exit path for the current walls
+        self._search_fields = OrderedDict() # Source cells -> DistanceField, cleared on wall edits
+
+        # Compact log of carves and solver moves; animations play it back afterwards
+        animated = self.__window is not None and not is_test_mode
+        self._events = events
+        if events is not None:
+            events.check_shape(num_rows, num_cols)
+        if self._events is None and (record_events or animated):
+            self._events = EventLog(num_rows, num_cols)
+        self._player = None # Plays the event log in the window, created after generation
 
-        # Set random seed if provided for reproducible maze generation
-        if random_seed is not None:
-            random.seed(random_seed)
-            
-        # Maze cell grid
-        self._cells = [] 
-
-        # Maze generation steps
-        self._create_cells()
-        self._break_entrance_and_exit()
-        self._break_walls_recursive(0, 0)
-        self._reset_cells_visited() # Reset visited status for maze solving
+        # Canvas renderer that reuses one item per wall segment and per move
+        self._renderer = None
+        if self.__window is not None:
+            # GUI modules load only when a window is used, keeping headless imports Tk-free
+            from gui.renderer import MazeRenderer
+            self._renderer = MazeRenderer(
+                self.__window, x_start, y_start, cell_width, cell_height, num_rows, num_cols
+            )
+
+        use_cache = cache is not None and walls is None and random_seed is not None
+        if use_cache:
+            walls = cache.get(num_rows, num_cols, random_seed, self._generator)
+
+        with self._run("generate"):
+            if walls is not None:
+                # Prebuilt maze: adopt its walls instead of generating
+                with self._phase("load_cells"):
+                    self._load_cells(walls)
+            else:
+                # Maze generation steps
+                with self._phase("create_cells"):
+                    self._create_cells()
+                with self._phase("break_entrance_and_exit"):
+                    self._break_entrance_and_exit()
+                with self._phase("break_walls"):
+                    self._break_walls()
+                with self._phase("reset_cells_visited"):
+                    self._reset_cells_visited() # Reset visited status for maze solving
+                if use_cache:
+                    cache.put(self._cells, random_seed, self._generator)
+
+        if animated:
+            # A prebuilt maze is drawn finished, so its log starts played to the end
+            from gui.player import EventPlayer
+            animator = self.__window.animator
+            initial = None
+            if walls is not None and events is None:
+                # The fresh log starts at the prebuilt walls, not at an all-closed grid
+                initial = (self._cells if isinstance(self._cells, Grid) else self._cells.to_grid()).data
+            self._player = EventPlayer(
+                self._events, self._renderer, self.__window.root, animator.steps_per_frame,
+                animator.fps, len(self._events) if walls is not None else 0,
+                self._instrumentation.count_draws if self._instrumentation is not None else None,
+                initial,
+            )
+            self.__window.player = self._player
+            self._player.play()
         
         # Draw the solve button if a window is present
         if self.__window:
             self._draw_solve_button()
 
+    @property
+    def stats(self):
+        """
+        Returns the collected MazeStats, or None if instrumentation is disabled.
+        """
+        if self._instrumentation is None:
+            return None
+        stats = self._instrumentation.stats
+        if self.__window is not None:
+            # Frames of both the step animator and the event player
+            stats.redraws = self.__window.animator.frames
+            if self._player is not None:
+                stats.redraws += self._player.frames
+        return stats
+
+    def _phase(self, name):
+        """Returns a context manager timing a phase, or a no-op one if not instrumented."""
+        if self._instrumentation is None:
+            return nullcontext()
+        return self._instrumentation.phase(self, name)
+
+    def _run(self, name):
+        """Returns a context manager wrapping a whole run, or a no-op one if not instrumented."""
+        if self._instrumentation is None:
+            return nullcontext()
+        return self._instrumentation.run(self, name)
+
+    def tree_index(self):
+        """
+        Returns the maze's TreeIndex, building it on first use, for answering
+        many distance and path queries without running a solver each time.
+
+        Raises:
+            ValueError: If the maze is not perfect (e.g. prebuilt walls with loops).
+        """
+        from maze_logic.tree_index import TreeIndex
+
+        if self._tree_index is None:
+            self._tree_index = TreeIndex(self._cells)
+        return self._tree_index
+
+    def tile_graph(self, tile_size=64, max_workers=None):
+        """
+        Returns the maze's TileGraph, building it on first use (or when the tile
+        size changes), for fast shortest paths on large and braided mazes.
+
+        Args:
+            tile_size (int): Side length of a tile in cells.
+            max_workers (int, optional): Worker processes for the build. Defaults to
+                                         the CPU count; 1 builds in-process.
+        """
+        from maze_logic.hierarchical import TileGraph # Pulls in multiprocessing
+
+        if self._tile_graph is None or self._tile_graph.tile_size != tile_size:
+            self._tile_graph = TileGraph(self._cells, tile_size, max_workers)
+        return self._tile_graph
+
+    @property
+    def grid(self):
+        """Returns the maze's cell grid (a Grid, or a PackedGrid for lazily loaded mazes)."""
+        return self._cells
+
+    @property
+    def events(self):
+        """Returns the EventLog of carves and solver moves, or None if not recording."""
+        return self._events
+
+    @property
+    def player(self):
+        """Returns the EventPlayer animating the event log, or None without an animated window."""
+        return self._player
+
+    @property
+    def walls_version(self):
+        """Returns a counter that changes whenever open_wall() or close_wall() edits the maze."""
+        return self._walls_version
+
+    def open_wall(self, row_idx, col_idx, wall):
+        """
+        Removes a wall of a cell (and the mirroring wall of its neighbor), repairing
+        the distance field and solution incrementally.
+
+        Args:
+            row_idx (int): Row index of the cell.
+            col_idx (int): Column index of the cell.
+            wall (int): LEFT_WALL, RIGHT_WALL, TOP_WALL or BOTTOM_WALL.
+
+        Returns:
+            int: How many cells the distance field repair processed.
+        """
+        return self._edit_wall(row_idx, col_idx, wall, False)
+
+    def close_wall(self, row_idx, col_idx, wall):
+        """
+        Adds a wall to a cell (and the mirroring wall of its neighbor), repairing
+        the distance field and solution incrementally.
+
+        Args:
+            row_idx (int): Row index of the cell.
+            col_idx (int): Column index of the cell.
+            wall (int): LEFT_WALL, RIGHT_WALL, TOP_WALL or BOTTOM_WALL.
+
+        Returns:
+            int: How many cells the distance field repair processed.
+        """
+        return self._edit_wall(row_idx, col_idx, wall, True)
+
+    def _edit_wall(self, row_idx, col_idx, wall, present):
+        """Applies one wall edit and updates everything derived from the walls."""
+        from maze_logic.storage import PackedGrid
+
+        if isinstance(self._cells, PackedGrid):
+            # Memory-mapped mazes are read-only; edit an in-memory copy instead
+            self._cells = self._cells.to_grid()
+            self._distance_field = None
+        grid = self._cells
+        if bool(grid.has_wall(row_idx, col_idx, wall)) == present:
+            return 0
+
+        row_delta, col_delta = WALL_DELTAS[wall]
+        next_row, next_col = row_idx + row_delta, col_idx + col_delta
+        index = grid.index(row_idx, col_idx)
+        repaired = 0
+        if 0 <= next_row < self._num_rows and 0 <= next_col < self._num_cols:
+            next_index = grid.index(next_row, next_col)
+            if present:
+                grid.disconnect(index, next_index)
+            else:
+                grid.connect(index, next_index)
+            if self._distance_field is not None:
+                repaired = self._distance_field.wall_changed(index, next_index)
+            if self._events is not None:
+                self._events.record(BUILD if present else CARVE, index, next_index)
+            if self._player is not None:
+                self._player.play() # Drawn in order, after the events still playing
+            else:
+                self._draw_cell(row_idx, col_idx)
+                self._draw_cell(next_row, next_col)
+        else:
+            # Outer border: no neighbor, so no passage changes
+            grid.set_wall(row_idx, col_idx, wall, present)
+            if self._events is not None:
+                self._events.record_border(BUILD if present else CARVE, index, wall)
+            if self._player is not None:
+                self._player.play()
+            else:
+                self._draw_cell(row_idx, col_idx)
+
+        self._walls_version += 1
+        self._tree_index = None # The maze may no longer be perfect
+        self._tile_graph = None
+        self._solution = None
+        self._search_fields.clear()
+        return repaired
+
+    def distance_field(self):
+        """
+        Returns the distance field to the exit, building it on first use.
+        It is repaired in place by open_wall() and close_wall().
+        """
+        from maze_logic.incremental import DistanceField
+
+        if self._distance_field is None:
+            self._distance_field = DistanceField(
+                self._cells, self._cells.index(self._num_rows - 1, self._num_cols - 1)
+            )
+        return self._distance_field
+
+    def solution(self):
+        """
+        Returns a shortest entrance-to-exit path for the current walls, read off
+        the incrementally maintained distance field.
+
+        Returns:
+            array: The path as flat cell indices, empty if the exit is unreachable.
+        """
+        if self._solution is None:
+            self._solution = self.distance_field().path_from(0)
+        return self._solution
+
+    def search_field(self, sources=None):
+        """
+        Returns the distance field from a set of cells. The breadth-first pass
+        runs once per set of sources; the field is cached until the walls
+        change, so any number of paths can be read off it.
+
+        Args:
+            sources (iterable, optional): (row, col) cells to measure from, e.g. several
+                                          targets to find the nearest one from every
+                                          cell. Defaults to the entrance (0, 0).
+
+        Returns:
+            DistanceField: The field (see maze_logic.incremental).
+
+        Raises:
+            ValueError: If no source is given or a source lies outside the maze.
+        """
+        key = tuple(sorted({
+            self._cell_index(cell, "source") for cell in (sources if sources is not None else [(0, 0)])
+        }))
+        field = self._search_fields.get(key)
+        if field is not None:
+            self._search_fields.move_to_end(key)
+            return field
+
+        from maze_logic.incremental import DistanceField
+
+        instrumentation = self._instrumentation
+        with self._run("solve"), self._phase("search_field"):
+            field = DistanceField(
+                self._cells, key, instrumentation.count_visit if instrumentation is not None else None,
+            )
+        self._search_fields[key] = field
+        while len(self._search_fields) > _SEARCH_FIELD_CACHE_SIZE:
+            self._search_fields.popitem(last=False)
+        return field
+
+    def solve_many(self, goals, start=None):
+        """
+        Finds shortest paths from one start cell to many goals with a single
+        cached search (see search_field()).
+
+        Args:
+            goals (iterable): (row, col) of each goal cell.
+            start (tuple, optional): (row, col) of the start cell. Defaults to the entrance (0, 0).
+
+        Returns:
+            list: One path per goal, as arrays of flat cell indices; empty where unreachable.
+
+        Raises:
+            ValueError: If the start or a goal lies outside the maze.
+        """
+        goal_indices = [self._cell_index(goal, "goal") for goal in goals]
+        field = self.search_field([start if start is not None else (0, 0)])
+        return [field.path_to(goal) for goal in goal_indices]
+
+    def save(self, path):
+        """
+        Writes the maze to a compact binary file (2 bits per cell, see maze_logic.storage).
+
+        Args:
+            path (str or PathLike): Destination file.
+        """
+        from maze_logic.storage import PackedGrid, save_maze
+
+        grid = self._cells
+        if isinstance(grid, PackedGrid):
+            grid = grid.to_grid()
+        save_maze(path, grid, self._random_seed, self._generator.name)
+        if self._events is not None and len(self._events):
+            self._events.save(events_path(path))
+
+    @classmethod
+    def load(cls, path, x_start=0, y_start=0, cell_width=10, cell_height=10,
+             window_instance=None, is_test_mode=False, lazy=True):
+        """
+        Opens a maze written by save(), along with the event log saved next to it, if any.
+
+        Args:
+            path (str or PathLike): The maze file.
+            x_start (int): The starting X-coordinate (top-left) for drawing the maze.
+            y_start (int): The starting Y-coordinate (top-left) for drawing the maze.
+            cell_width (int): The width of each individual cell.
+            cell_height (int): The height of each individual cell.
+            window_instance (Window, optional): The window object to draw the maze on.
+            is_test_mode (bool): If True, disables drawing animations.
+            lazy (bool): If True, the file is memory-mapped and cells are decoded on
+                         demand; the maze is read-only and opens in O(1).
+                         If False, the walls are read into an editable Grid.
+
+        Returns:
+            Maze: The loaded maze. Lazily loaded mazes keep the file mapped until
+                  close() is called; use the maze as a context manager to close it.
+
+        Raises:
+            ValueError: If the file, or the event log next to it, is invalid.
+        """
+        from maze_logic.storage import PackedGrid, load_grid
+
+        if lazy:
+            grid = PackedGrid(path)
+            header = grid.header
+        else:
+            grid, header = load_grid(path)
+        events_file = events_path(path)
+        try:
+            events = EventLog.load(events_file) if os.path.exists(events_file) else None
+            return cls(
+                x_start, y_start, header.num_rows, header.num_cols, cell_width, cell_height,
+                window_instance, is_test_mode, random_seed=header.random_seed,
+                algorithm=header.algorithm or "dfs", walls=grid, events=events,
+            )
+        except BaseException:
+            if lazy:
+                grid.close() # Nothing else holds the mapping
+            raise
+
+    def close(self):
+        """
+        Releases the memory-mapped file of a lazily loaded maze. A no-op otherwise.
+        """
+        from maze_logic.storage import PackedGrid
+
+        if isinstance(self._cells, PackedGrid):
+            self._cells.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def _draw_solve_button(self):
         """
         Draws the "Solve Maze" button on the window.
         """
+        from tkinter import Button # Imported lazily; headless use never loads Tk
+
         # Calculate button position for centering
         button_width_estimate = 7 * 10 # Rough estimate based on character count
         button_x = (self.__window.width / 2) - (button_width_estimate / 2)
@@ -84,95 +489,127 @@ class Maze:
         """
         self.solve_maze() # Call the public solve method
 
-    def solve_maze(self):
-        """
-        Initiates the recursive maze solving process from the top-left cell (0,0).
+    def solve_maze(self, strategy="dfs", start=None, goal=None):
         """
-        return self._solve_maze_recursive(0, 0)
-    
-    def _solve_maze_recursive(self, row_idx, col_idx):
-        """
-        Recursively solves the maze using depth-first search.
+        Solves the maze and animates the search if a window is present.
 
         Args:
-            row_idx (int): Current row index of the cell.
-            col_idx (int): Current column index of the cell.
+            strategy (str): Solver to use: "dfs" (animated backtracking, any path),
+                            "bfs", "astar" or "bidirectional" (shortest path).
+            start (tuple, optional): (row, col) of the start cell. Defaults to the entrance (0, 0).
+            goal (tuple, optional): (row, col) of the goal cell. Defaults to the exit
+                                    in the bottom-right corner.
 
         Returns:
-            bool: True if a path to the exit is found from this cell, False otherwise.
+            array: The path as flat cell indices (see Grid.coords); empty, and
+                   therefore falsy, if the goal cannot be reached.
+
+        Raises:
+            ValueError: If the strategy is unknown or start or goal lies outside the maze.
         """
-        self._animate() # Animate the current step
-        self._cells[row_idx][col_idx].visited = True # Mark current cell as visited
+        solver = get_solver(strategy)
+        grid = self._cells
+        start_index = self._cell_index(start if start is not None else (0, 0), "start")
+        goal_index = self._cell_index(
+            goal if goal is not None else (self._num_rows - 1, self._num_cols - 1), "goal"
+        )
 
-        # Base case: If the current cell is the exit, return True
-        if row_idx == self._num_rows - 1 and col_idx == self._num_cols - 1:
-            return True
-        
-        # Define possible moves: right, left, down, up (in preferred order)
-        # Check right neighbor
-        if col_idx < self._num_cols - 1:
-            next_cell = self._cells[row_idx][col_idx + 1]
-            if not next_cell.has_left_wall and not next_cell.visited:
-                self._cells[row_idx][col_idx].draw_move(next_cell) # Draw forward move
-                if self._solve_maze_recursive(row_idx, col_idx + 1):
-                    return True # Path found through this direction
-                else:
-                    self._cells[row_idx][col_idx].draw_move(next_cell, undo=True) # Undo move
-        
-        # Check left neighbor
-        if col_idx > 0:
-            next_cell = self._cells[row_idx][col_idx - 1]
-            if not next_cell.has_right_wall and not next_cell.visited:
-                self._cells[row_idx][col_idx].draw_move(next_cell) # Draw forward move
-                if self._solve_maze_recursive(row_idx, col_idx - 1):
-                    return True # Path found through this direction
-                else:
-                    self._cells[row_idx][col_idx].draw_move(next_cell, undo=True) # Undo move
-        
-        # Check down neighbor
-        if row_idx < self._num_rows - 1:
-            next_cell = self._cells[row_idx + 1][col_idx]
-            if not next_cell.has_top_wall and not next_cell.visited:
-                self._cells[row_idx][col_idx].draw_move(next_cell) # Draw forward move
-                if self._solve_maze_recursive(row_idx + 1, col_idx):
-                    return True # Path found through this direction
-                else:
-                    self._cells[row_idx][col_idx].draw_move(next_cell, undo=True) # Undo move
-
-        # Check up neighbor
-        if row_idx > 0:
-            next_cell = self._cells[row_idx - 1][col_idx]
-            if not next_cell.has_bottom_wall and not next_cell.visited:
-                self._cells[row_idx][col_idx].draw_move(next_cell) # Draw forward move
-                if self._solve_maze_recursive(row_idx - 1, col_idx):
-                    return True # Path found through this direction
-                else:
-                    self._cells[row_idx][col_idx].draw_move(next_cell, undo=True) # Undo move
-       
-        return False # No path found from this cell
+        instrumentation = self._instrumentation
+        on_move = chain(
+            self._events.move if self._events is not None else None,
+            # Without a player, moves are drawn as they happen
+            self._animate_move if self.__window is not None and self._player is None else None,
+        )
+        with self._run("solve"), self._phase("solve"):
+            if strategy == "dfs":
+                path = solver(grid, start_index, goal_index, chain(
+                    on_move, instrumentation.count_move if instrumentation is not None else None,
+                ))
+            else:
+                path = solver(
+                    grid, start_index, goal_index,
+                    on_visit=instrumentation.count_visit if instrumentation is not None else None,
+                )
+                if on_move is not None:
+                    # Shortest-path solvers search invisibly; log the final route
+                    for from_index, to_index in zip(path, path[1:]):
+                        on_move(from_index, to_index, False)
+        if self._player is not None:
+            self._player.play()
+        return path
+
+    def _cell_index(self, cell, name):
+        """
+        Returns the flat index of a (row, col) cell given by a caller.
+
+        Raises:
+            ValueError: If the cell is not a (row, col) pair inside the maze.
+        """
+        try:
+            row_idx, col_idx = (operator.index(value) for value in cell)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid {name} cell {cell!r}; expected a (row, col) pair of integers") from None
+        if not (0 <= row_idx < self._num_rows and 0 <= col_idx < self._num_cols):
+            raise ValueError(
+                f"invalid {name} cell {cell!r}; expected (row, col) with "
+                f"0 <= row < {self._num_rows} and 0 <= col < {self._num_cols}"
+            )
+        return row_idx * self._num_cols + col_idx
+
+    def _animate_move(self, from_index, to_index, undo):
+        """
+        Queues one solver step between two flat cell indices for animation.
+        """
+        self._animate(
+            self._renderer.draw_move,
+            self._cells.coords(from_index), self._cells.coords(to_index), undo,
+        )
 
     def _create_cells(self):
         """
-        Initializes the 2D grid of Cell objects.
+        Initializes the compact grid of cells, every cell starting with all four walls.
         Each cell is also drawn on the window if not in test mode.
         """
-        self._cells = []
-        for r in range(self._num_rows):
-            row_of_cells = []
-            for c in range(self._num_cols):
-                cell = Cell(self.__window) # Pass window instance to each cell
-                row_of_cells.append(cell)
-            self._cells.append(row_of_cells)
+        self._cells = Grid(self._num_rows, self._num_cols)
         
-        # Draw all cells initially if not in test mode
-        if not self._is_test_mode:
-            for r in range(self._num_rows):
-                for c in range(self._num_cols):
-                    self._draw_cell(r, c)
+        # Draw all walls initially if not in test mode
+        self._draw_all_cells()
+
+    def _load_cells(self, walls):
+        """
+        Builds the grid from packed wall bytes of an already generated maze.
+        Every cell is drawn once if not in test mode.
+
+        Args:
+            walls (bytes-like, Grid or PackedGrid): One wall byte per cell, row-major,
+                                                    or a grid to use without copying.
+        """
+        from maze_logic.storage import PackedGrid
+
+        if isinstance(walls, (Grid, PackedGrid)):
+            self._cells = walls
+        else:
+            self._cells = Grid(self._num_rows, self._num_cols, walls)
+            self._break_entrance_and_exit()
+            self._reset_cells_visited()
+
+        self._draw_all_cells()
+
+    def _draw_all_cells(self):
+        """
+        Draws every wall of the grid in one batch, merging collinear walls into
+        single lines. Only runs if a window is available and not in test mode.
+        """
+        if self.__window is None or self._is_test_mode:
+            return
+        if self._instrumentation is not None:
+            self._instrumentation.stats.draw_calls += 1
+        self._renderer.draw_grid(self._cells)
 
     def _draw_cell(self, row_idx, col_idx):
         """
-        Calculates cell coordinates and draws a specific cell on the window.
+        Brings the drawn walls of a specific cell in line with the grid.
+        Existing canvas items are recolored rather than drawn again.
 
         Args:
             row_idx (int): The row index of the cell to draw.
@@ -181,112 +618,60 @@ class Maze:
         if self.__window is None:
             return # Do not draw if no window is available
 
-        # Calculate top-left and bottom-right points for the current cell
-        x1 = self._x_start + (col_idx * self._cell_width)
-        y1 = self._y_start + (row_idx * self._cell_height)
-        top_left_point = Point(x1, y1)
-        
-        x2 = x1 + self._cell_width
-        y2 = y1 + self._cell_height
-        bottom_right_point = Point(x2, y2)
-        
-        # Draw the cell using its draw method
-        self._cells[row_idx][col_idx].draw(top_left_point, bottom_right_point)
-        self._animate() # Animate after drawing each cell
+        # Capture the walls now; the step is drawn later, in its animation frame
+        self._animate(
+            self._renderer.update_cell,
+            row_idx, col_idx, self._cells.walls_at(row_idx * self._num_cols + col_idx),
+        )
 
-    def _animate(self):
+    def _animate(self, draw, *args):
         """
-        Redraws the window and pauses briefly to show animation.
-        Only runs if a window is available and not in test mode.
+        Queues a drawing step on the window's animation scheduler, which plays
+        it in a later frame without blocking. The computation itself never waits.
+        In test mode the step is applied immediately instead.
+
+        Args:
+            draw (callable): The drawing function.
+            *args: Arguments for the drawing function.
         """
-        if self.__window and not self._is_test_mode:
-            self.__window.redraw()
-            time.sleep(0.01)
+        if self._instrumentation is not None:
+            self._instrumentation.stats.draw_calls += 1
+        if self._is_test_mode:
+            draw(*args)
+        else:
+            self.__window.animator.queue(lambda: draw(*args))
 
     def _break_entrance_and_exit(self):
         """
         Removes the top wall of the starting cell and the bottom wall of the ending cell.
         """
         # Break top wall of the entrance cell (0, 0)
-        self._cells[0][0].has_top_wall = False
+        self._cells.set_wall(0, 0, TOP_WALL, False)
         # Break bottom wall of the exit cell (last_row, last_col)
-        self._cells[self._num_rows - 1][self._num_cols - 1].has_bottom_wall = False
+        self._cells.set_wall(self._num_rows - 1, self._num_cols - 1, BOTTOM_WALL, False)
         
         # Redraw these specific cells to reflect wall changes
         if not self._is_test_mode:
             self._draw_cell(0, 0)
             self._draw_cell(self._num_rows - 1, self._num_cols - 1)
 
-    def _break_walls_recursive(self, row_idx, col_idx):
+    def _break_walls(self):
         """
-        Recursively breaks walls to generate the maze using a depth-first search algorithm.
-
-        Args:
-            row_idx (int): The current row index of the cell.
-            col_idx (int): The current column index of the cell.
+        Generates the maze by running the configured generation engine over the grid.
+        Every removed wall is logged when recording events, for the player to animate.
         """
-        self._cells[row_idx][col_idx].visited = True # Mark current cell as visited
-        
-        while True:
-            unvisited_neighbors = [] # List to store coordinates of unvisited neighbors
-
-            # Check all four neighbors (right, left, down, up)
-            # Right neighbor
-            if col_idx < self._num_cols - 1 and not self._cells[row_idx][col_idx + 1].visited:
-                unvisited_neighbors.append((row_idx, col_idx + 1))
-            
-            # Left neighbor
-            if col_idx > 0 and not self._cells[row_idx][col_idx - 1].visited:
-                unvisited_neighbors.append((row_idx, col_idx - 1))
-            
-            # Down neighbor
-            if row_idx < self._num_rows - 1 and not self._cells[row_idx + 1][col_idx].visited:
-                unvisited_neighbors.append((row_idx + 1, col_idx))
-            
-            # Up neighbor
-            if row_idx > 0 and not self._cells[row_idx - 1][col_idx].visited:
-                unvisited_neighbors.append((row_idx - 1, col_idx))
-            
-            # If no unvisited neighbors, backtrack (all paths explored from this cell)
-            if not unvisited_neighbors:
-                if not self._is_test_mode:
-                    self._draw_cell(row_idx, col_idx) # Redraw cell to update wall status
-                return
-            
-            # Choose a random unvisited neighbor
-            next_row, next_col = random.choice(unvisited_neighbors)
-
-            # Break walls between the current cell and the chosen neighbor
-            # Moving Right
-            if next_col > col_idx: # Current cell's right wall and neighbor's left wall
-                self._cells[row_idx][col_idx].has_right_wall = False
-                self._cells[next_row][next_col].has_left_wall = False
-            # Moving Left
-            elif next_col < col_idx: # Current cell's left wall and neighbor's right wall
-                self._cells[row_idx][col_idx].has_left_wall = False
-                self._cells[next_row][next_col].has_right_wall = False
-            # Moving Down
-            elif next_row > row_idx: # Current cell's bottom wall and neighbor's top wall
-                self._cells[row_idx][col_idx].has_bottom_wall = False
-                self._cells[next_row][next_col].has_top_wall = False
-            # Moving Up
-            elif next_row < row_idx: # Current cell's top wall and neighbor's bottom wall
-                self._cells[row_idx][col_idx].has_top_wall = False
-                self._cells[next_row][next_col].has_bottom_wall = False
-
-            # Redraw affected cells immediately if not in test mode
-            if not self._is_test_mode:
-                self._draw_cell(row_idx, col_idx)
-                self._draw_cell(next_row, next_col)
-
-            # Recursively call _break_walls_recursive for the chosen neighbor
-            self._break_walls_recursive(next_row, next_col)
+        on_carve = self._events.carve if self._events is not None else None
+        on_backtrack = None
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            instrumentation.stats.cells_visited += 1 # The start cell is reached without a carve
+            on_carve = chain(on_carve, instrumentation.count_carve)
+            on_backtrack = instrumentation.count_backtrack
+        self._generator.generate(self._cells, self._rng, on_carve, on_backtrack)
 
     def _reset_cells_visited(self):
         """
         Resets the 'visited' status of all cells to False.
         This is crucial before running the maze solving algorithm.
         """
-        for row in self._cells:
-            for cell in row:
-                cell.visited = False
\ No newline at end of file
+        self._cells.reset_visited()
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Seed derivation shared by batch generation and chunked grids.
+
+Kept free of other ``maze_logic`` imports so low-level modules can use it
+without loading the maze and process-pool machinery.
+"""
+import hashlib
+
+
+def derive_seed(base_seed, index):
+    """
+    Derives a well-mixed 64-bit seed for one member of a family, such as one
+    maze of a batch or one chunk of a chunked grid.
+
+    Args:
+        base_seed (int): The seed of the whole family.
+        index (int): Position of the member in the family.
+
+    Returns:
+        int: The member's seed.
+    """
+    digest = hashlib.blake2b(f"{base_seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
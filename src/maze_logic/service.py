@@ -0,0 +1,343 @@
+"""
+Local maze service: one warm cache shared by many worker processes.
+
+An asyncio server on a Unix socket or a localhost TCP port answers
+newline-delimited JSON requests::
+
+    {"op": "generate", "rows": 50, "cols": 80, "seed": 1, "algorithm": "dfs"}
+    {"op": "solve", ..., "solver": "bfs", "start": [0, 0], "goal": [49, 79]}
+    {"op": "render", ..., "format": "png", "cell_size": 4, "solver": "bfs"}
+
+and replies with one JSON line, ``{"ok": true, ...}`` or ``{"ok": false, "error": ...}``.
+Wall bytes and images are base64 encoded.
+
+CPU-bound work runs in a process pool. Generated walls are kept in an LRU
+cache keyed by ``(rows, cols, seed, algorithm)``, so solves and renders of a
+cached maze skip generation. Identical requests that arrive while the first
+is still being computed wait for its result instead of computing it again.
+If a worker dies and breaks the pool, the service starts a fresh pool and
+retries the request once. Requests larger than ``MAX_CELLS`` are rejected.
+
+Run it with ``python -m maze_logic.service --socket /tmp/maze.sock`` (or
+``--port 8765``) and talk to it with ``MazeClient``.
+"""
+import argparse
+import asyncio
+import base64
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import io
+import json
+import operator
+import socket
+
+from maze_logic.batch import build_walls
+from maze_logic.grid import Grid
+from maze_logic.solvers import get_solver
+
+MAX_CELLS = 1 << 24 # Largest maze a request may ask for; its walls and images stay well under the line limit
+
+
+def _parse_cell(value, name, num_rows, num_cols):
+    """
+    Returns a request's (row, col) cell as a tuple of ints.
+
+    Raises:
+        ValueError: If the value is not a (row, col) pair inside the maze.
+    """
+    try:
+        row_idx, col_idx = (operator.index(item) for item in value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid {name} cell {value!r}; expected a (row, col) pair of integers") from None
+    if not (0 <= row_idx < num_rows and 0 <= col_idx < num_cols):
+        raise ValueError(
+            f"invalid {name} cell {value!r}; expected (row, col) with "
+            f"0 <= row < {num_rows} and 0 <= col < {num_cols}"
+        )
+    return row_idx, col_idx
+
+
+def _solve_walls(num_rows, num_cols, walls, solver, start, goal):
+    """Worker task: solves a maze given its wall bytes and returns the path as (row, col) pairs."""
+    grid = Grid(num_rows, num_cols, walls)
+    path = get_solver(solver)(grid, grid.index(*start), grid.index(*goal))
+    return [grid.coords(index) for index in path]
+
+
+def _render_walls(num_rows, num_cols, walls, fmt, cell_size, solver):
+    """Worker task: rasterizes a maze given its wall bytes and returns the image bytes."""
+    from maze_logic.export import export_image
+
+    grid = Grid(num_rows, num_cols, walls)
+    path = get_solver(solver)(grid, 0, grid.size - 1) if solver else None
+    out = io.BytesIO()
+    export_image(grid, out, fmt, cell_size, path)
+    return out.getvalue()
+
+
+class MazeService:
+    """
+    Serves generate/solve/render requests with coalescing and an LRU wall cache.
+    """
+
+    def __init__(self, max_workers=None, cache_size=128, executor=None, max_cells=MAX_CELLS):
+        """
+        Args:
+            max_workers (int, optional): Worker processes. Defaults to the CPU count.
+            cache_size (int): How many generated mazes the LRU cache keeps.
+            executor (Executor, optional): Use this executor instead of creating a process pool.
+                                           A supplied executor is never restarted.
+            max_cells (int): Largest ``rows * cols`` a request may ask for.
+        """
+        self.max_workers = max_workers
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self.cache_size = cache_size
+        self.max_cells = max_cells
+        self._cache = OrderedDict() # (rows, cols, seed, algorithm) -> wall bytes
+        self._in_flight = {} # Request key -> future shared by identical requests
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def close(self):
+        """Shuts the worker pool down."""
+        self._executor.shutdown()
+
+    def _restart_pool(self, broken):
+        """
+        Replaces a broken process pool with a fresh one.
+
+        Requests that failed on the same pool all call this; only the first replaces it.
+
+        Args:
+            broken (Executor): The executor the failed request ran on.
+
+        Returns:
+            bool: Whether a usable pool is in place to retry on.
+        """
+        if not self._owns_executor:
+            return False
+        if self._executor is broken:
+            broken.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return True
+
+    async def _compute(self, key, function, *args):
+        """
+        Runs a function in the pool, sharing the result with identical requests in flight.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, function, *args)
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def walls(self, num_rows, num_cols, seed, algorithm):
+        """
+        Returns the wall bytes of a maze, from the cache when possible.
+
+        Args:
+            num_rows (int): The number of rows in the maze.
+            num_cols (int): The number of columns in the maze.
+            seed (int): The maze's random seed.
+            algorithm (str): Generation engine name.
+        """
+        key = (num_rows, num_cols, seed, algorithm)
+        walls = self._cache.get(key)
+        if walls is not None:
+            self.stats["hits"] += 1
+            self._cache.move_to_end(key)
+            return walls
+
+        self.stats["misses"] += 1
+        walls = await self._compute(("generate",) + key, build_walls, num_rows, num_cols, seed, algorithm)
+        self._cache[key] = walls
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return walls
+
+    async def handle(self, request):
+        """
+        Answers one decoded request.
+
+        Args:
+            request (dict): The request; see the module docstring.
+
+        Returns:
+            dict: The response.
+        """
+        try:
+            executor = self._executor
+            try:
+                return await self._answer(request)
+            except BrokenProcessPool:
+                if not self._restart_pool(executor):
+                    raise
+                return await self._answer(request)
+        except (KeyError, TypeError, ValueError) as error:
+            return {"ok": False, "error": str(error)}
+        except Exception as error: # E.g. a crashed worker; the connection must stay usable
+            return {"ok": False, "error": f"internal error: {type(error).__name__}: {error}"}
+
+    async def _answer(self, request):
+        """
+        Computes the response to one request; handle() turns errors into error responses.
+        """
+        op = request["op"]
+        if op not in ("generate", "solve", "render"):
+            raise ValueError(f"unknown op {op!r}; expected one of ['generate', 'render', 'solve']")
+        num_rows, num_cols = int(request["rows"]), int(request["cols"])
+        seed = int(request.get("seed", 0))
+        algorithm = request.get("algorithm", "dfs")
+        if num_rows < 1 or num_cols < 1:
+            raise ValueError("rows and cols must be positive")
+        if num_rows * num_cols > self.max_cells:
+            raise ValueError(f"maze of {num_rows}x{num_cols} cells is too large; "
+                             f"rows * cols must be at most {self.max_cells}")
+        walls = await self.walls(num_rows, num_cols, seed, algorithm)
+        maze_key = (num_rows, num_cols, seed, algorithm)
+
+        if op == "generate":
+            return {"ok": True, "walls": base64.b64encode(walls).decode("ascii")}
+        if op == "solve":
+            solver = request.get("solver", "bfs")
+            start = _parse_cell(request.get("start", (0, 0)), "start", num_rows, num_cols)
+            goal = _parse_cell(request.get("goal", (num_rows - 1, num_cols - 1)), "goal",
+                               num_rows, num_cols)
+            path = await self._compute(("solve", maze_key, solver, start, goal), _solve_walls,
+                                       num_rows, num_cols, walls, solver, start, goal)
+            return {"ok": True, "path": path}
+        fmt = request.get("format", "png")
+        cell_size = int(request.get("cell_size", 4))
+        solver = request.get("solver")
+        image = await self._compute(("render", maze_key, fmt, cell_size, solver), _render_walls,
+                                    num_rows, num_cols, walls, fmt, cell_size, solver)
+        return {"ok": True, "image": base64.b64encode(image).decode("ascii")}
+
+    async def _serve_client(self, reader, writer):
+        """Answers newline-delimited JSON requests on one connection until it closes."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.handle(json.loads(line))
+                except json.JSONDecodeError as error:
+                    response = {"ok": False, "error": f"invalid JSON: {error}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """
+        Starts listening on a Unix socket if ``path`` is given, else on a localhost TCP port.
+
+        Returns:
+            asyncio.Server: The running server; for TCP, ``server.sockets[0].getsockname()``
+                            gives the bound port.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self._serve_client, path, limit=1 << 26)
+        return await asyncio.start_server(self._serve_client, host, port, limit=1 << 26)
+
+
+class MazeClient:
+    """
+    Blocking client for MazeService, for use from worker processes.
+    """
+
+    def __init__(self, path=None, host="127.0.0.1", port=8765):
+        """
+        Args:
+            path (str, optional): Unix socket path. If not given, connects over TCP.
+            host (str): Server host for TCP.
+            port (int): Server port for TCP.
+        """
+        if path is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(path)
+        else:
+            self._socket = socket.create_connection((host, port))
+        self._reader = self._socket.makefile("rb")
+
+    def close(self):
+        """Closes the connection."""
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def request(self, op, **params):
+        """
+        Sends one request and returns the decoded response.
+
+        Raises:
+            ValueError: If the service reports an error.
+        """
+        self._socket.sendall(json.dumps(dict(params, op=op)).encode() + b"\n")
+        response = json.loads(self._reader.readline())
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        return response
+
+    def generate(self, num_rows, num_cols, seed=0, algorithm="dfs"):
+        """Returns the maze as a Grid."""
+        response = self.request("generate", rows=num_rows, cols=num_cols, seed=seed, algorithm=algorithm)
+        return Grid(num_rows, num_cols, base64.b64decode(response["walls"]))
+
+    def solve(self, num_rows, num_cols, seed=0, algorithm="dfs", solver="bfs", start=None, goal=None):
+        """Returns the solution path as a list of (row, col) pairs."""
+        params = dict(rows=num_rows, cols=num_cols, seed=seed, algorithm=algorithm, solver=solver)
+        if start is not None:
+            params["start"] = start
+        if goal is not None:
+            params["goal"] = goal
+        return [tuple(cell) for cell in self.request("solve", **params)["path"]]
+
+    def render(self, num_rows, num_cols, seed=0, algorithm="dfs", fmt="png", cell_size=4, solver=None):
+        """Returns the rendered image bytes."""
+        response = self.request("render", rows=num_rows, cols=num_cols, seed=seed, algorithm=algorithm,
+                                format=fmt, cell_size=cell_size, solver=solver)
+        return base64.b64decode(response["image"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local maze generation service")
+    parser.add_argument("--socket", help="Unix socket path (default: TCP on localhost)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default 8765)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--cache-size", type=int, default=128, help="mazes kept in the LRU cache")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        service = MazeService(args.workers, args.cache_size)
+        server = await service.start(args.socket, port=args.port)
+        print(f"Serving on {args.socket or server.sockets[0].getsockname()}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Iterative maze solvers.
+
+Every solver works directly on the packed wall flags of a grid (anything
+exposing ``num_rows``, ``num_cols``, ``size`` and ``walls_at(index)``, such as
+``maze_logic.grid.Grid``), keeps its bookkeeping in flat arrays, and returns the
+path as an ``array`` of flat cell indices from start to goal. Use
+``grid.coords(index)`` to turn an index back into ``(row, col)``. An empty
+array means the goal cannot be reached.
+
+Grids too large to allocate per-cell arrays for (such as
+``maze_logic.chunked.ChunkedGrid``) set ``sparse = True``; the solvers then
+keep their bookkeeping in dictionaries holding only the cells they touch.
+"""
+from array import array
+from collections import deque
+import heapq
+
+from maze_logic.grid import (
+    LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL, index_array, index_typecode,
+)
+
+
+class SparseField(dict):
+    """
+    A per-cell field that only stores the cells written to; every other cell reads as ``fill``.
+    """
+
+    def __init__(self, fill):
+        super().__init__()
+        self.fill = fill
+
+    def __missing__(self, index):
+        return self.fill
+
+
+def _new_field(grid, fill):
+    """Returns a per-cell integer array (or a SparseField) for a solver's bookkeeping."""
+    if getattr(grid, "sparse", False):
+        return SparseField(fill)
+    return index_array(grid.size, fill)
+
+
+def _new_flags(grid):
+    """Returns a per-cell flag array (or a SparseField), every flag cleared."""
+    if getattr(grid, "sparse", False):
+        return SparseField(0)
+    return bytearray(grid.size)
+
+
+def _open_neighbors(grid):
+    """
+    Builds a function listing the cells reachable in one step from a cell.
+    Neighbors are returned in right, left, down, up order.
+    """
+    walls_at = grid.walls_at
+    num_cols = grid.num_cols
+    size = grid.size
+
+    def neighbors(index):
+        walls = walls_at(index)
+        result = []
+        if not walls & RIGHT_WALL and (index + 1) % num_cols:
+            result.append(index + 1)
+        if not walls & LEFT_WALL and index % num_cols:
+            result.append(index - 1)
+        if not walls & BOTTOM_WALL and index + num_cols < size:
+            result.append(index + num_cols)
+        if not walls & TOP_WALL and index >= num_cols:
+            result.append(index - num_cols)
+        return result
+
+    return neighbors
+
+
+def _trace_path(grid, parent, start, goal):
+    """Follows parent links back from goal to start and returns the path."""
+    path = array(index_typecode(grid.size), [goal])
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def solve_dfs(grid, start, goal, on_move=None, on_visit=None):
+    """
+    Depth-first search with an explicit stack, preferring right, left, down, up.
+    Finds a path but not necessarily the shortest one.
+
+    Args:
+        grid (Grid): The maze walls.
+        start (int): Flat index of the start cell.
+        goal (int): Flat index of the goal cell.
+        on_move (callable, optional): Called as ``on_move(from_index, to_index, undo)``
+                                      for every step forward and every backtrack.
+        on_visit (callable, optional): Called as ``on_visit(index)`` for every cell entered.
+
+    Returns:
+        array: The path as flat cell indices, empty if the goal is unreachable.
+    """
+    walls_at = grid.walls_at
+    num_cols = grid.num_cols
+    size = grid.size
+    visited = _new_flags(grid)
+    visited[start] = 1
+
+    def step(index, direction):
+        """Returns the cell reached through the given direction, or -1 if blocked."""
+        walls = walls_at(index)
+        if direction == 0:
+            return index + 1 if not walls & RIGHT_WALL and (index + 1) % num_cols else -1
+        if direction == 1:
+            return index - 1 if not walls & LEFT_WALL and index % num_cols else -1
+        if direction == 2:
+            return index + num_cols if not walls & BOTTOM_WALL and index + num_cols < size else -1
+        return index - num_cols if not walls & TOP_WALL and index >= num_cols else -1
+
+    path = array(index_typecode(size), [start]) # The stack is the current path
+    tried = bytearray([0]) # Directions already tried for every cell on the stack
+    while path:
+        current = path[-1]
+        if current == goal:
+            return path
+
+        direction = tried[-1]
+        if direction == 4:
+            # Dead end: backtrack
+            path.pop()
+            tried.pop()
+            if path and on_move:
+                on_move(path[-1], current, True)
+            continue
+
+        tried[-1] = direction + 1
+        next_cell = step(current, direction)
+        if next_cell < 0 or visited[next_cell]:
+            continue
+        visited[next_cell] = 1
+        if on_move:
+            on_move(current, next_cell, False)
+        if on_visit:
+            on_visit(next_cell)
+        path.append(next_cell)
+        tried.append(0)
+
+    return array(index_typecode(size))
+
+
+def solve_bfs(grid, start, goal, on_visit=None):
+    """
+    Breadth-first search; returns a shortest path.
+
+    Args:
+        grid (Grid): The maze walls.
+        start (int): Flat index of the start cell.
+        goal (int): Flat index of the goal cell.
+        on_visit (callable, optional): Called as ``on_visit(index)`` for every cell expanded.
+
+    Returns:
+        array: The path as flat cell indices, empty if the goal is unreachable.
+    """
+    neighbors = _open_neighbors(grid)
+    parent = _new_field(grid, -1)
+    parent[start] = start
+
+    # Every cell is queued at most once, so a flat array doubles as the queue
+    queue = _new_field(grid, 0)
+    queue[0] = start
+    head, tail = 0, 1
+    while head < tail:
+        current = queue[head]
+        head += 1
+        if on_visit:
+            on_visit(current)
+        if current == goal:
+            return _trace_path(grid, parent, start, goal)
+        for neighbor in neighbors(current):
+            if parent[neighbor] < 0:
+                parent[neighbor] = current
+                queue[tail] = neighbor
+                tail += 1
+
+    return array(index_typecode(grid.size))
+
+
+def solve_astar(grid, start, goal, on_visit=None):
+    """
+    A* search with a Manhattan-distance heuristic; returns a shortest path.
+
+    Args:
+        grid (Grid): The maze walls.
+        start (int): Flat index of the start cell.
+        goal (int): Flat index of the goal cell.
+        on_visit (callable, optional): Called as ``on_visit(index)`` for every cell expanded.
+
+    Returns:
+        array: The path as flat cell indices, empty if the goal is unreachable.
+    """
+    neighbors = _open_neighbors(grid)
+    num_cols = grid.num_cols
+    goal_row, goal_col = divmod(goal, num_cols)
+
+    def heuristic(index):
+        row_idx, col_idx = divmod(index, num_cols)
+        return abs(row_idx - goal_row) + abs(col_idx - goal_col)
+
+    parent = _new_field(grid, -1)
+    cost = _new_field(grid, -1) # Best known distance from start, -1 if unseen
+    parent[start] = start
+    cost[start] = 0
+
+    open_heap = [(heuristic(start), 0, start)]
+    while open_heap:
+        _, current_cost, current = heapq.heappop(open_heap)
+        if current_cost > cost[current]:
+            continue # Stale heap entry
+        if on_visit:
+            on_visit(current)
+        if current == goal:
+            return _trace_path(grid, parent, start, goal)
+        next_cost = current_cost + 1
+        for neighbor in neighbors(current):
+            if cost[neighbor] < 0 or next_cost < cost[neighbor]:
+                cost[neighbor] = next_cost
+                parent[neighbor] = current
+                heapq.heappush(open_heap, (next_cost + heuristic(neighbor), next_cost, neighbor))
+
+    return array(index_typecode(grid.size))
+
+
+def solve_bidirectional(grid, start, goal, on_visit=None):
+    """
+    Bidirectional breadth-first search; returns a shortest path.
+    Grows whichever frontier is smaller one full layer at a time and stops
+    at the layer where the two searches meet.
+
+    Args:
+        grid (Grid): The maze walls.
+        start (int): Flat index of the start cell.
+        goal (int): Flat index of the goal cell.
+        on_visit (callable, optional): Called as ``on_visit(index)`` for every cell expanded.
+
+    Returns:
+        array: The path as flat cell indices, empty if the goal is unreachable.
+    """
+    if start == goal:
+        return array(index_typecode(grid.size), [start])
+
+    neighbors = _open_neighbors(grid)
+    # Index 0 searches forward from start, index 1 backward from goal
+    parents = (_new_field(grid, -1), _new_field(grid, -1))
+    depths = (_new_field(grid, -1), _new_field(grid, -1))
+    frontiers = (deque([start]), deque([goal]))
+    for side, origin in enumerate((start, goal)):
+        parents[side][origin] = origin
+        depths[side][origin] = 0
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        frontier, parent, depth = frontiers[side], parents[side], depths[side]
+        other_depth = depths[1 - side]
+
+        best_length, meeting = -1, None
+        for _ in range(len(frontier)):
+            current = frontier.popleft()
+            if on_visit:
+                on_visit(current)
+            for neighbor in neighbors(current):
+                if depth[neighbor] >= 0:
+                    continue
+                depth[neighbor] = depth[current] + 1
+                parent[neighbor] = current
+                frontier.append(neighbor)
+                if other_depth[neighbor] >= 0:
+                    length = depth[neighbor] + other_depth[neighbor]
+                    if best_length < 0 or length < best_length:
+                        best_length, meeting = length, neighbor
+
+        if meeting is not None:
+            path = _trace_path(grid, parents[0], start, meeting)
+            current = meeting
+            while current != goal:
+                current = parents[1][current]
+                path.append(current)
+            return path
+
+    return array(index_typecode(grid.size))
+
+
+# Registry of solvers by strategy name
+SOLVERS = {
+    "dfs": solve_dfs,
+    "bfs": solve_bfs,
+    "astar": solve_astar,
+    "bidirectional": solve_bidirectional,
+}
+
+
+def get_solver(strategy):
+    """
+    Looks up a solver by strategy name.
+
+    Args:
+        strategy (str): One of "dfs", "bfs", "astar" or "bidirectional".
+
+    Returns:
+        callable: A solver taking ``(grid, start, goal, on_visit=None)``.
+
+    Raises:
+        ValueError: If the strategy name is not registered.
+    """
+    try:
+        return SOLVERS[strategy]
+    except KeyError:
+        raise ValueError(
+            f"unknown solve strategy {strategy!r}; expected one of {sorted(SOLVERS)}"
+        ) from None
@@ -0,0 +1,373 @@
+"""
+Compact binary maze files.
+
+Layout (little-endian):
+
+    magic      4 bytes   b"MAZE"
+    version    uint16
+    flags      uint16    reserved, 0
+    num_rows   uint32
+    num_cols   uint32
+    alg_len    uint8     length of the algorithm name
+    seed_type  uint8     0 = no seed, 1 = int (decimal text), 2 = str (UTF-8), 3 = bytes
+    seed_len   uint16    length of the encoded seed
+    algorithm  alg_len bytes, ASCII
+    seed       seed_len bytes
+    padding    zero bytes up to an 8-byte boundary
+    cells      2 bits per cell, row-major, four cells per byte starting at the
+               low bits: bit 0 = right wall, bit 1 = bottom wall
+    left edge  1 bit per row, low bits first: the left wall of column 0
+    top edge   1 bit per column, low bits first: the top wall of row 0
+
+Inner left and top walls are the right and bottom walls of the neighbouring
+cells, so they are not stored; only the outer left and top edges, which no
+neighbour shares, get their own bits. Files can be opened with ``mmap`` through
+``PackedGrid`` and queried cell by cell without reading them into memory.
+"""
+import mmap
+import struct
+
+from maze_logic.grid import Grid, LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+
+MAGIC = b"MAZE"
+FORMAT_VERSION = 1
+
+SEED_NONE = 0
+SEED_INT = 1
+SEED_STR = 2
+SEED_BYTES = 3
+
+_HEADER = struct.Struct("<4sHHIIBBH")
+
+# Cell byte -> its 2-bit (right, bottom) code
+_TO_PAIR = bytes(
+    (1 if b & RIGHT_WALL else 0) | (2 if b & BOTTOM_WALL else 0) for b in range(256)
+)
+# 2-bit code shifted into lane k of a packed byte
+_TO_LANE = [bytes(((b & 3) << (2 * k)) for b in range(256)) for k in range(4)]
+# Packed byte -> 2-bit code of lane k, expanded to RIGHT_WALL / BOTTOM_WALL bits
+_FROM_LANE = [
+    bytes(
+        (RIGHT_WALL if (b >> (2 * k)) & 1 else 0) | (BOTTOM_WALL if (b >> (2 * k)) & 2 else 0)
+        for b in range(256)
+    )
+    for k in range(4)
+]
+# RIGHT_WALL of a cell -> LEFT_WALL of the cell to its right
+_RIGHT_TO_LEFT = bytes(LEFT_WALL if b & RIGHT_WALL else 0 for b in range(256))
+# BOTTOM_WALL of a cell -> TOP_WALL of the cell below it
+_BOTTOM_TO_TOP = bytes(TOP_WALL if b & BOTTOM_WALL else 0 for b in range(256))
+
+
+def _or_bytes(*chunks):
+    """Bitwise-ORs equally long byte strings together."""
+    length = len(chunks[0])
+    value = 0
+    for chunk in chunks:
+        value |= int.from_bytes(chunk, "little")
+    return value.to_bytes(length, "little")
+
+
+def packed_size(num_rows, num_cols):
+    """Returns the number of bytes ``pack_walls`` writes for a grid."""
+    return (num_rows * num_cols + 3) // 4 + (num_rows + 7) // 8 + (num_cols + 7) // 8
+
+
+def _pack_bits(cells, wall):
+    """Packs one bit per cell byte, set where the given wall is up, low bits first."""
+    packed = bytearray((len(cells) + 7) // 8)
+    for position, value in enumerate(cells):
+        if value & wall:
+            packed[position >> 3] |= 1 << (position & 7)
+    return bytes(packed)
+
+
+def _unpack_bits(packed, count, wall):
+    """Inverse of _pack_bits(): one byte per bit, ``wall`` where the bit is set."""
+    return bytes(wall if packed[position >> 3] >> (position & 7) & 1 else 0 for position in range(count))
+
+
+def pack_walls(grid):
+    """
+    Packs a grid's right and bottom walls into 2 bits per cell, followed by
+    the outer left and top edges at 1 bit per row and column.
+
+    Args:
+        grid (Grid): The maze walls.
+
+    Returns:
+        bytes: ``packed_size(num_rows, num_cols)`` packed bytes.
+    """
+    data = bytes(grid.data)
+    pairs = data.translate(_TO_PAIR)
+    pairs += bytes(-len(pairs) % 4)
+    return (
+        _or_bytes(*(pairs[k::4].translate(_TO_LANE[k]) for k in range(4)))
+        + _pack_bits(data[::grid.num_cols], LEFT_WALL)
+        + _pack_bits(data[:grid.num_cols], TOP_WALL)
+    )
+
+
+def unpack_walls(packed, num_rows, num_cols):
+    """
+    Rebuilds the full 4-wall cell bytes from packed walls.
+
+    Args:
+        packed (bytes-like): Packed walls as written by ``pack_walls``.
+        num_rows (int): The number of rows in the maze.
+        num_cols (int): The number of columns in the maze.
+
+    Returns:
+        bytearray: One wall byte per cell, row-major.
+    """
+    size = num_rows * num_cols
+    cells_end = (size + 3) // 4
+    left_end = cells_end + (num_rows + 7) // 8
+    left_edge = _unpack_bits(packed[cells_end:left_end], num_rows, LEFT_WALL)
+    top_edge = _unpack_bits(packed[left_end:left_end + (num_cols + 7) // 8], num_cols, TOP_WALL)
+    packed = bytes(packed[:cells_end])
+    right_bottom = bytearray(len(packed) * 4)
+    for k in range(4):
+        right_bottom[k::4] = packed.translate(_FROM_LANE[k])
+    right_bottom = bytes(right_bottom[:size])
+
+    # Left walls mirror the right wall of the previous cell; column 0 has its own bits
+    left = bytearray(bytes([LEFT_WALL]) + right_bottom[:-1].translate(_RIGHT_TO_LEFT))
+    left[::num_cols] = left_edge
+    # Top walls mirror the bottom wall of the cell above; row 0 has its own bits
+    top = top_edge + right_bottom[:-num_cols].translate(_BOTTOM_TO_TOP)
+
+    return bytearray(_or_bytes(right_bottom, bytes(left), bytes(top[:size])))
+
+
+def _encode_seed(random_seed):
+    """
+    Returns the (seed_type, bytes) pair a seed is stored as.
+
+    Raises:
+        ValueError: If the seed's type cannot be stored or it is too long.
+    """
+    if random_seed is None:
+        return SEED_NONE, b""
+    if isinstance(random_seed, bool) or not isinstance(random_seed, (int, str, bytes, bytearray)):
+        raise ValueError(
+            f"unsupported seed type {type(random_seed).__name__!r}; expected one of "
+            "['bytes', 'int', 'str']"
+        )
+    if isinstance(random_seed, int):
+        seed_type, seed_bytes = SEED_INT, str(random_seed).encode("ascii")
+    elif isinstance(random_seed, str):
+        seed_type, seed_bytes = SEED_STR, random_seed.encode("utf-8")
+    else:
+        seed_type, seed_bytes = SEED_BYTES, bytes(random_seed)
+    if len(seed_bytes) > 0xFFFF:
+        raise ValueError(f"seed too long to save: {len(seed_bytes)} bytes, at most {0xFFFF}")
+    return seed_type, seed_bytes
+
+
+def _decode_seed(seed_type, seed_bytes):
+    """Inverse of _encode_seed()."""
+    if seed_type == SEED_NONE:
+        return None
+    if seed_type == SEED_INT:
+        return int(seed_bytes.decode("ascii"))
+    if seed_type == SEED_STR:
+        return seed_bytes.decode("utf-8")
+    if seed_type == SEED_BYTES:
+        return seed_bytes
+    raise ValueError(f"unknown seed type {seed_type}")
+
+
+def _encode_header(num_rows, num_cols, random_seed, algorithm):
+    """
+    Builds the header bytes, padded to an 8-byte boundary.
+
+    Raises:
+        ValueError: If the seed or algorithm name cannot be stored.
+    """
+    algorithm_bytes = (algorithm or "").encode("ascii")
+    if len(algorithm_bytes) > 0xFF:
+        raise ValueError(f"algorithm name too long to save: {len(algorithm_bytes)} bytes, at most {0xFF}")
+    seed_type, seed_bytes = _encode_seed(random_seed)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, num_rows, num_cols,
+        len(algorithm_bytes), seed_type, len(seed_bytes),
+    ) + algorithm_bytes + seed_bytes
+    return header + bytes(-len(header) % 8)
+
+
+class MazeHeader:
+    """
+    The decoded header of a maze file.
+    """
+    __slots__ = ("num_rows", "num_cols", "random_seed", "algorithm", "data_offset")
+
+    def __init__(self, num_rows, num_cols, random_seed, algorithm, data_offset):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.random_seed = random_seed
+        self.algorithm = algorithm
+        self.data_offset = data_offset # Byte offset of the packed cells
+
+    @classmethod
+    def decode(cls, buffer):
+        """
+        Parses a header from the start of a buffer.
+
+        Raises:
+            ValueError: If the buffer is not a supported maze file or is too
+                        short to hold all of its cells.
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("not a maze file: too short")
+        magic, version, _, num_rows, num_cols, alg_len, seed_type, seed_len = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("not a maze file: bad magic")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported maze file version {version}")
+
+        offset = _HEADER.size
+        algorithm = bytes(buffer[offset:offset + alg_len]).decode("ascii") or None
+        offset += alg_len
+        random_seed = _decode_seed(seed_type, bytes(buffer[offset:offset + seed_len]))
+        offset += seed_len
+        offset += -offset % 8
+        if len(buffer) < offset + packed_size(num_rows, num_cols):
+            raise ValueError("truncated maze file: cell data is incomplete")
+        return cls(num_rows, num_cols, random_seed, algorithm, offset)
+
+
+def save_maze(path, grid, random_seed=None, algorithm=None):
+    """
+    Writes a maze file.
+
+    Args:
+        path (str or PathLike): Destination file.
+        grid (Grid): The maze walls.
+        random_seed (int, str or bytes, optional): Seed the maze was generated with.
+        algorithm (str, optional): Name of the generation engine.
+
+    Raises:
+        ValueError: If the seed cannot be stored.
+    """
+    with open(path, "wb") as out:
+        out.write(_encode_header(grid.num_rows, grid.num_cols, random_seed, algorithm))
+        out.write(pack_walls(grid))
+
+
+def load_grid(path):
+    """
+    Reads a maze file fully into memory.
+
+    Returns:
+        tuple: (Grid, MazeHeader)
+    """
+    with open(path, "rb") as source:
+        buffer = source.read()
+    header = MazeHeader.decode(buffer)
+    cells = unpack_walls(memoryview(buffer)[header.data_offset:], header.num_rows, header.num_cols)
+    return Grid(header.num_rows, header.num_cols, cells), header
+
+
+class PackedGrid:
+    """
+    A read-only grid backed by a memory-mapped maze file.
+    Cells are decoded on demand, so opening is O(1) in the maze size and only
+    the pages a query touches are read. The mapping is shared through the OS
+    page cache, so many processes can open the same file without copying it.
+
+    Offers the read side of the Grid interface used by the solvers.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str or PathLike): The maze file to map.
+
+        Raises:
+            ValueError: If the file is not a maze file or is truncated.
+        """
+        self._file = open(path, "rb")
+        self._map = None
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.header = MazeHeader.decode(self._map)
+        except BaseException:
+            if self._map is not None:
+                self._map.close()
+            self._file.close()
+            raise
+        self.num_rows = self.header.num_rows
+        self.num_cols = self.header.num_cols
+        self._offset = self.header.data_offset
+        # Bits of the outer left and top edges, after the packed cells
+        self._left_offset = self._offset + (self.num_rows * self.num_cols + 3) // 4
+        self._top_offset = self._left_offset + (self.num_rows + 7) // 8
+
+    @property
+    def size(self):
+        """Returns the total number of cells in the grid."""
+        return self.num_rows * self.num_cols
+
+    def index(self, row_idx, col_idx):
+        """Returns the flat index of the cell at (row_idx, col_idx)."""
+        return row_idx * self.num_cols + col_idx
+
+    def coords(self, index):
+        """Returns the (row, col) coordinates of a flat cell index."""
+        return divmod(index, self.num_cols)
+
+    def _pair(self, index):
+        """Returns the stored 2-bit (right, bottom) code of a cell."""
+        return (self._map[self._offset + (index >> 2)] >> ((index & 3) * 2)) & 3
+
+    def _edge_bit(self, offset, position):
+        """Returns the stored bit of an outer edge wall."""
+        return (self._map[offset + (position >> 3)] >> (position & 7)) & 1
+
+    def walls_at(self, index):
+        """Returns the 4-bit wall mask of the cell at a flat index."""
+        num_cols = self.num_cols
+        pair = self._pair(index)
+        walls = (RIGHT_WALL if pair & 1 else 0) | (BOTTOM_WALL if pair & 2 else 0)
+        col_idx = index % num_cols
+        if self._edge_bit(self._left_offset, index // num_cols) if col_idx == 0 else self._pair(index - 1) & 1:
+            walls |= LEFT_WALL
+        if self._edge_bit(self._top_offset, col_idx) if index < num_cols else self._pair(index - num_cols) & 2:
+            walls |= TOP_WALL
+        return walls
+
+    def walls(self, row_idx, col_idx):
+        """
+        Returns the walls of a cell as booleans.
+
+        Returns:
+            tuple: (has_left_wall, has_right_wall, has_top_wall, has_bottom_wall)
+        """
+        mask = self.walls_at(row_idx * self.num_cols + col_idx)
+        return (
+            bool(mask & LEFT_WALL),
+            bool(mask & RIGHT_WALL),
+            bool(mask & TOP_WALL),
+            bool(mask & BOTTOM_WALL),
+        )
+
+    def has_wall(self, row_idx, col_idx, wall):
+        """Returns True if the given wall bit is set on the cell."""
+        return bool(self.walls_at(row_idx * self.num_cols + col_idx) & wall)
+
+    def to_grid(self):
+        """Decodes the whole mapping into a mutable in-memory Grid."""
+        cells = unpack_walls(memoryview(self._map)[self._offset:], self.num_rows, self.num_cols)
+        return Grid(self.num_rows, self.num_cols, cells)
+
+    def close(self):
+        """Unmaps the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,73 @@
+"""
+Streaming maze generation.
+
+Builds a maze one row at a time with Eller's algorithm and hands each
+finished row out as soon as it is decided. Only the current row's set state
+is kept, so memory stays O(num_cols) however many rows are produced.
+
+Every row is the packed wall bytes of its cells (see ``maze_logic.grid``),
+identical to the matching slice of ``Maze(..., algorithm="eller")._cells.data``
+built with the same seed.
+"""
+import random
+
+from maze_logic.generators import EllerRows
+from maze_logic.grid import ALL_WALLS, LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+
+
+def iter_maze_rows(num_rows, num_cols, random_seed=None):
+    """
+    Generates a maze row by row.
+
+    Args:
+        num_rows (int): The number of rows to produce.
+        num_cols (int): The number of columns in every row.
+        random_seed (int, optional): Seed for reproducible generation.
+
+    Yields:
+        bytes: The packed wall bytes of one row, top row first.
+    """
+    rows = EllerRows(num_cols, random.Random(random_seed))
+    carried_from_above = ()
+
+    for row_idx in range(num_rows):
+        is_last = row_idx == num_rows - 1
+        joined_right, carried_down = rows.next_row(is_last=is_last)
+
+        row = bytearray([ALL_WALLS]) * num_cols
+        for col_idx in carried_from_above:
+            row[col_idx] &= ~TOP_WALL
+        for col_idx in joined_right:
+            row[col_idx] &= ~RIGHT_WALL
+            row[col_idx + 1] &= ~LEFT_WALL
+        for col_idx in carried_down:
+            row[col_idx] &= ~BOTTOM_WALL
+
+        # Entrance at the top-left cell, exit at the bottom-right cell
+        if row_idx == 0:
+            row[0] &= ~TOP_WALL
+        if is_last:
+            row[num_cols - 1] &= ~BOTTOM_WALL
+
+        carried_from_above = carried_down
+        yield bytes(row)
+
+
+def write_maze_rows(out, num_rows, num_cols, random_seed=None):
+    """
+    Streams a generated maze straight into a binary file-like object.
+
+    Args:
+        out (BinaryIO): Destination, e.g. an open file or ``sys.stdout.buffer``.
+        num_rows (int): The number of rows to produce.
+        num_cols (int): The number of columns in every row.
+        random_seed (int, optional): Seed for reproducible generation.
+
+    Returns:
+        int: The number of rows written.
+    """
+    rows_written = 0
+    for row in iter_maze_rows(num_rows, num_cols, random_seed):
+        out.write(row)
+        rows_written += 1
+    return rows_written
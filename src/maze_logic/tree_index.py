@@ -0,0 +1,159 @@
+"""
+Precomputed path index for perfect mazes.
+
+Every generator in ``maze_logic.generators`` carves a perfect maze: its open
+passages form a spanning tree, so the path between two cells is unique and
+runs through their lowest common ancestor (LCA). ``TreeIndex`` roots that tree
+once and answers any number of distance and path queries without searching.
+
+Ancestor jumps use skew-binary jump pointers: every cell stores its parent,
+its depth and one jump pointer, which keeps memory at three index arrays
+(O(n), unlike O(n log n) binary-lifting tables) while an LCA still takes
+O(log n) steps.
+"""
+from array import array
+
+from maze_logic.grid import index_array, index_typecode
+from maze_logic.solvers import _open_neighbors
+
+
+class TreeIndex:
+    """
+    Answers distance and path queries between any two cells of a perfect maze.
+    """
+
+    def __init__(self, grid, root=0):
+        """
+        Builds the index in O(n) time.
+
+        Args:
+            grid (Grid): The maze walls; the open passages must form a spanning tree.
+            root (int): Flat index of the cell to root the tree at.
+
+        Raises:
+            ValueError: If the maze has loops or unreachable cells.
+        """
+        size = grid.size
+        neighbors = _open_neighbors(grid)
+        parent = index_array(size, -1)
+        depth = index_array(size, -1)
+        jump = index_array(size, -1)
+        parent[root] = jump[root] = root
+        depth[root] = 0
+
+        # Breadth-first order guarantees a parent's jump pointer is set before its children's
+        order = array(index_typecode(size), [root])
+        edges = 0
+        head = 0
+        while head < len(order):
+            current = order[head]
+            head += 1
+            up = jump[current]
+            # Skew-binary rule: jump twice as far when the parent's two jumps are equally long
+            if depth[current] - depth[up] == depth[up] - depth[jump[up]]:
+                child_jump = jump[up]
+            else:
+                child_jump = current
+            for next_cell in neighbors(current):
+                edges += 1
+                if depth[next_cell] < 0:
+                    parent[next_cell] = current
+                    depth[next_cell] = depth[current] + 1
+                    jump[next_cell] = child_jump
+                    order.append(next_cell)
+
+        # Every passage is seen from both ends
+        if len(order) != size or edges // 2 != size - 1:
+            raise ValueError("TreeIndex requires a perfect maze (no loops, every cell reachable)")
+
+        self.grid = grid
+        self.root = root
+        self.parent = parent
+        self.depth = depth
+        self._jump = jump
+
+    def lca(self, index_a, index_b):
+        """
+        Returns the lowest common ancestor of two cells, in O(log n) steps.
+
+        Args:
+            index_a (int): Flat index of the first cell.
+            index_b (int): Flat index of the second cell.
+        """
+        parent, depth, jump = self.parent, self.depth, self._jump
+        if depth[index_a] < depth[index_b]:
+            index_a, index_b = index_b, index_a
+        target = depth[index_b]
+        while depth[index_a] > target:
+            up = jump[index_a]
+            index_a = up if depth[up] >= target else parent[index_a]
+        # Cells at equal depth have jump pointers of equal length
+        while index_a != index_b:
+            if jump[index_a] != jump[index_b]:
+                index_a, index_b = jump[index_a], jump[index_b]
+            else:
+                index_a, index_b = parent[index_a], parent[index_b]
+        return index_a
+
+    def distance(self, index_a, index_b):
+        """
+        Returns the number of steps between two cells, in O(log n).
+
+        Args:
+            index_a (int): Flat index of the first cell.
+            index_b (int): Flat index of the second cell.
+        """
+        depth = self.depth
+        return depth[index_a] + depth[index_b] - 2 * depth[self.lca(index_a, index_b)]
+
+    def path(self, start, goal):
+        """
+        Returns the unique path between two cells, in O(log n + length).
+
+        Args:
+            start (int): Flat index of the start cell.
+            goal (int): Flat index of the goal cell.
+
+        Returns:
+            array: The path as flat cell indices from start to goal, like the solvers return.
+        """
+        parent = self.parent
+        meet = self.lca(start, goal)
+        path = array(index_typecode(self.grid.size), [start])
+        while path[-1] != meet:
+            path.append(parent[path[-1]])
+        tail = array(path.typecode)
+        cell = goal
+        while cell != meet:
+            tail.append(cell)
+            cell = parent[cell]
+        tail.reverse()
+        path.extend(tail)
+        return path
+
+    def distances(self, pairs):
+        """
+        Answers a batch of distance queries.
+
+        Args:
+            pairs (iterable): (start, goal) flat index pairs.
+
+        Returns:
+            array: One distance per pair, in order.
+        """
+        distance = self.distance
+        return array(index_typecode(self.grid.size), [distance(a, b) for a, b in pairs])
+
+    def paths(self, pairs):
+        """
+        Answers a batch of path queries lazily, one path per (start, goal) pair.
+
+        Args:
+            pairs (iterable): (start, goal) flat index pairs.
+
+        Yields:
+            array: The path for each pair, in order.
+        """
+        path = self.path
+        for start, goal in pairs:
+            yield path(start, goal)
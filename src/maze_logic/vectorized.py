@@ -0,0 +1,170 @@
+"""
+Optional NumPy fast paths.
+
+Binary tree and sidewinder decide every cell independently of its row (or
+within its row), so their walls can be produced with whole-array operations
+instead of cell-by-cell Python loops. Distance fields are computed by
+expanding the whole BFS frontier at once.
+
+Wall arrays are ``(num_rows, num_cols)`` ``uint8`` arrays using the bit layout
+of ``maze_logic.grid`` with the entrance and exit already open, so they can be
+handed straight to ``Maze(..., walls=array)``.
+
+NumPy is not required by the rest of the package; calling anything here
+without it installed raises ``ImportError``.
+"""
+from maze_logic.grid import ALL_WALLS, LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover - exercised only without NumPy
+    np = None
+
+
+def require_numpy(feature="maze_logic.vectorized"):
+    """
+    Raises ImportError if NumPy is unavailable.
+
+    Args:
+        feature (str): What needs NumPy, named in the error message.
+    """
+    if np is None:
+        raise ImportError(f"{feature} requires numpy (pip install numpy)")
+
+
+def _empty_walls(num_rows, num_cols):
+    """Returns a wall array with every wall up."""
+    return np.full((num_rows, num_cols), ALL_WALLS, dtype=np.uint8)
+
+
+def _open_up(walls, carve_up):
+    """Removes the top wall of every marked cell and the bottom wall above it."""
+    walls[carve_up] &= ~TOP_WALL & 0xFF
+    walls[:-1][carve_up[1:]] &= ~BOTTOM_WALL & 0xFF
+
+
+def _open_left(walls, carve_left):
+    """Removes the left wall of every marked cell and the right wall beside it."""
+    walls[carve_left] &= ~LEFT_WALL & 0xFF
+    walls[:, :-1][carve_left[:, 1:]] &= ~RIGHT_WALL & 0xFF
+
+
+def _open_entrance_and_exit(walls):
+    """Opens the top of the top-left cell and the bottom of the bottom-right cell."""
+    walls[0, 0] &= ~TOP_WALL & 0xFF
+    walls[-1, -1] &= ~BOTTOM_WALL & 0xFF
+    return walls
+
+
+def as_wall_array(grid):
+    """
+    Returns a zero-copy ``(num_rows, num_cols)`` NumPy view of a Grid's cell bytes.
+    Writes through the view change the grid.
+    """
+    require_numpy()
+    return np.frombuffer(grid.data, dtype=np.uint8).reshape(grid.num_rows, grid.num_cols)
+
+
+def binary_tree_walls(num_rows, num_cols, random_seed=None):
+    """
+    Generates a binary tree maze with whole-array operations.
+
+    Args:
+        num_rows (int): The number of rows in the maze.
+        num_cols (int): The number of columns in the maze.
+        random_seed (int, optional): Seed for ``numpy.random.default_rng``.
+
+    Returns:
+        numpy.ndarray: The packed walls, shape (num_rows, num_cols), dtype uint8.
+    """
+    require_numpy()
+    rng = np.random.default_rng(random_seed)
+    walls = _empty_walls(num_rows, num_cols)
+
+    carve_up = rng.random((num_rows, num_cols)) < 0.5
+    carve_up[:, 0] = True # The left column can only go up
+    carve_up[0, :] = False # The top row can only go left
+    carve_left = ~carve_up
+    carve_left[0, 0] = False # The top-left cell is the root of the tree
+
+    _open_up(walls, carve_up)
+    _open_left(walls, carve_left)
+    return _open_entrance_and_exit(walls)
+
+
+def sidewinder_walls(num_rows, num_cols, random_seed=None):
+    """
+    Generates a sidewinder maze with whole-array operations.
+
+    Args:
+        num_rows (int): The number of rows in the maze.
+        num_cols (int): The number of columns in the maze.
+        random_seed (int, optional): Seed for ``numpy.random.default_rng``.
+
+    Returns:
+        numpy.ndarray: The packed walls, shape (num_rows, num_cols), dtype uint8.
+    """
+    require_numpy()
+    rng = np.random.default_rng(random_seed)
+    walls = _empty_walls(num_rows, num_cols)
+
+    # Which cells open their right wall; the top row is a single corridor
+    carve_right = rng.random((num_rows, num_cols)) < 0.5
+    carve_right[0, :] = True
+    carve_right[:, -1] = False
+
+    # Every run below the top row opens upward from one random member
+    carve_up = np.zeros((num_rows, num_cols), dtype=bool)
+    if num_rows > 1:
+        lower = carve_right[1:]
+        run_start = np.ones_like(lower)
+        run_start[:, 1:] = ~lower[:, :-1]
+        starts = np.flatnonzero(run_start)
+        ends = np.flatnonzero(~lower) # Runs end where a cell does not open right
+        offsets = np.floor(rng.random(starts.size) * (ends - starts + 1)).astype(np.intp)
+        carve_up.reshape(-1)[num_cols + starts + offsets] = True
+
+    _open_left(walls, np.pad(carve_right[:, :-1], ((0, 0), (1, 0))))
+    _open_up(walls, carve_up)
+    return _open_entrance_and_exit(walls)
+
+
+def distance_field(walls, start=(0, 0)):
+    """
+    Computes the distance, in steps, from a start cell to every cell.
+    The whole BFS frontier is expanded with array operations each step, so
+    the cost per step is proportional to the frontier, not to the grid.
+
+    Args:
+        walls (numpy.ndarray or Grid): Packed walls, shape (num_rows, num_cols).
+        start (tuple): (row, col) of the cell distances are measured from.
+
+    Returns:
+        numpy.ndarray: int32 distances with the walls' shape; -1 marks unreachable cells.
+    """
+    require_numpy()
+    if not isinstance(walls, np.ndarray):
+        walls = as_wall_array(walls)
+    num_rows, num_cols = walls.shape
+    flat_walls = walls.reshape(-1)
+    size = flat_walls.size
+
+    distances = np.full(size, -1, dtype=np.int32)
+    frontier = np.array([start[0] * num_cols + start[1]], dtype=np.intp)
+    distances[frontier] = 0
+
+    step = 0
+    while frontier.size:
+        step += 1
+        cell_walls = flat_walls[frontier]
+        cols = frontier % num_cols
+        candidates = np.concatenate((
+            frontier[((cell_walls & RIGHT_WALL) == 0) & (cols < num_cols - 1)] + 1,
+            frontier[((cell_walls & LEFT_WALL) == 0) & (cols > 0)] - 1,
+            frontier[((cell_walls & BOTTOM_WALL) == 0) & (frontier < size - num_cols)] + num_cols,
+            frontier[((cell_walls & TOP_WALL) == 0) & (frontier >= num_cols)] - num_cols,
+        ))
+        frontier = np.unique(candidates[distances[candidates] < 0])
+        distances[frontier] = step
+
+    return distances.reshape(num_rows, num_cols)
@@ -1,5 +1,94 @@
+import asyncio
+from concurrent.futures import Executor, Future
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
 import unittest
+import zlib
 from src.maze_logic.maze import Maze
+from src.maze_logic.grid import Grid, RIGHT_WALL, LEFT_WALL, TOP_WALL, BOTTOM_WALL
+from src.maze_logic.generators import GENERATORS
+from src.maze_logic.stream import iter_maze_rows, write_maze_rows
+from src.maze_logic.solvers import SOLVERS
+from src.maze_logic import vectorized
+from src.maze_logic.batch import generate_batch
+from src.gui.renderer import MazeRenderer
+from src.gui.animation import AnimationScheduler
+from src.maze_logic.tree_index import TreeIndex
+from src.gui.viewport import PATH_SHADE, ViewportRenderer
+from src.maze_logic.__main__ import main as cli_main
+from src.maze_logic.service import MazeService, MazeClient
+from src.maze_logic import disk_cache
+from src.maze_logic.disk_cache import MazeCache
+from src.maze_logic.export import export_image, iter_pixel_rows, PATH, WALL
+from src.maze_logic.chunked import ChunkedGrid
+from src.maze_logic.incremental import DistanceField
+from src.maze_logic.instrumentation import Instrumentation, MazeObserver
+from src.maze_logic.hierarchical import TileGraph
+from src.maze_logic.events import EventLog, events_path, CARVE, BUILD
+from src.gui.player import EventPlayer
+from src.maze_logic import analysis
+
+
+class ManualRoot:
+    """Stands in for Tk's after() timer; frames run only when fire() is called."""
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def after(self, delay_ms, callback):
+        self.callbacks[len(self.callbacks) + 1] = callback
+        return len(self.callbacks)
+
+    def after_cancel(self, timer_id):
+        del self.callbacks[timer_id]
+
+    def fire(self):
+        timer_id, callback = self.callbacks.popitem()
+        callback()
+
+
+class RecordingWindow:
+    """Stands in for Window, counting canvas calls instead of drawing."""
+    width, height = 800, 600
+
+    def __init__(self):
+        self.lines = {}
+        self.recolors = 0
+        self.images = []
+
+    def create_line(self, x1, y1, x2, y2, fill_color="black", tag=None):
+        self.lines[len(self.lines) + 1] = fill_color
+        return len(self.lines)
+
+    def create_image(self, x, y, data, tag):
+        self.images.append(data)
+
+    def delete_tagged(self, tag):
+        self.lines.clear()
+        self.images.clear()
+
+    def recolor_line(self, item_id, fill_color):
+        self.lines[item_id] = fill_color
+        self.recolors += 1
+
+    def after_idle(self, callback):
+        pass # Tests redraw explicitly
+
+
+def count_passages(grid):
+    """Counts the interior passages of a grid (each opened wall pair once)."""
+    passages = 0
+    for index in range(grid.size):
+        row_idx, col_idx = grid.coords(index)
+        if col_idx < grid.num_cols - 1 and not grid.walls_at(index) & RIGHT_WALL:
+            passages += 1
+        if row_idx < grid.num_rows - 1 and not grid.walls_at(index) & BOTTOM_WALL:
+            passages += 1
+    return passages
 
 
 class Tests(unittest.TestCase):
@@ -24,5 +113,637 @@ class Tests(unittest.TestCase):
             False,
         )
 
+    def test_grid_connect_and_reset_visited(self):
+        grid = Grid(3, 4)
+        grid.connect(grid.index(1, 1), grid.index(1, 2))
+        self.assertFalse(grid.has_wall(1, 1, RIGHT_WALL))
+        self.assertFalse(grid.has_wall(1, 2, LEFT_WALL))
+        self.assertTrue(grid[1][1].has_top_wall)
+        grid[2][3].visited = True
+        self.assertTrue(grid.is_visited(grid.index(2, 3)))
+        grid.reset_visited()
+        self.assertFalse(grid[2][3].visited)
+        self.assertFalse(grid[1][2].has_left_wall)
+
+        # In a single column, cells one index apart are vertical neighbors
+        column = Grid(4, 1)
+        column.connect(1, 2)
+        self.assertEqual((column.walls_at(1), column.walls_at(2)),
+                         (LEFT_WALL | RIGHT_WALL | TOP_WALL, LEFT_WALL | RIGHT_WALL | BOTTOM_WALL))
+        column.disconnect(2, 1)
+        self.assertEqual(column.walls_at(1), LEFT_WALL | RIGHT_WALL | TOP_WALL | BOTTOM_WALL)
+        row = Grid(1, 4)
+        row.connect(2, 1)
+        self.assertFalse(row.has_wall(0, 1, RIGHT_WALL) or row.has_wall(0, 2, LEFT_WALL))
+
+    def test_maze_cells_visited_reset_after_generation(self):
+        m1 = Maze(0, 0, 8, 9, 10, 10, None, True, random_seed=3)
+        self.assertFalse(any(cell.visited for row in m1._cells for cell in row))
+
+    def test_every_generator_builds_a_spanning_tree(self):
+        for algorithm in GENERATORS:
+            for num_rows, num_cols in ((1, 1), (1, 6), (6, 1), (11, 13)):
+                m1 = Maze(0, 0, num_rows, num_cols, 10, 10, None, True,
+                          random_seed=5, algorithm=algorithm)
+                # A spanning tree over the grid has exactly cells - 1 passages and
+                # reaches every cell; together they rule out loops and islands
+                self.assertEqual(count_passages(m1._cells), num_rows * num_cols - 1)
+                self.assertTrue(analysis.analyze(m1._cells).is_perfect, (algorithm, num_rows, num_cols))
+
+    def test_dfs_generation_does_not_recurse(self):
+        m1 = Maze(0, 0, 1, 5000, 10, 10, None, True, random_seed=1)
+        self.assertEqual(count_passages(m1._cells), 4999)
+
+    def test_unknown_algorithm_raises(self):
+        with self.assertRaises(ValueError):
+            Maze(0, 0, 3, 3, 10, 10, None, True, algorithm="nope")
+
+    def test_streamed_rows_match_batch_build(self):
+        num_rows, num_cols = 17, 9
+        m1 = Maze(0, 0, num_rows, num_cols, 10, 10, None, True,
+                  random_seed=11, algorithm="eller")
+        out = io.BytesIO()
+        self.assertEqual(write_maze_rows(out, num_rows, num_cols, random_seed=11), num_rows)
+        self.assertEqual(out.getvalue(), bytes(m1._cells.data))
+        self.assertEqual(
+            b"".join(iter_maze_rows(num_rows, num_cols, random_seed=11)), out.getvalue()
+        )
+
+    def test_solvers_agree_on_shortest_path_in_braided_maze(self):
+        m1 = Maze(0, 0, 12, 12, 10, 10, None, True, random_seed=2)
+        grid = m1._cells
+        # Open extra walls so the maze has loops and several routes
+        for index in range(0, grid.size - grid.num_cols, 7):
+            grid.connect(index, index + grid.num_cols)
+        shortest = len(m1.solve_maze("bfs"))
+        self.assertEqual(len(m1.solve_maze("astar")), shortest)
+        self.assertEqual(len(m1.solve_maze("bidirectional")), shortest)
+        self.assertGreaterEqual(len(m1.solve_maze("dfs")), shortest)
+
+    def test_solve_between_arbitrary_cells(self):
+        m1 = Maze(0, 0, 9, 14, 10, 10, None, True, random_seed=4, algorithm="prim")
+        for strategy in SOLVERS:
+            path = m1.solve_maze(strategy, start=(8, 0), goal=(0, 13))
+            self.assertEqual(m1._cells.coords(path[0]), (8, 0))
+            self.assertEqual(m1._cells.coords(path[-1]), (0, 13))
+            for from_index, to_index in zip(path, path[1:]):
+                self.assertIn(abs(from_index - to_index), (1, 14))
+        with self.assertRaises(ValueError):
+            m1.solve_maze("nope")
+        for start, goal in (((0, 14), None), (None, (9, 0)), ((-1, 0), None), (None, (0,)), ("ab", None)):
+            with self.assertRaises(ValueError): # Out-of-range columns must not wrap into the next row
+                m1.solve_maze("bfs", start=start, goal=goal)
+
+    def test_maze_loads_prebuilt_walls(self):
+        m1 = Maze(0, 0, 6, 7, 10, 10, None, True, random_seed=8, algorithm="kruskal")
+        m2 = Maze(0, 0, 6, 7, 10, 10, None, True, walls=m1._cells.data)
+        self.assertEqual(m2._cells.data, m1._cells.data)
+        self.assertEqual(list(m2.solve_maze("bfs")), list(m1.solve_maze("bfs")))
+
+    @unittest.skipIf(vectorized.np is None, "numpy is not installed")
+    def test_vectorized_walls_and_distance_field(self):
+        for build in (vectorized.binary_tree_walls, vectorized.sidewinder_walls):
+            walls = build(15, 18, random_seed=3)
+            m1 = Maze(0, 0, 15, 18, 10, 10, None, True, walls=walls)
+            self.assertEqual(count_passages(m1._cells), 15 * 18 - 1)
+            distances = vectorized.distance_field(walls)
+            self.assertEqual(distances[-1, -1], len(m1.solve_maze("bfs")) - 1)
+            self.assertTrue((distances >= 0).all())
+
+    def test_seeding_a_maze_leaves_global_random_untouched(self):
+        random.seed(99)
+        expected = random.random()
+        random.seed(99)
+        Maze(0, 0, 5, 5, 10, 10, None, True, random_seed=1)
+        self.assertEqual(random.random(), expected)
+
+    def test_batch_is_identical_for_any_worker_count(self):
+        serial = list(generate_batch(6, 7, 8, base_seed=3, max_workers=1))
+        parallel = list(generate_batch(6, 7, 8, base_seed=3, max_workers=2))
+        self.assertEqual(parallel, serial)
+        unordered = generate_batch(6, 7, 8, base_seed=3, max_workers=2, ordered=False)
+        self.assertEqual(sorted(unordered), serial)
+        self.assertEqual(len({walls for _, _, walls in serial}), 6)
+
+    def test_save_and_load_round_trip(self):
+        m1 = Maze(0, 0, 13, 7, 10, 10, None, True, random_seed=21, algorithm="wilson")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.bin")
+            m1.save(path)
+            # 2 bits per cell after the header
+            self.assertLessEqual(os.path.getsize(path), 64 + (13 * 7 + 3) // 4)
+
+            m2 = Maze.load(path, is_test_mode=True, lazy=False)
+            self.assertEqual(m2._cells.data, m1._cells.data)
+            self.assertEqual(m2._random_seed, 21)
+
+            with Maze.load(path, is_test_mode=True) as m3:
+                for index in range(m1._cells.size):
+                    self.assertEqual(m3._cells.walls_at(index), m1._cells.walls_at(index))
+                self.assertEqual(list(m3.solve_maze("bfs")), list(m1.solve_maze("bfs")))
+
+            # Truncated and foreign files are rejected up front, however they are opened
+            with open(path, "rb") as source:
+                data = source.read()
+            for broken in (data[:-1], b"JUNK" + data[4:]):
+                with open(path, "wb") as out:
+                    out.write(broken)
+                for lazy in (True, False):
+                    with self.assertRaises(ValueError):
+                        Maze.load(path, is_test_mode=True, lazy=lazy)
+
+    def test_save_keeps_border_wall_edits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.bin")
+            for num_rows, num_cols in ((7, 9), (1, 5), (6, 1)):
+                m1 = Maze(0, 0, num_rows, num_cols, 10, 10, None, True, random_seed=4)
+                m1.open_wall(num_rows - 1, 0, LEFT_WALL)
+                m1.open_wall(0, num_cols - 1, TOP_WALL)
+                m1.close_wall(0, 0, TOP_WALL) # The entrance
+                m1.open_wall(0, num_cols - 1, RIGHT_WALL)
+                m1.save(path)
+                with Maze.load(path, is_test_mode=True) as lazy:
+                    self.assertEqual([lazy.grid.walls_at(index) for index in range(lazy.grid.size)],
+                                     [m1.grid.walls_at(index) for index in range(m1.grid.size)])
+                eager = Maze.load(path, is_test_mode=True, lazy=False)
+                self.assertEqual(eager.grid.data, m1.grid.data)
+
+    def test_save_keeps_seed_type(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.bin")
+            for seed in ("maze-of-the-day", "x" * 300, 10 ** 400, b"\x00\xff", None):
+                Maze(0, 0, 4, 5, 10, 10, None, True, random_seed=seed).save(path)
+                with Maze.load(path, is_test_mode=True) as loaded:
+                    self.assertEqual(loaded._random_seed, seed)
+            with self.assertRaises(ValueError):
+                Maze(0, 0, 4, 5, 10, 10, None, True, random_seed=1.5).save(path)
+
+    def test_renderer_item_count_is_linear_in_cells(self):
+        num_rows, num_cols = 20, 20
+        window = RecordingWindow()
+        renderer = MazeRenderer(window, 0, 0, 10, 10, num_rows, num_cols)
+        renderer.draw_grid(Grid(num_rows, num_cols))
+        # A closed grid is one merged line per grid line
+        self.assertEqual(len(window.lines), (num_rows + 1) + (num_cols + 1))
+
+        m1 = Maze(0, 0, num_rows, num_cols, 10, 10, None, True, random_seed=6)
+        for _ in range(3): # Repeated redraws must not add items
+            for index in range(m1._cells.size):
+                renderer.update_cell(*m1._cells.coords(index), m1._cells.walls_at(index))
+        path = m1.solve_maze("bfs")
+        for from_index, to_index in zip(path, path[1:]):
+            renderer.draw_move(m1._cells.coords(from_index), m1._cells.coords(to_index))
+            renderer.draw_move(m1._cells.coords(to_index), m1._cells.coords(from_index), undo=True)
+        self.assertLessEqual(len(window.lines), 2 * num_rows * num_cols + num_rows + num_cols + 2)
+
+    def test_animation_scheduler_budgets_steps_per_frame(self):
+        root = ManualRoot()
+        scheduler = AnimationScheduler(root, steps_per_frame=3)
+        applied = []
+        for step in range(8):
+            scheduler.queue(lambda step=step: applied.append(step))
+        self.assertEqual(len(root.callbacks), 1) # One frame pending, nothing drawn yet
+        root.fire()
+        self.assertEqual(applied, [0, 1, 2])
+
+        scheduler.pause()
+        self.assertEqual(root.callbacks, {})
+        scheduler.set_speed(1)
+        scheduler.resume()
+        root.fire()
+        self.assertEqual(applied, [0, 1, 2, 3])
+
+        scheduler.skip_to_end()
+        self.assertEqual(applied, list(range(8)))
+        self.assertEqual(scheduler.pending, 0)
+        self.assertEqual(root.callbacks, {})
+
+    def test_instrumentation_collects_phases_and_counters(self):
+        events = []
+
+        class Recorder(MazeObserver):
+            def on_run_complete(self, maze, run, stats):
+                events.append(run)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            instrumentation = Instrumentation([Recorder()], profile_dir=tmp)
+            m1 = Maze(0, 0, 9, 11, 10, 10, None, True, random_seed=4, instrumentation=instrumentation)
+            m1.solve_maze("bfs")
+            self.assertEqual(len(os.listdir(tmp)), 2) # One profile per run
+        stats = m1.stats
+        self.assertEqual(events, ["generate", "solve"])
+        self.assertIn("break_walls", stats.phase_seconds)
+        self.assertIn("solve", stats.phase_seconds)
+        self.assertEqual(stats.walls_broken, 9 * 11 - 1) # Spanning tree
+        self.assertGreater(stats.backtracks, 0)
+        self.assertIsNone(Maze(0, 0, 3, 3, 10, 10, None, True).stats)
+
+    def test_tree_index_matches_solver_paths(self):
+        rng = random.Random(8)
+        for algorithm in ("dfs", "wilson", "binary_tree"):
+            m1 = Maze(0, 0, 17, 23, 10, 10, None, True, random_seed=5, algorithm=algorithm)
+            index = m1.tree_index()
+            pairs = [(rng.randrange(17 * 23), rng.randrange(17 * 23)) for _ in range(50)]
+            expected = [SOLVERS["bfs"](m1._cells, a, b) for a, b in pairs]
+            self.assertEqual([list(p) for p in index.paths(pairs)], [list(p) for p in expected])
+            self.assertEqual(list(index.distances(pairs)), [len(p) - 1 for p in expected])
+
+        braided = Maze(0, 0, 5, 5, 10, 10, None, True, random_seed=1)
+        for index in (0, 1, 5):
+            braided._cells.connect(index, index + 1)
+            braided._cells.connect(index, index + 5) # Opens a loop around cells 0, 1, 5, 6
+        with self.assertRaises(ValueError):
+            TreeIndex(braided._cells)
+
+    def test_tile_graph_matches_bfs(self):
+        rng = random.Random(4)
+        m1 = Maze(0, 0, 30, 41, 10, 10, None, True, random_seed=6, algorithm="kruskal")
+        for _ in range(60):
+            m1.open_wall(rng.randrange(30), rng.randrange(41), rng.choice((RIGHT_WALL, BOTTOM_WALL)))
+        pairs = [(rng.randrange(30 * 41), rng.randrange(30 * 41)) for _ in range(40)]
+        for tile_size in (1, 8, 64):
+            graph = m1.tile_graph(tile_size, max_workers=1)
+            for a, b in pairs:
+                expected = SOLVERS["bfs"](m1._cells, a, b)
+                path = graph.path(a, b)
+                self.assertEqual(len(path), len(expected))
+                self.assertEqual((path[0], path[-1]), (a, b))
+                self.assertEqual(graph.distance(a, b), len(expected) - 1)
+        pooled = TileGraph(m1._cells, 8, max_workers=2)
+        self.assertEqual([list(pooled.path(a, b)) for a, b in pairs],
+                         [list(m1.tile_graph(8).path(a, b)) for a, b in pairs])
+
+    def test_event_log_replays_and_seeks(self):
+        m1 = Maze(0, 0, 12, 15, 10, 10, None, True, random_seed=3, record_events=True)
+        carves = len(m1.events)
+        self.assertEqual(carves, 12 * 15 - 1) # One carve per spanning-tree edge
+        m1.solve_maze("dfs")
+        m1.open_wall(5, 5, RIGHT_WALL)
+        self.assertNotEqual(m1.events[carves][0], CARVE) # Solver moves follow the carves
+        self.assertEqual(m1.events[len(m1.events) - 1][:2], (CARVE, 5 * 15 + 5))
+        # Border edits are logged against the cell alone
+        m1.close_wall(0, 0, TOP_WALL)
+        m1.open_wall(3, 0, LEFT_WALL)
+        self.assertEqual(m1.events[len(m1.events) - 2], (BUILD, 0, TOP_WALL))
+        self.assertEqual(m1.events[len(m1.events) - 1], (CARVE, 3 * 15, LEFT_WALL))
+
+        def shown_walls(renderer):
+            return [(renderer._horizontal_shown[index], renderer._vertical_shown[index // 15 * 16 + index % 15])
+                    for index in range(12 * 15)]
+
+        def expected_walls(grid):
+            return [(int(bool(grid.walls_at(index) & TOP_WALL)), int(bool(grid.walls_at(index) & LEFT_WALL)))
+                    for index in range(12 * 15)]
+
+        window, root = RecordingWindow(), ManualRoot()
+        renderer = MazeRenderer(window, 0, 0, 10, 10, 12, 15)
+        renderer.draw_grid(Grid(12, 15))
+        draws = []
+        player = EventPlayer(m1.events, renderer, root, steps_per_frame=50, on_draw=draws.append)
+        player.play()
+        root.fire()
+        self.assertEqual(player.position, 50)
+        self.assertEqual((player.frames, len(draws)), (1, 1))
+        player.skip_to_end()
+        self.assertEqual(shown_walls(renderer), expected_walls(m1._cells))
+        self.assertIn("grey", window.lines.values())
+        player.seek(carves) # Generated, not yet solved
+        self.assertNotIn("grey", window.lines.values())
+        player.seek(0)
+        self.assertEqual(shown_walls(renderer), expected_walls(player._grid))
+        self.assertEqual(sum(wall for pair in shown_walls(renderer) for wall in pair), 12 * 15 * 2 - 1)
+
+        # A maze built from walls= logs only its edits, so playback starts at the prebuilt walls
+        prebuilt = Maze(0, 0, 12, 15, 10, 10, None, True, random_seed=8)
+        m3 = Maze(0, 0, 12, 15, 10, 10, None, True, walls=prebuilt.grid.data, record_events=True)
+        window, root = RecordingWindow(), ManualRoot()
+        renderer = MazeRenderer(window, 0, 0, 10, 10, 12, 15)
+        renderer.draw_grid(m3.grid)
+        player = EventPlayer(m3.events, renderer, root, position=len(m3.events), walls=m3.grid.data)
+        m3.open_wall(6, 7, RIGHT_WALL if m3.grid.has_wall(6, 7, RIGHT_WALL) else BOTTOM_WALL)
+        m3.close_wall(0, 4, TOP_WALL)
+        player.skip_to_end()
+        self.assertEqual(shown_walls(renderer), expected_walls(m3._cells))
+        player.seek(0)
+        self.assertEqual(shown_walls(renderer), expected_walls(prebuilt.grid))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "m.maze")
+            m1.save(path)
+            self.assertTrue(os.path.exists(events_path(path)))
+            m2 = Maze.load(path, is_test_mode=True)
+            self.assertEqual(list(m2.events.records), list(m1.events.records))
+            m2._cells.close()
+            EventLog(12, 14).save(events_path(path))
+            with self.assertRaises(ValueError): # Log of another maze size
+                Maze.load(path, is_test_mode=True)
+            with open(events_path(path), "r+b") as out:
+                out.write(b"JUNK")
+            with self.assertRaises(ValueError):
+                EventLog.load(events_path(path))
+        with self.assertRaises(ValueError):
+            Maze(0, 0, 12, 15, 10, 10, None, True, events=EventLog(15, 12))
+
+    def test_analysis_validates_batches(self):
+        batch = list(generate_batch(12, 9, 13, base_seed=5, max_workers=1))
+        records = list(analysis.analyze_batch(batch, 9, 13, chunk_size=5))
+        self.assertEqual([record["index"] for record in records], list(range(12)))
+        for record, (_, _, walls) in zip(records, batch):
+            self.assertTrue(record["is_perfect"])
+            self.assertEqual(record["cycles"], 0)
+            self.assertEqual(sum(length * count for length, count in record["corridor_lengths"].items()),
+                             9 * 13 - 1) # Every passage lies in exactly one corridor
+            self.assertEqual(record["solution_length"], len(SOLVERS["bfs"](Grid(9, 13, walls), 0, 9 * 13 - 1)))
+
+        braided = Grid(9, 13, batch[0][2])
+        braided.connect(0, 1 if braided.has_wall(0, 0, RIGHT_WALL) else 13)
+        broken = Grid(9, 13, batch[1][2])
+        broken.set_wall(4, 4, RIGHT_WALL, not broken.has_wall(4, 4, RIGHT_WALL)) # One side only
+        closed = Grid(9, 13)
+        reports = [analysis.analyze(grid) for grid in (braided, broken, closed)]
+        self.assertEqual(reports[0].cycles, 1)
+        self.assertFalse(reports[1].walls_consistent)
+        self.assertEqual((reports[2].components, reports[2].entrance_open, reports[2].solution_length),
+                         (9 * 13, False, 0))
+        self.assertFalse(any(report.is_perfect for report in reports))
+
+        numpy = analysis.np # Both backends must agree
+        try:
+            analysis.np = None
+            plain = [analysis.analyze(grid).to_dict() for grid in (braided, broken, closed)]
+        finally:
+            analysis.np = numpy
+        self.assertEqual(plain, [report.to_dict() for report in reports])
+
+    def test_search_field_serves_many_goals(self):
+        m1 = Maze(0, 0, 11, 14, 10, 10, None, True, random_seed=12, algorithm="prim")
+        goals = [(10, 13), (0, 13), (5, 7), (0, 0)]
+        paths = m1.solve_many(goals)
+        for goal, path in zip(goals, paths):
+            self.assertEqual(list(path), list(SOLVERS["bfs"](m1._cells, 0, m1._cells.index(*goal))))
+        self.assertIs(m1.search_field(), m1.search_field([(0, 0)])) # Cached, not searched again
+
+        targets = [(3, 3), (9, 1), (2, 12)]
+        field = m1.search_field(targets)
+        target_cells = [m1._cells.index(*target) for target in targets]
+        for index in range(m1._cells.size):
+            nearest = min(len(SOLVERS["bfs"](m1._cells, index, target)) - 1 for target in target_cells)
+            self.assertEqual(field.distance(index), nearest)
+            path = field.path_from(index)
+            self.assertEqual((path[0], len(path) - 1), (index, nearest))
+            self.assertIn(path[-1], target_cells)
+            self.assertEqual(field.nearest_target(index), path[-1])
+
+        m1.open_wall(5, 5, RIGHT_WALL)
+        m1.close_wall(0, 0, RIGHT_WALL)
+        self.assertIsNot(m1.search_field(targets), field) # Wall edits drop cached fields
+        for bad in ([(11, 0)], [(0, -1)], [(0,)], []):
+            with self.assertRaises(ValueError):
+                m1.search_field(bad)
+        with self.assertRaises(ValueError):
+            m1.solve_many([(0, 14)])
+        self.assertEqual([len(path) for path in m1.solve_many(goals)],
+                         [len(SOLVERS["bfs"](m1._cells, 0, m1._cells.index(*goal))) for goal in goals])
+
+    def test_wall_edits_repair_distance_field(self):
+        rng = random.Random(3)
+        m1 = Maze(0, 0, 10, 12, 10, 10, None, True, random_seed=9)
+        field = m1.distance_field()
+        version = m1.walls_version
+        for _ in range(80):
+            edit = m1.open_wall if rng.random() < 0.5 else m1.close_wall
+            edit(rng.randrange(10), rng.randrange(12),
+                 rng.choice((LEFT_WALL, RIGHT_WALL, TOP_WALL, BOTTOM_WALL)))
+            fresh = DistanceField(m1._cells, field.target)
+            self.assertEqual(list(field._distance), list(fresh._distance))
+            self.assertEqual(len(m1.solution()), len(SOLVERS["bfs"](m1._cells, 0, field.target)))
+        self.assertGreater(m1.walls_version, version)
+
+    def test_chunked_grid_is_one_perfect_maze(self):
+        chunked = ChunkedGrid(30, 45, chunk_size=8, random_seed=2, algorithm="kruskal")
+        flat = Grid(30, 45, bytes(chunked.walls_at(index) for index in range(chunked.size)))
+        TreeIndex(flat) # Raises unless the chunks join into one spanning tree
+        self.assertEqual(count_passages(flat), 30 * 45 - 1)
+        self.assertEqual(chunked.walls(9, 17), flat.walls(9, 17))
+        self.assertEqual(list(SOLVERS["bfs"](chunked, 0, chunked.size - 1)),
+                         list(SOLVERS["bfs"](flat, 0, flat.size - 1)))
+
+        # Evicted chunks come back identical
+        tiny = ChunkedGrid(30, 45, chunk_size=8, random_seed=2, algorithm="kruskal", max_bytes=500)
+        for index in reversed(range(tiny.size)):
+            self.assertEqual(tiny.walls_at(index), flat.walls_at(index))
+        self.assertLessEqual(len(tiny._chunks), 6)
+
+        huge = ChunkedGrid(10 ** 6, 10 ** 6, random_seed=1)
+        path = SOLVERS["astar"](huge, huge.index(10 ** 5, 10 ** 5), huge.index(10 ** 5 + 3, 10 ** 5 + 3))
+        self.assertTrue(path)
+
+    def test_viewport_cost_is_bounded_by_screen(self):
+        window = RecordingWindow()
+        m1 = Maze(0, 0, 400, 500, 10, 10, None, True, random_seed=2)
+        renderer = ViewportRenderer(window, m1.grid)
+        renderer.redraw() # Fitted: far below line detail, so one raster image
+        self.assertEqual(window.lines, {})
+        self.assertEqual(len(window.images), 1)
+        self.assertTrue(window.images[0].startswith(b"P5 800 600 255\n"))
+        self.assertEqual(len(window.images[0]), len(b"P5 800 600 255\n") + 800 * 600)
+
+        renderer.viewport.zoom_at(400, 300, 20) # 16 px per cell
+        renderer.viewport.pan(-1000, -700)
+        renderer.redraw()
+        self.assertEqual(window.images, [])
+        first_row, end_row, first_col, end_col = renderer.viewport.visible_cells()
+        self.assertLessEqual((end_row - first_row) * (end_col - first_col), 52 * 39)
+        self.assertLessEqual(len(window.lines), 2 * 52 * 39 + 52 + 39)
+        self.assertGreater(len(window.lines), 0)
+        self.assertNotIn("red", window.lines.values())
+
+    def test_viewport_draws_solution_path(self):
+        window = RecordingWindow()
+        m1 = Maze(0, 0, 400, 500, 10, 10, None, True, random_seed=2)
+        path = m1.solve_maze("bfs")
+        renderer = ViewportRenderer(window, m1.grid)
+        renderer.show_path(path)
+        renderer.redraw()
+        self.assertIn(bytes([PATH_SHADE]), window.images[0][len(b"P5 800 600 255\n"):])
+
+        renderer.viewport.zoom_at(0, 0, 20) # Top-left corner, where the path starts
+        renderer.redraw()
+        path_lines = list(window.lines.values()).count("red")
+        self.assertGreater(path_lines, 0)
+        self.assertLess(path_lines, len(path) - 1)
+
+        renderer.show_path(None)
+        renderer.redraw()
+        self.assertNotIn("red", window.lines.values())
+
+    def test_export_png_and_ppm(self):
+        m1 = Maze(0, 0, 6, 9, 10, 10, None, True, random_seed=12)
+        path = m1.solve_maze("bfs")
+        rows = list(iter_pixel_rows(m1.grid, 3, path=path))
+        self.assertEqual((len(rows[0]), len(rows)), (9 * 3 + 1, 6 * 3 + 1))
+        self.assertEqual(rows[0][1], PATH) # The entrance is open and on the path
+        self.assertEqual(rows[-1][1], WALL)
+
+        png = io.BytesIO()
+        self.assertEqual(export_image(m1.grid, png, "png", 3, path=path), (28, 19))
+        data = png.getvalue()
+        self.assertTrue(data.startswith(b"\x89PNG\r\n\x1a\n"))
+        idat, position = b"", 8
+        while position < len(data):
+            length = int.from_bytes(data[position:position + 4], "big")
+            if data[position + 4:position + 8] == b"IDAT":
+                idat += data[position + 8:position + 8 + length]
+            position += 12 + length
+        self.assertEqual(zlib.decompress(idat), b"".join(b"\x00" + row for row in rows))
+
+        ppm = io.BytesIO()
+        distances = [len(SOLVERS["bfs"](m1.grid, 0, index)) - 1 for index in range(m1.grid.size)]
+        export_image(m1.grid, ppm, "ppm", 3, distances=distances)
+        self.assertEqual(len(ppm.getvalue()), len(b"P6 28 19 255\n") + 28 * 19 * 3)
+
+    def test_logic_imports_without_tk_and_cli_runs(self):
+        src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+        check = ("import sys; import maze_logic.maze, maze_logic.cell, maze_logic.export; "
+                 "sys.exit('tkinter' in sys.modules or 'gui' in sys.modules)")
+        subprocess.run([sys.executable, "-c", check], cwd=src, check=True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "maze.txt")
+            self.assertEqual(cli_main(["5", "7", "--seed", "1", "--solver", "astar",
+                                       "--output", output, "--quiet"]), 0)
+            with open(output) as source:
+                lines = source.read().splitlines()
+        self.assertEqual((len(lines), len(lines[0])), (11, 15))
+        self.assertEqual(lines[0][1], ".") # Path starts at the entrance
+
+    def test_service_coalesces_and_caches(self):
+        async def scenario():
+            service = MazeService(max_workers=2, cache_size=2)
+            try:
+                request = {"op": "solve", "rows": 12, "cols": 15, "seed": 4, "solver": "astar"}
+                first, second = await asyncio.gather(service.handle(request), service.handle(request))
+                self.assertEqual(first, second)
+                self.assertGreaterEqual(service.stats["coalesced"], 2) # Walls and the solve itself
+                self.assertEqual((await service.handle(dict(request, op="generate")))["ok"], True)
+                self.assertEqual(service.stats["hits"], 1)
+                failed = await service.handle(dict(request, algorithm="nope", seed=5))
+                self.assertFalse(failed["ok"])
+
+                server = await service.start(port=0)
+                port = server.sockets[0].getsockname()[1]
+
+                def talk():
+                    with MazeClient(port=port) as client:
+                        return client.generate(12, 15, seed=4), client.solve(12, 15, seed=4)
+
+                grid, path = await asyncio.get_running_loop().run_in_executor(None, talk)
+                server.close()
+                await server.wait_closed()
+                return first, grid, path
+            finally:
+                service.close()
+
+        first, grid, path = asyncio.run(scenario())
+        expected = Maze(0, 0, 12, 15, 10, 10, None, True, random_seed=4)
+        self.assertEqual(grid.data, expected.grid.data)
+        self.assertEqual([tuple(cell) for cell in first["path"]],
+                         [expected.grid.coords(index) for index in expected.solve_maze("astar")])
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (11, 14))
+
+    def test_service_rejects_bad_requests_and_keeps_serving(self):
+        class FailingExecutor(Executor):
+            def submit(self, function, *args, **kwargs):
+                future = Future()
+                future.set_exception(RuntimeError("worker died"))
+                return future
+
+        async def scenario():
+            service = MazeService(max_workers=1)
+            try:
+                request = {"op": "solve", "rows": 5, "cols": 5, "seed": 1}
+                for bad in ({"goal": [0, 7]}, {"start": [-1, 0]}, {"start": [0]}, {"goal": "ab"},
+                            {"start": [0.5, 0]}):
+                    response = await service.handle(dict(request, **bad))
+                    self.assertFalse(response["ok"])
+                    self.assertIn("cell", response["error"])
+                self.assertTrue((await service.handle(dict(request, goal=[4, 0])))["ok"])
+                huge = await service.handle(dict(request, rows=1 << 20, cols=1 << 20))
+                self.assertFalse(huge["ok"])
+                self.assertIn("too large", huge["error"])
+
+                crashed = service._executor
+                crashed.submit(os._exit, 1).exception() # Kill the only worker; the pool is now broken
+                response = await service.handle(dict(request, seed=2))
+                self.assertTrue(response["ok"], response)
+                self.assertIsNot(service._executor, crashed)
+            finally:
+                service.close()
+
+            broken = MazeService(executor=FailingExecutor())
+            response = await broken.handle(request)
+            self.assertFalse(response["ok"])
+            self.assertIn("worker died", response["error"])
+
+            server = await broken.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            def talk():
+                with MazeClient(port=port) as client:
+                    for _ in range(2): # The connection survives the first failure
+                        with self.assertRaises(ValueError):
+                            client.generate(5, 5)
+
+            await asyncio.get_running_loop().run_in_executor(None, talk)
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(scenario())
+
+    def test_disk_cache_hits_and_evicts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = MazeCache(tmp)
+            m1 = Maze(0, 0, 20, 30, 10, 10, None, True, random_seed=3, algorithm="prim", cache=cache)
+            m2 = Maze(0, 0, 20, 30, 10, 10, None, True, random_seed=3, algorithm="prim", cache=cache)
+            self.assertEqual((cache.misses, cache.hits), (1, 1))
+            self.assertEqual(m2.grid.data, m1.grid.data)
+            self.assertEqual(list(m2.solve_maze("bfs")), list(m1.solve_maze("bfs")))
+            self.assertNotEqual(MazeCache.key(20, 30, 3, "prim"), MazeCache.key(20, 30, 3, "dfs"))
+
+            # A corrupt entry is a miss and gets rewritten
+            path = cache._path(MazeCache.key(20, 30, 3, "prim"))
+            with open(path, "wb") as out:
+                out.write(b"junk")
+            Maze(0, 0, 20, 30, 10, 10, None, True, random_seed=3, algorithm="prim", cache=cache)
+            self.assertIsNotNone(cache.get(20, 30, 3, "prim"))
+
+            entry_size = os.path.getsize(path)
+            cache.max_bytes = 2 * entry_size
+            for seed in range(4, 8):
+                Maze(0, 0, 20, 30, 10, 10, None, True, random_seed=seed, algorithm="prim", cache=cache)
+                # Distinct, increasing use times even on coarse-grained filesystems
+                os.utime(cache._path(MazeCache.key(20, 30, seed, "prim")), (seed, seed))
+            self.assertEqual(cache.evict(), 0)
+            self.assertIsNone(cache.get(20, 30, 4, "prim")) # Oldest entries were evicted
+            self.assertIsNotNone(cache.get(20, 30, 7, "prim"))
+
+            # Orphaned temporary files of crashed writers are swept, fresh ones are kept
+            stale, fresh = os.path.join(tmp, "stale.tmp"), os.path.join(tmp, "fresh.tmp")
+            for temp_path in (stale, fresh):
+                open(temp_path, "wb").close()
+            os.utime(stale, (0, 0))
+            cache.evict()
+            self.assertEqual((os.path.exists(stale), os.path.exists(fresh)), (False, True))
+
+    def test_disk_cache_key_covers_generator_parameters(self):
+        # The class as the cache module sees it (it imports maze_logic, not src.maze_logic)
+        DepthFirstGenerator = type(disk_cache.get_generator("dfs"))
+        self.assertEqual(MazeCache.key(5, 5, 1, "dfs"), MazeCache.key(5, 5, 1, DepthFirstGenerator()))
+        self.assertNotEqual(MazeCache.key(5, 5, 1, "dfs"),
+                            MazeCache.key(5, 5, 1, DepthFirstGenerator(start=7)))
+        with self.assertRaises(ValueError):
+            MazeCache.key(5, 5, 1, DepthFirstGenerator(start=object()))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file